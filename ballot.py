@@ -0,0 +1,236 @@
+import threading
+import time
+from datetime import datetime
+from functools import lru_cache
+from typing import Optional, Callable, Dict, List, Tuple, Any
+
+from mysql.connector import Error
+
+from statement_cache import statement
+from tallies import TALLY_INCREMENT_QUERY
+
+
+VOTE_INSERT_QUERY = """INSERT INTO votes (student_id, position_id, candidate_id, vote_timestamp, ip_address)
+VALUES (%s, %s, %s, %s, %s)"""
+MARK_VOTED_QUERY = "UPDATE students SET has_voted = 1 WHERE id = %s AND has_voted = 0"
+
+
+@lru_cache(maxsize=64)
+def multi_row(query: str, count: int) -> str:
+    """Repeat the VALUES tuple of a single-row INSERT ``count`` times.
+
+    A ballot's vote rows (and tally bumps) go out as one statement; the
+    result is cached so the same object is returned for the same count,
+    which lets the prepared-statement cache reuse it.
+    """
+    head, _, tail = query.partition("VALUES")
+    values, close, rest = tail.partition(")")
+    return f"{head}VALUES {', '.join([values.strip() + close] * count)}{rest}"
+
+BALLOT_VERSION_SETTING = "ballot_version"
+BALLOT_VERSION_QUERY = "SELECT setting_value FROM election_settings WHERE setting_name = 'ballot_version'"
+# Databases set up before ballot caching have no ballot_version row; without it every cache reloads the ballot
+ENSURE_BALLOT_VERSION_QUERY = """INSERT IGNORE INTO election_settings (setting_name, setting_value, description)
+VALUES ('ballot_version', '1', 'Bumped whenever positions or candidates change; invalidates cached ballots')"""
+BUMP_BALLOT_VERSION_QUERY = """INSERT INTO election_settings (setting_name, setting_value, description)
+VALUES ('ballot_version', '2', 'Bumped whenever positions or candidates change; invalidates cached ballots')
+ON DUPLICATE KEY UPDATE setting_value = CAST(setting_value AS UNSIGNED) + 1"""
+BALLOT_QUERY = """
+SELECT (SELECT setting_value FROM election_settings WHERE setting_name = 'ballot_version') AS version,
+       p.id, p.position_name, c.id, c.candidate_name
+FROM positions p
+LEFT JOIN candidates c ON c.position_id = p.id AND c.is_active = 1
+WHERE p.is_active = 1
+ORDER BY p.display_order, p.id, c.id
+"""
+
+
+class BallotAlreadyCast(Error):
+    """Raised when the voter's has_voted flag was already set"""
+
+
+class BallotPosition:
+    """A position on the ballot and its active candidates"""
+
+    def __init__(self, position_id: int, position_name: str):
+        self.position_id = position_id
+        self.position_name = position_name
+        self.candidates: List[Tuple[int, str]] = []
+
+
+class Ballot:
+    """Snapshot of the active positions and candidates"""
+
+    def __init__(self, version: Optional[str], positions: List[BallotPosition]):
+        self.version = version
+        self.positions = positions
+
+    @classmethod
+    def from_rows(cls, rows: List[tuple]) -> "Ballot":
+        """Build a ballot from BALLOT_QUERY rows"""
+        version = rows[0][0] if rows else None
+        positions: List[BallotPosition] = []
+        for _, pos_id, pos_name, cand_id, cand_name in rows:
+            if not positions or positions[-1].position_id != pos_id:
+                positions.append(BallotPosition(pos_id, pos_name))
+            if cand_id is not None:
+                positions[-1].candidates.append((cand_id, cand_name))
+        return cls(version, positions)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """JSON-ready form served to booth clients by ballot_server"""
+        return {
+            "version": self.version,
+            "positions": [
+                {"id": p.position_id, "name": p.position_name, "candidates": [list(c) for c in p.candidates]}
+                for p in self.positions
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Ballot":
+        """Rebuild a ballot from as_dict() output"""
+        positions = []
+        for item in data["positions"]:
+            position = BallotPosition(item["id"], item["name"])
+            position.candidates = [(cand_id, cand_name) for cand_id, cand_name in item["candidates"]]
+            positions.append(position)
+        return cls(data["version"], positions)
+
+
+def ensure_ballot_version(connection):
+    """Create the ballot_version setting if this database predates it"""
+    cursor = connection.cursor()
+    try:
+        cursor.execute(ENSURE_BALLOT_VERSION_QUERY)
+    finally:
+        cursor.close()
+
+
+class BallotCache:
+    """Process-wide ballot cache invalidated by the ballot_version setting.
+
+    The version stamp is re-read at most once every ``check_interval``
+    seconds, so rendering a ballot while the cache is warm issues no queries.
+    A ballot loaded without a version cannot be revalidated, so it is
+    reloaded in full once ``check_interval`` has passed.
+    """
+
+    def __init__(self, check_interval: float = 5.0):
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._ballot: Optional[Ballot] = None
+        self._checked_at = 0.0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, fetch: Callable[..., Optional[List[tuple]]]) -> Optional[Ballot]:
+        """Return the current ballot, using ``fetch(query, params)`` only when stale"""
+        with self._lock:
+            now = time.monotonic()
+            if self._ballot is not None and now - self._checked_at < self.check_interval:
+                self.hits += 1
+                return self._ballot
+
+            if self._ballot is not None and self._ballot.version is not None:
+                rows = fetch(BALLOT_VERSION_QUERY)
+                if rows is None:
+                    # Keep serving the last good ballot if the check failed
+                    return self._ballot
+                if rows and rows[0][0] == self._ballot.version:
+                    self._checked_at = now
+                    self.hits += 1
+                    return self._ballot
+
+            rows = fetch(BALLOT_QUERY)
+            if rows is None:
+                return self._ballot
+            self.misses += 1
+            self._ballot = Ballot.from_rows(rows)
+            self._checked_at = now
+            return self._ballot
+
+    def peek(self) -> Optional[Ballot]:
+        """Return the cached ballot without revalidating it"""
+        return self._ballot
+
+    def invalidate(self):
+        """Force the next get() to reload the ballot"""
+        with self._lock:
+            self._ballot = None
+
+
+ballot_cache = BallotCache()
+
+
+class CommitLatency:
+    """Running latency figures for ballot commits"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.last = 0.0
+        self.rows = 0
+
+    def record(self, seconds: float, rows: int):
+        with self._lock:
+            self.count += 1
+            self.total += seconds
+            self.max = max(self.max, seconds)
+            self.last = seconds
+            self.rows += rows
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return commit count and latency in milliseconds"""
+        with self._lock:
+            return {
+                "ballots": self.count,
+                "vote_rows": self.rows,
+                "last_ms": self.last * 1000,
+                "avg_ms": (self.total / self.count * 1000) if self.count else 0.0,
+                "max_ms": self.max * 1000,
+            }
+
+
+commit_latency = CommitLatency()
+
+
+def commit_ballot(connection, db_student_id: int, student_id_str: str, selections: Dict[int, int],
+                  ip_address: Optional[str] = None, timestamp: Optional[datetime] = None) -> float:
+    """Write a voter's whole ballot and has_voted flag in one transaction.
+
+    ``selections`` maps position id to candidate id. The has_voted update runs
+    first so its row lock serializes a second submission from another booth;
+    the vote rows then go out as a single multi-row INSERT and the matching
+    vote_tallies rows are bumped in the same transaction. Returns the time
+    spent from BEGIN to COMMIT, in seconds.
+    """
+    timestamp = timestamp or datetime.now()
+    # Sorted so concurrent ballots lock tally rows in the same order
+    ordered = sorted(selections.items())
+    rows = [(student_id_str, pos_id, cand_id, timestamp, ip_address) for pos_id, cand_id in ordered]
+
+    start = time.perf_counter()
+    connection.start_transaction()
+    try:
+        with statement(connection, MARK_VOTED_QUERY, (db_student_id,)) as cursor:
+            marked = cursor.rowcount
+        if marked != 1:
+            raise BallotAlreadyCast(msg="This student has already voted")
+        if rows:
+            with statement(connection, multi_row(VOTE_INSERT_QUERY, len(rows)),
+                           tuple(value for row in rows for value in row)):
+                pass
+            with statement(connection, multi_row(TALLY_INCREMENT_QUERY, len(ordered)),
+                           tuple(value for pair in ordered for value in pair)):
+                pass
+        connection.commit()
+    except Exception:
+        connection.rollback()
+        raise
+
+    elapsed = time.perf_counter() - start
+    commit_latency.record(elapsed, len(rows))
+    return elapsed
@@ -0,0 +1,157 @@
+"""Booth-side client for ballot_server.
+
+BallotClient offers the login / load_ballot / submit calls of VotingService
+over HTTP, so students.py and benchmark.py can use either one. Each thread
+keeps its own keep-alive connection to the service. The ballot is
+revalidated with If-None-Match, so an unchanged ballot costs a 304 and no
+JSON.
+
+Failures raise mysql.connector Error subclasses, as the direct path does:
+BallotAlreadyCast, VotingClosed, or ServiceError when the service cannot be
+reached or refuses the request.
+"""
+
+import http.client
+import json
+import os
+import threading
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+from mysql.connector import Error
+
+from ballot import Ballot, BallotAlreadyCast
+from election_settings import VotingClosed
+from voting_service import LOGIN_OK, LoginResult
+
+
+DEFAULT_BOOTH_KEY = os.environ.get("MCA_BOOTH_KEY") or None
+
+
+class ServiceError(Error):
+    """Raised when the ballot service is unreachable or rejects a request"""
+
+
+class BallotClient:
+    """HTTP stand-in for VotingService, safe to share between threads"""
+
+    def __init__(self, base_url: str, timeout: float = 10.0, booth_key: Optional[str] = DEFAULT_BOOTH_KEY):
+        parts = urlsplit(base_url if "//" in base_url else "http://" + base_url)
+        self.base_url = base_url
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.timeout = timeout
+        self.booth_key = booth_key
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        # Login tokens by db_student_id, so submit() keeps VotingService's signature
+        self._tokens: Dict[int, str] = {}
+        self._ballot: Optional[Ballot] = None
+
+    def _request(self, method: str, path: str, payload: Optional[dict] = None,
+                 headers: Optional[Dict[str, str]] = None) -> Tuple[int, Any]:
+        headers = dict(headers or {})
+        body = None
+        if payload is not None:
+            body = json.dumps(payload).encode("utf-8")
+            headers["Content-Type"] = "application/json"
+        if self.booth_key is not None:
+            headers["X-Booth-Key"] = self.booth_key
+
+        connection = getattr(self._local, "connection", None)
+        reused = connection is not None
+        for _ in range(2):
+            if connection is None:
+                connection = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+                self._local.connection = connection
+            try:
+                connection.request(method, path, body=body, headers=headers)
+                response = connection.getresponse()
+                data = response.read()
+                break
+            except (http.client.RemoteDisconnected, BrokenPipeError) as e:
+                connection.close()
+                self._local.connection = connection = None
+                # Usually the service dropped an idle keep-alive connection and a GET can simply go
+                # again. A POST may have been processed before the reply was lost, so it is not
+                # repeated here; the service accepts a /submit retried with the same token.
+                if not reused or method != "GET":
+                    raise ServiceError(msg=f"Ballot service at {self.base_url} is unreachable: {e}")
+                reused = False
+            except (OSError, http.client.HTTPException) as e:
+                connection.close()
+                self._local.connection = None
+                raise ServiceError(msg=f"Ballot service at {self.base_url} is unreachable: {e}")
+        try:
+            return response.status, json.loads(data) if data else {}
+        except ValueError:
+            raise ServiceError(msg=f"Ballot service sent an unreadable reply (HTTP {response.status})")
+
+    @staticmethod
+    def _fail(status: int, data: Any):
+        message = data.get("message") if isinstance(data, dict) else None
+        raise ServiceError(msg=message or f"Ballot service returned HTTP {status}")
+
+    def health(self) -> Dict[str, Any]:
+        """Server pool, cache and request figures; also a reachability check"""
+        status, data = self._request("GET", "/health")
+        if status != 200:
+            self._fail(status, data)
+        return data
+
+    def login(self, student_id: str, password: str) -> LoginResult:
+        status, data = self._request("POST", "/login", {"student_id": student_id, "password": password})
+        if status != 200:
+            self._fail(status, data)
+        result = LoginResult(data["status"], data.get("db_student_id"), student_id, data.get("message", ""))
+        if result.status == LOGIN_OK:
+            with self._lock:
+                self._tokens[result.db_student_id] = data["token"]
+        return result
+
+    def load_ballot(self) -> Optional[Ballot]:
+        """Current ballot; the cached copy when the service reports it unchanged"""
+        cached = self._ballot
+        headers = {"If-None-Match": cached.version} if cached is not None and cached.version is not None else None
+        status, data = self._request("GET", "/ballot", headers=headers)
+        if status == 304:
+            return cached
+        if status != 200:
+            self._fail(status, data)
+        self._ballot = Ballot.from_dict(data)
+        return self._ballot
+
+    def peek(self) -> Optional[Ballot]:
+        return self._ballot
+
+    def submit(self, db_student_id: int, student_id: str, selections: Dict[int, int],
+               ip_address: Optional[str] = None) -> float:
+        """Cast the ballot of the student who logged in through this client; returns commit seconds.
+
+        The service records the booth's own address, so ``ip_address`` is not sent.
+        On ServiceError the token is kept, so calling submit again is safe: if
+        the first attempt was committed, the service reports that success.
+        """
+        with self._lock:
+            token = self._tokens.get(db_student_id)
+        if token is None:
+            raise ServiceError(msg="This student is not logged in on this booth")
+        status, data = self._request("POST", "/submit", {
+            "token": token, "selections": {str(pos_id): cand_id for pos_id, cand_id in selections.items()}})
+        if status in (200, 409, 401):
+            with self._lock:
+                self._tokens.pop(db_student_id, None)
+        if status == 200:
+            return data["commit_seconds"]
+        if status == 409:
+            raise BallotAlreadyCast(msg=data.get("message") or "This student has already voted")
+        if status == 403:
+            raise VotingClosed(msg=data.get("message") or "Voting is closed")
+        self._fail(status, data)
+
+    def close(self):
+        """Close this thread's connection; other threads' close when they exit"""
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
@@ -0,0 +1,341 @@
+"""Local ballot journal so booths keep voting through a database outage.
+
+A submitted ballot is first appended to a SQLite file in WAL mode with
+synchronous=FULL, so it is on disk before the voter sees the confirmation.
+A background JournalReplayer then commits pending ballots to MySQL in
+batches, backing off while the server is unreachable.
+
+Replay is idempotent. Each ballot commits in its own transaction through
+commit_ballot, so it is applied completely or not at all. If the server
+reports the student as already voted, the votes stored under unique_vote
+(student_id, position_id) are compared with the journal entry. A match
+means an earlier replay committed before the journal was updated. A
+mismatch means the student voted somewhere else, and the entry is marked
+rejected for the election office to review. Lost connections, lock wait
+timeouts and deadlocks leave the entry pending for the next attempt.
+
+    python ballot_journal.py status
+    python ballot_journal.py replay --host dbserver
+    # list rejected ballots with the reason, then queue some for another replay
+    python ballot_journal.py rejected
+    python ballot_journal.py requeue 12 15
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import mysql.connector
+from mysql.connector import Error
+
+from ballot import BallotAlreadyCast, commit_ballot
+from db_pool import is_connection_error
+
+
+DEFAULT_JOURNAL_PATH = os.environ.get(
+    "MCA_BALLOT_JOURNAL", os.path.join(os.path.dirname(os.path.abspath(__file__)), "ballot_journal.db"))
+
+STATUS_PENDING = "pending"
+STATUS_APPLIED = "applied"
+STATUS_REJECTED = "rejected"
+
+JOURNAL_SCHEMA = """
+CREATE TABLE IF NOT EXISTS ballots (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    db_student_id INTEGER NOT NULL UNIQUE,
+    student_id TEXT NOT NULL,
+    selections TEXT NOT NULL,
+    ip_address TEXT,
+    cast_at TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS ballots_status ON ballots (status, id);
+"""
+SERVER_VOTES_QUERY = "SELECT position_id, candidate_id FROM votes WHERE student_id = %s"
+# ER_LOCK_WAIT_TIMEOUT and ER_LOCK_DEADLOCK: the transaction lost a race for the has_voted or tally rows
+RETRYABLE_ERRNOS = (1205, 1213)
+ENTRY_COLUMNS = "id, db_student_id, student_id, selections, ip_address, cast_at"
+
+
+class JournalEntry:
+    """A ballot waiting in the journal"""
+
+    def __init__(self, entry_id: int, db_student_id: int, student_id: str, selections: Dict[int, int],
+                 ip_address: Optional[str], cast_at: datetime):
+        self.entry_id = entry_id
+        self.db_student_id = db_student_id
+        self.student_id = student_id
+        self.selections = selections
+        self.ip_address = ip_address
+        self.cast_at = cast_at
+
+
+class BallotJournal:
+    """Append-only, fsync'd ballot store backed by SQLite"""
+
+    def __init__(self, path: str = DEFAULT_JOURNAL_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        # FULL fsyncs the WAL on every commit, so an accepted ballot survives power loss
+        self._db.execute("PRAGMA synchronous=FULL")
+        self._db.executescript(JOURNAL_SCHEMA)
+
+    def append(self, db_student_id: int, student_id: str, selections: Dict[int, int],
+               ip_address: Optional[str] = None, cast_at: Optional[datetime] = None) -> int:
+        """Durably record a ballot; raises BallotAlreadyCast if this booth already holds one for the student"""
+        cast_at = cast_at or datetime.now()
+        payload = json.dumps({str(pos_id): cand_id for pos_id, cand_id in selections.items()})
+        with self._lock:
+            try:
+                cursor = self._db.execute(
+                    "INSERT INTO ballots (db_student_id, student_id, selections, ip_address, cast_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (db_student_id, student_id, payload, ip_address, cast_at.isoformat(sep=" ")))
+            except sqlite3.IntegrityError:
+                raise BallotAlreadyCast(msg="This student has already voted")
+            return cursor.lastrowid
+
+    @staticmethod
+    def _entry(row) -> JournalEntry:
+        entry_id, db_id, student_id, selections, ip_address, cast_at = row
+        return JournalEntry(entry_id, db_id, student_id,
+                            {int(pos_id): cand_id for pos_id, cand_id in json.loads(selections).items()},
+                            ip_address, datetime.fromisoformat(cast_at))
+
+    def pending(self, limit: int = 100) -> List[JournalEntry]:
+        """Oldest ballots not yet on the server"""
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT {ENTRY_COLUMNS} FROM ballots WHERE status = ? ORDER BY id LIMIT ?",
+                (STATUS_PENDING, limit)).fetchall()
+        return [self._entry(row) for row in rows]
+
+    def rejected(self) -> List[Tuple[JournalEntry, str]]:
+        """Every rejected ballot with the reason the server gave"""
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT {ENTRY_COLUMNS}, error FROM ballots WHERE status = ? ORDER BY id",
+                (STATUS_REJECTED,)).fetchall()
+        return [(self._entry(row[:-1]), row[-1]) for row in rows]
+
+    def requeue(self, entry_ids: Optional[Sequence[int]] = None) -> int:
+        """Put rejected ballots back to pending, all of them or just ``entry_ids``; returns how many"""
+        query = "UPDATE ballots SET status = ?, error = NULL WHERE status = ?"
+        params: list = [STATUS_PENDING, STATUS_REJECTED]
+        if entry_ids is not None:
+            if not entry_ids:
+                return 0
+            query += f" AND id IN ({', '.join('?' * len(entry_ids))})"
+            params.extend(entry_ids)
+        with self._lock:
+            return self._db.execute(query, params).rowcount
+
+    def mark(self, outcomes: Dict[int, tuple]):
+        """Store replay outcomes as {entry_id: (status, error)} in one local transaction"""
+        if not outcomes:
+            return
+        with self._lock:
+            self._db.execute("BEGIN")
+            try:
+                self._db.executemany(
+                    "UPDATE ballots SET status = ?, error = ?, attempts = attempts + 1 WHERE id = ?",
+                    [(status, error, entry_id) for entry_id, (status, error) in outcomes.items()])
+                self._db.execute("COMMIT")
+            except sqlite3.Error:
+                self._db.execute("ROLLBACK")
+                raise
+
+    def counts(self) -> Dict[str, int]:
+        """Number of ballots in each status"""
+        with self._lock:
+            rows = self._db.execute("SELECT status, COUNT(*) FROM ballots GROUP BY status").fetchall()
+        counts = {STATUS_PENDING: 0, STATUS_APPLIED: 0, STATUS_REJECTED: 0}
+        counts.update(dict(rows))
+        return counts
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+def replay_entry(connection, entry: JournalEntry) -> tuple:
+    """Commit one journaled ballot; returns (status, error) for the journal"""
+    try:
+        commit_ballot(connection, entry.db_student_id, entry.student_id, entry.selections,
+                      entry.ip_address, entry.cast_at)
+        return STATUS_APPLIED, None
+    except (BallotAlreadyCast, mysql.connector.IntegrityError):
+        pass
+    except Error as e:
+        # A dropped link or a lost lock race can succeed later, so leave the
+        # entry pending; any other refusal would only repeat.
+        if is_connection_error(e) or e.errno in RETRYABLE_ERRNOS:
+            raise
+        return STATUS_REJECTED, str(e)
+    # The student already has votes on the server: either an earlier replay of
+    # this entry got through, or they voted at another booth.
+    cursor = connection.cursor()
+    try:
+        cursor.execute(SERVER_VOTES_QUERY, (entry.student_id,))
+        on_server = dict(cursor.fetchall())
+    finally:
+        cursor.close()
+    if on_server == entry.selections:
+        return STATUS_APPLIED, None
+    return STATUS_REJECTED, "Student had already voted with a different ballot"
+
+
+def replay_pending(journal: BallotJournal, connect, batch_size: int = 50) -> int:
+    """Drain one batch over a single connection; returns how many entries were settled.
+
+    ``connect`` is a context-manager factory such as ``ConnectionPool.connection``.
+    A connection error stops the batch; whatever was settled before it is
+    still recorded.
+    """
+    entries = journal.pending(batch_size)
+    if not entries:
+        return 0
+    outcomes: Dict[int, tuple] = {}
+    try:
+        with connect() as connection:
+            for entry in entries:
+                outcomes[entry.entry_id] = replay_entry(connection, entry)
+    finally:
+        journal.mark(outcomes)
+    return len(outcomes)
+
+
+class JournalReplayer:
+    """Background thread that drains a BallotJournal to the server"""
+
+    def __init__(self, journal: BallotJournal, connect, interval: float = 2.0,
+                 max_interval: float = 30.0, batch_size: int = 50):
+        self.journal = journal
+        self.connect = connect
+        self.interval = interval
+        self.max_interval = max_interval
+        self.batch_size = batch_size
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.replayed = 0
+        self.failures = 0
+        self.last_error: Optional[str] = None
+
+    def wake(self):
+        """Replay now instead of waiting for the next tick"""
+        self._wake.set()
+
+    def drain(self) -> int:
+        """Replay batches until the journal is empty or the server fails"""
+        settled = 0
+        while True:
+            try:
+                done = replay_pending(self.journal, self.connect, self.batch_size)
+            except Error as e:
+                self.failures += 1
+                self.last_error = str(e)
+                raise
+            self.last_error = None
+            settled += done
+            self.replayed += done
+            if done < self.batch_size:
+                return settled
+
+    def _run(self):
+        delay = self.interval
+        while not self._stop.is_set():
+            self._wake.wait(delay)
+            self._wake.clear()
+            if self._stop.is_set():
+                break
+            try:
+                self.drain()
+                delay = self.interval
+            except Error:
+                # Server still unreachable: back off, a new ballot wakes us early
+                delay = min(delay * 2, self.max_interval)
+
+    def start(self):
+        """Begin replaying on a background thread"""
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="ballot-replay", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Stop the thread after one last attempt to drain the journal"""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.max_interval)
+            self._thread = None
+        try:
+            self.drain()
+        except Error:
+            pass
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Inspect or replay a booth's ballot journal")
+    parser.add_argument("command", choices=("status", "replay", "rejected", "requeue"))
+    parser.add_argument("ids", nargs="*", type=int,
+                        help="journal entry ids for requeue (default: every rejected ballot)")
+    parser.add_argument("--journal", default=DEFAULT_JOURNAL_PATH)
+    parser.add_argument("--batch-size", type=int, default=50)
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--database", default="mca_voting_system")
+    parser.add_argument("--user", default="root")
+    parser.add_argument("--password", default="")
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.journal):
+        print(f"No journal at {args.journal}", file=sys.stderr)
+        return 2
+    journal = BallotJournal(args.journal)
+    try:
+        if args.command == "rejected":
+            for entry, error in journal.rejected():
+                print(f"{entry.entry_id:>6}  {entry.student_id:<12} {entry.cast_at:%Y-%m-%d %H:%M:%S}  {error}")
+        elif args.command == "requeue":
+            count = journal.requeue(args.ids or None)
+            print(f"Moved {count} rejected ballot(s) back to pending; run replay to commit them")
+
+        if args.command == "replay":
+            @contextmanager
+            def connect():
+                connection = mysql.connector.connect(host=args.host, database=args.database, user=args.user,
+                                                     password=args.password, autocommit=True)
+                try:
+                    yield connection
+                finally:
+                    connection.close()
+
+            replayer = JournalReplayer(journal, connect, batch_size=args.batch_size)
+            try:
+                replayer.drain()
+            except Error as e:
+                print(f"Replay stopped: {e}", file=sys.stderr)
+                return 1
+            print(f"Replayed {replayer.replayed} ballot(s)")
+
+        counts = journal.counts()
+        print(f"{counts[STATUS_PENDING]} pending, {counts[STATUS_APPLIED]} applied, "
+              f"{counts[STATUS_REJECTED]} rejected")
+        return 0
+    finally:
+        journal.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,316 @@
+"""Headless HTTP/JSON ballot service for booth clients.
+
+Booths started with ``students.py --server URL`` talk to this process rather
+than to MySQL. The database then stays off the booth network, and the whole
+polling station shares one connection pool and one cached ballot. Requests
+are handled on a single asyncio event loop. The blocking work, a login's
+password check or a ballot commit, runs on a thread pool sized to the
+connection pool, so hundreds of idle keep-alive booths cost a socket each
+and nothing more.
+
+    python ballot_server.py --port 8080 --db-host dbserver --pool-size 16
+
+Endpoints (JSON in and out):
+
+    GET  /health   pool, cache and per-endpoint timings
+    POST /login    {"student_id", "password"}
+                   -> {"status", "message", "db_student_id", "token"}
+    GET  /ballot   {"version", "positions": [...]}; 304 when If-None-Match
+                   already names the current version
+    POST /submit   {"token", "selections": {position_id: candidate_id}}
+                   -> {"ok": true, "commit_seconds"}; 401 unknown token,
+                   403 voting closed, 409 already voted
+
+A login that succeeds returns a token, and /submit accepts ballots only
+against a token, so a booth can vote only for the student who just logged
+in. A /submit repeated with a token whose ballot was already committed gets
+the original 200 again, so a booth whose connection dropped before the reply
+arrived can simply resend. When MCA_BOOTH_KEY is set, every request must also carry that value in
+an X-Booth-Key header.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import secrets
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Tuple
+
+from mysql.connector import Error
+
+from ballot import BallotAlreadyCast, ballot_cache, commit_latency, ensure_ballot_version
+from db_pool import ConnectionPool
+from election_settings import VotingClosed
+from last_login import LastLoginBuffer
+from query_executor import RequestTimings
+from statement_cache import statement_stats
+from voting_service import LOGIN_OK, VotingService
+
+
+DEFAULT_BOOTH_KEY = os.environ.get("MCA_BOOTH_KEY") or None
+MAX_BODY_BYTES = 64 * 1024
+STATUS_TEXT = {200: "OK", 304: "Not Modified", 400: "Bad Request", 401: "Unauthorized", 403: "Forbidden",
+               404: "Not Found", 405: "Method Not Allowed", 409: "Conflict", 413: "Payload Too Large",
+               503: "Service Unavailable"}
+
+
+class HTTPError(Exception):
+    """Ends a request with ``status`` and a JSON error body"""
+
+    def __init__(self, status: int, error: str, message: str = ""):
+        super().__init__(message or error)
+        self.status = status
+        self.error = error
+        self.message = message
+
+
+class Session:
+    """A logged-in student a booth may submit one ballot for"""
+
+    def __init__(self, db_student_id: int, student_id: str, expires: float):
+        self.db_student_id = db_student_id
+        self.student_id = student_id
+        self.expires = expires
+
+
+class BallotServer:
+    """Routes booth requests to a VotingService off the event loop"""
+
+    def __init__(self, service: VotingService, workers: int, booth_key: Optional[str] = DEFAULT_BOOTH_KEY,
+                 session_ttl: float = 900.0, idle_timeout: float = 60.0):
+        self.service = service
+        self.booth_key = booth_key
+        self.session_ttl = session_ttl
+        self.idle_timeout = idle_timeout
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ballot")
+        # Only touched from the event loop, so no lock
+        self.sessions: Dict[str, Session] = {}
+        # Tokens whose ballot committed: (expiry, commit seconds), to answer a resent /submit
+        self.submitted: Dict[str, Tuple[float, float]] = {}
+        self.timings = RequestTimings()
+        self.connections = 0
+        # Encoded once per ballot version rather than once per booth
+        self._ballot_body: Tuple[Optional[str], bytes] = (None, b"")
+
+    async def _blocking(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.executor, fn, *args)
+
+    def _session(self, token) -> Session:
+        session = self.sessions.get(token) if isinstance(token, str) else None
+        if session is None or session.expires < time.monotonic():
+            if session is not None:
+                del self.sessions[token]
+            raise HTTPError(401, "session_expired", "Your session has expired; please log in again.")
+        return session
+
+    def _expire_sessions(self):
+        now = time.monotonic()
+        for token in [t for t, s in self.sessions.items() if s.expires < now]:
+            del self.sessions[token]
+        for token in [t for t, (expires, _) in self.submitted.items() if expires < now]:
+            del self.submitted[token]
+
+    async def login(self, body: dict, peer: str) -> Tuple[int, dict]:
+        student_id, password = body.get("student_id"), body.get("password")
+        if not isinstance(student_id, str) or not isinstance(password, str):
+            raise HTTPError(400, "bad_request", "student_id and password are required")
+        result = await self._blocking(self.service.login, student_id, password)
+        payload = {"status": result.status, "message": result.message, "db_student_id": result.db_student_id}
+        if result.status == LOGIN_OK:
+            self._expire_sessions()
+            token = secrets.token_urlsafe(24)
+            self.sessions[token] = Session(result.db_student_id, student_id, time.monotonic() + self.session_ttl)
+            payload["token"] = token
+        return 200, payload
+
+    async def ballot(self, headers: Dict[str, str]) -> Tuple[int, bytes, Dict[str, str]]:
+        ballot = await self._blocking(self.service.load_ballot)
+        if ballot is None:
+            raise HTTPError(503, "no_ballot", "The ballot could not be loaded")
+        etag = {"ETag": ballot.version} if ballot.version is not None else {}
+        if ballot.version is not None and headers.get("if-none-match") == ballot.version:
+            return 304, b"", etag
+        version, body = self._ballot_body
+        if version is None or version != ballot.version:
+            body = json.dumps(ballot.as_dict()).encode("utf-8")
+            self._ballot_body = (ballot.version, body)
+        return 200, body, etag
+
+    async def submit(self, body: dict, peer: str) -> Tuple[int, dict]:
+        token = body.get("token")
+        done = self.submitted.get(token) if isinstance(token, str) else None
+        if done is not None:
+            return 200, {"ok": True, "commit_seconds": done[1]}
+        session = self._session(token)
+        selections = body.get("selections")
+        try:
+            selections = {int(pos_id): int(cand_id) for pos_id, cand_id in selections.items()}
+        except (AttributeError, TypeError, ValueError):
+            raise HTTPError(400, "bad_request", "selections must map position ids to candidate ids")
+        try:
+            seconds = await self._blocking(self.service.submit, session.db_student_id, session.student_id,
+                                           selections, peer)
+        except BallotAlreadyCast:
+            self.sessions.pop(token, None)
+            raise HTTPError(409, "already_voted", "You have already cast your vote. You cannot vote again.")
+        except VotingClosed as e:
+            raise HTTPError(403, "voting_closed", e.msg)
+        self.sessions.pop(token, None)
+        self.submitted[token] = (session.expires, seconds)
+        return 200, {"ok": True, "commit_seconds": seconds}
+
+    def health(self) -> Tuple[int, dict]:
+        pool = self.service.pool
+        return 200, {
+            "pool": {**pool.size(), **pool.stats.snapshot()},
+            "connections": self.connections,
+            "sessions": len(self.sessions),
+            "ballot_cache": {"hits": self.service.cache.hits, "misses": self.service.cache.misses},
+            "statements": statement_stats.snapshot(),
+            "commit": commit_latency.snapshot(),
+            "requests": self.timings.snapshot(),
+        }
+
+    async def dispatch(self, method: str, path: str, headers: Dict[str, str], body: bytes, peer: str):
+        """Return (status, payload, headers); payload is a dict or already-encoded JSON bytes"""
+        if self.booth_key is not None and not secrets.compare_digest(
+                headers.get("x-booth-key", ""), self.booth_key):
+            raise HTTPError(401, "bad_booth_key", "This booth is not registered with the ballot service")
+        routes = {"/health": "GET", "/ballot": "GET", "/login": "POST", "/submit": "POST"}
+        if path not in routes:
+            raise HTTPError(404, "not_found")
+        if method != routes[path]:
+            raise HTTPError(405, "method_not_allowed")
+        if path == "/health":
+            return (*self.health(), {})
+        if path == "/ballot":
+            return await self.ballot(headers)
+        try:
+            data = json.loads(body or b"{}")
+        except ValueError:
+            raise HTTPError(400, "bad_request", "Request body is not valid JSON")
+        if not isinstance(data, dict):
+            raise HTTPError(400, "bad_request", "Request body must be a JSON object")
+        if path == "/login":
+            return (*await self.login(data, peer), {})
+        return (*await self.submit(data, peer), {})
+
+    async def _read_request(self, reader: asyncio.StreamReader):
+        line = await reader.readline()
+        if not line:
+            return None
+        try:
+            method, target, _ = line.decode("latin-1").split()
+        except ValueError:
+            raise HTTPError(400, "bad_request", "Malformed request line")
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        try:
+            length = int(headers.get("content-length", "0"))
+        except ValueError:
+            raise HTTPError(400, "bad_request", "Bad Content-Length")
+        if length > MAX_BODY_BYTES:
+            raise HTTPError(413, "too_large")
+        body = await reader.readexactly(length) if length else b""
+        return method, target.split("?", 1)[0], headers, body
+
+    @staticmethod
+    def _response(status: int, payload, keep_alive: bool, extra: Dict[str, str] = None) -> bytes:
+        body = payload if isinstance(payload, bytes) else json.dumps(payload).encode("utf-8")
+        lines = [f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}",
+                 "Content-Type: application/json",
+                 f"Content-Length: {len(body)}",
+                 "Connection: " + ("keep-alive" if keep_alive else "close")]
+        lines.extend(f"{name}: {value}" for name, value in (extra or {}).items())
+        return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Serve one booth's keep-alive connection until it closes or goes idle"""
+        peer = (writer.get_extra_info("peername") or ("unknown",))[0]
+        self.connections += 1
+        try:
+            while True:
+                try:
+                    request = await asyncio.wait_for(self._read_request(reader), self.idle_timeout)
+                except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+                    return
+                except HTTPError as e:
+                    writer.write(self._response(e.status, {"error": e.error, "message": e.message}, False))
+                    await writer.drain()
+                    return
+                if request is None:
+                    return
+                method, path, headers, body = request
+                keep_alive = headers.get("connection", "").lower() != "close"
+                started = time.perf_counter()
+                extra = {}
+                try:
+                    status, payload, extra = await self.dispatch(method, path, headers, body, peer)
+                except HTTPError as e:
+                    status, payload = e.status, {"error": e.error, "message": e.message}
+                except Error as e:
+                    # Database trouble; the booth keeps its voter and may retry
+                    status, payload = 503, {"error": "database", "message": str(e)}
+                self.timings.record(f"{method} {path}", time.perf_counter() - started)
+                writer.write(self._response(status, payload, keep_alive, extra))
+                await writer.drain()
+                if not keep_alive:
+                    return
+        except ConnectionError:
+            # The booth went away mid-response
+            pass
+        finally:
+            self.connections -= 1
+            writer.close()
+
+    async def serve(self, host: str, port: int):
+        server = await asyncio.start_server(self.handle, host, port, backlog=1024)
+        print(f"Ballot service listening on http://{host}:{port}")
+        async with server:
+            await server.serve_forever()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Serve login, ballot and submit to booth clients over HTTP")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--pool-size", type=int, default=16,
+                        help="database connections, and threads for blocking work")
+    parser.add_argument("--db-host", default="localhost")
+    parser.add_argument("--database", default="mca_voting_system")
+    parser.add_argument("--user", default="root")
+    parser.add_argument("--password", default="")
+    args = parser.parse_args(argv)
+
+    pool = ConnectionPool(pool_size=args.pool_size, host=args.db_host, database=args.database,
+                          user=args.user, password=args.password, connection_timeout=5)
+    try:
+        with pool.connection() as connection:
+            ensure_ballot_version(connection)
+    except Error as e:
+        print(f"Failed to connect to database: {e}", file=sys.stderr)
+        return 2
+    last_logins = LastLoginBuffer(pool, "students")
+    last_logins.start()
+    server = BallotServer(VotingService(pool, ballot_cache, last_logins), workers=args.pool_size)
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.executor.shutdown(wait=True)
+        last_logins.stop()
+        pool.close_all()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
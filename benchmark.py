@@ -0,0 +1,444 @@
+"""Headless load test for the student voting path.
+
+Drives the same login -> ballot load -> ballot submit flow as students.py
+through VotingService, from many threads at once, and reports throughput
+and p50/p95/p99 latency per stage.
+
+    # create mca_voting_bench from mca_voting_system.sql with 5000 synthetic students
+    python benchmark.py --setup --students 5000
+    # cast one ballot for each of them with 32 concurrent booths
+    python benchmark.py --students 5000 --concurrency 32
+    # clear the synthetic ballots again so the run can be repeated
+    python benchmark.py --reset-votes
+    # login/ballot lookups for 10 s with plain text statements, then prepared ones
+    python benchmark.py --compare-statements 10 --concurrency 32
+    # the same booths against a ballot_server instead of MySQL directly, e.g. after
+    #   python ballot_server.py --database mca_voting_bench --port 8080
+    python benchmark.py --students 5000 --concurrency 300 --server http://localhost:8080
+    # 10 s of dashboard reads through ReplicaRouter while saving; any read that
+    # misses the save before it is reported as stale
+    python benchmark.py --check-replicas 10 --replicas localhost:3307
+"""
+
+import argparse
+import os
+import queue
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+import mysql.connector
+from mysql.connector import Error
+
+from ballot import BALLOT_VERSION_QUERY, BallotCache, commit_latency
+from ballot_client import BallotClient
+from db_pool import ConnectionPool
+from election_settings import SETTINGS_VERSION_QUERY
+from last_login import LastLoginBuffer
+from passwords import DEFAULT_ITERATIONS, hash_many
+from replica_router import DEFAULT_MAX_LAG, DEFAULT_READ_REPLICAS, Replica, ReplicaRouter, parse_replicas
+from statement_cache import DEFAULT_STATEMENT_CACHE_SIZE, statement, statement_stats
+from tallies import rebuild_tallies
+from voting_service import STUDENT_LOGIN_QUERY, VotingService
+
+
+SCHEMA_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "mca_voting_system.sql")
+BENCH_PREFIX = "BENCH/"
+STAGES = ("login", "ballot", "submit", "total")
+
+
+def bench_student_id(n: int) -> str:
+    return f"{BENCH_PREFIX}{n:06d}"
+
+
+def bench_password(student_id: str) -> str:
+    return "bench" + student_id[len(BENCH_PREFIX):]
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(pct / 100.0 * len(sorted_values))))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+class StageRecorder:
+    """Thread-safe latency samples per stage"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.samples: Dict[str, List[float]] = {stage: [] for stage in STAGES}
+        self.errors: Dict[str, int] = {stage: 0 for stage in STAGES}
+
+    def add(self, stage: str, seconds: float):
+        with self._lock:
+            self.samples[stage].append(seconds)
+
+    def error(self, stage: str):
+        with self._lock:
+            self.errors[stage] += 1
+
+    def report(self, wall_seconds: float) -> str:
+        lines = [f"{'stage':<8} {'ok':>7} {'err':>5} {'ops/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}"]
+        for stage in STAGES:
+            values = sorted(self.samples[stage])
+            ops = len(values) / wall_seconds if wall_seconds > 0 else 0.0
+            lines.append(
+                f"{stage:<8} {len(values):>7} {self.errors[stage]:>5} {ops:>9.1f} "
+                f"{percentile(values, 50) * 1000:>8.2f} {percentile(values, 95) * 1000:>8.2f} "
+                f"{percentile(values, 99) * 1000:>8.2f} {(values[-1] if values else 0) * 1000:>8.2f}")
+        return "\n".join(lines)
+
+
+def connect(args, database=True):
+    params = dict(host=args.host, user=args.user, password=args.password)
+    if database:
+        params["database"] = args.database
+    return mysql.connector.connect(**params)
+
+
+def setup_database(args):
+    """Recreate the benchmark database from the schema dump and seed synthetic students"""
+    if args.database == "mca_voting_system" and not args.force:
+        raise SystemExit("Refusing to recreate the live database; pick another --database or pass --force")
+
+    connection = connect(args, database=False)
+    cursor = connection.cursor()
+    cursor.execute(f"DROP DATABASE IF EXISTS `{args.database}`")
+    cursor.execute(f"CREATE DATABASE `{args.database}` CHARACTER SET utf8mb4 COLLATE utf8mb4_general_ci")
+    cursor.execute(f"USE `{args.database}`")
+    with open(SCHEMA_FILE, encoding="utf-8") as f:
+        for result in cursor.execute(f.read(), multi=True):
+            if result.with_rows:
+                result.fetchall()
+    # The seeded voting window is in the past; open it so logins and submits are not gated
+    cursor.execute("UPDATE election_settings SET setting_value = '2000-01-01 00:00:00' WHERE setting_name = 'voting_start_date'")
+    cursor.execute("UPDATE election_settings SET setting_value = '2099-12-31 23:59:59' WHERE setting_name = 'voting_end_date'")
+    connection.commit()
+
+    insert = """INSERT INTO students (student_id, full_name, email, password_hash, program, year_of_study, is_active)
+    VALUES (%s, %s, %s, %s, %s, %s, 1)"""
+    def flush(batch):
+        # Hashed in parallel at the requested cost so logins measure the real KDF
+        hashes = hash_many([bench_password(row[0]) for row in batch], args.hash_iterations)
+        cursor.executemany(insert, [row[:3] + (hashed,) + row[3:] for row, hashed in zip(batch, hashes)])
+        connection.commit()
+
+    batch = []
+    for n in range(1, args.students + 1):
+        student_id = bench_student_id(n)
+        batch.append((student_id, f"Bench Student {n}", f"bench{n}@bench.local", "BENCH", 1 + n % 4))
+        if len(batch) >= 1000:
+            flush(batch)
+            batch = []
+    if batch:
+        flush(batch)
+    cursor.close()
+    connection.close()
+    print(f"Created {args.database} with {args.students} synthetic students")
+
+
+def reset_votes(args):
+    """Remove the synthetic ballots so the same students can vote again"""
+    connection = connect(args)
+    cursor = connection.cursor()
+    cursor.execute("DELETE FROM votes WHERE student_id LIKE %s", (BENCH_PREFIX + "%",))
+    cursor.execute("UPDATE students SET has_voted = 0 WHERE student_id LIKE %s", (BENCH_PREFIX + "%",))
+    connection.commit()
+    cursor.close()
+    rebuild_tallies(connection)
+    connection.close()
+    print("Cleared benchmark votes")
+
+
+def run_benchmark(args) -> StageRecorder:
+    if args.server:
+        # Booths share one client; each thread keeps its own keep-alive connection
+        pool = last_logins = None
+        service = BallotClient(args.server)
+    else:
+        pool = ConnectionPool(pool_size=args.concurrency, statement_cache_size=args.statement_cache,
+                              host=args.host, database=args.database, user=args.user, password=args.password)
+        last_logins = LastLoginBuffer(pool, "students")
+        last_logins.start()
+        service = VotingService(pool, BallotCache(), last_logins)
+
+    connection = connect(args)
+    cursor = connection.cursor()
+    cursor.execute("SELECT student_id FROM students WHERE student_id LIKE %s AND has_voted = 0 "
+                   "ORDER BY student_id LIMIT %s", (BENCH_PREFIX + "%", args.students))
+    pending = queue.Queue()
+    for (student_id,) in cursor.fetchall():
+        pending.put(student_id)
+    cursor.close()
+    connection.close()
+    if pending.empty():
+        raise SystemExit("No benchmark students left to vote; run with --setup or --reset-votes")
+
+    recorder = StageRecorder()
+
+    def booth():
+        rng = random.Random()
+        while True:
+            try:
+                student_id = pending.get_nowait()
+            except queue.Empty:
+                return
+            started = time.perf_counter()
+            stage = "login"
+            try:
+                t = time.perf_counter()
+                result = service.login(student_id, bench_password(student_id))
+                recorder.add("login", time.perf_counter() - t)
+                if not result.ok:
+                    recorder.error("total")
+                    continue
+
+                stage = "ballot"
+                t = time.perf_counter()
+                ballot = service.load_ballot()
+                recorder.add("ballot", time.perf_counter() - t)
+                selections = {p.position_id: rng.choice(p.candidates)[0] for p in ballot.positions if p.candidates}
+
+                stage = "submit"
+                t = time.perf_counter()
+                service.submit(result.db_student_id, student_id, selections, "127.0.0.1")
+                recorder.add("submit", time.perf_counter() - t)
+                recorder.add("total", time.perf_counter() - started)
+            except Exception as e:
+                # Anything a booth hits, not just database errors, counts against this ballot's stage
+                recorder.error(stage)
+                recorder.error("total")
+                if args.verbose:
+                    print(f"{student_id} {stage}: {e}", file=sys.stderr)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        booths = [executor.submit(booth) for _ in range(args.concurrency)]
+    for future in booths:
+        future.result()
+    wall = time.perf_counter() - started
+
+    print(f"{len(recorder.samples['total'])} ballots in {wall:.2f}s with {args.concurrency} booths "
+          f"({len(recorder.samples['total']) / wall:.1f} ballots/s)\n")
+    print(recorder.report(wall))
+    if args.server:
+        print("\nserver:", service.health())
+        return recorder
+    print("\ncommit:", commit_latency.snapshot())
+    last_logins.stop()
+    print("pool:  ", {**pool.size(), **pool.stats.snapshot()})
+    print("statements:", statement_stats.snapshot())
+    print(f"last_login: {last_logins.flushed} row(s) flushed, {last_logins.failures} failed flush(es)")
+    pool.close_all()
+    return recorder
+
+
+STATEMENT_STATUS_QUERY = """SHOW GLOBAL STATUS WHERE Variable_name IN
+('Com_select', 'Com_stmt_prepare', 'Com_stmt_execute', 'Questions')"""
+
+
+def server_counters(args) -> Dict[str, int]:
+    connection = connect(args)
+    cursor = connection.cursor()
+    cursor.execute(STATEMENT_STATUS_QUERY)
+    counters = {name: int(value) for name, value in cursor.fetchall()}
+    cursor.close()
+    connection.close()
+    return counters
+
+
+def statement_round(args, cache_size: int, student_ids: List[str]) -> StageRecorder:
+    """Run the login and cache-check lookups from every booth for --compare-statements seconds"""
+    pool = ConnectionPool(pool_size=args.concurrency, statement_cache_size=cache_size,
+                          host=args.host, database=args.database, user=args.user, password=args.password)
+    recorder = StageRecorder()
+    deadline = time.perf_counter() + args.compare_statements
+
+    def booth():
+        rng = random.Random()
+        while time.perf_counter() < deadline:
+            t = time.perf_counter()
+            try:
+                with pool.connection() as connection:
+                    for query, params in ((STUDENT_LOGIN_QUERY, (rng.choice(student_ids),)),
+                                          (BALLOT_VERSION_QUERY, None), (SETTINGS_VERSION_QUERY, None)):
+                        with statement(connection, query, params) as cursor:
+                            cursor.fetchall()
+                recorder.add("total", time.perf_counter() - t)
+            except Exception:
+                recorder.error("total")
+
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        booths = [executor.submit(booth) for _ in range(args.concurrency)]
+    pool.close_all()
+    for future in booths:
+        future.result()
+    return recorder
+
+
+def compare_statements(args):
+    """Same lookups as text statements and then as cached prepared statements"""
+    connection = connect(args)
+    cursor = connection.cursor()
+    cursor.execute("SELECT student_id FROM students WHERE student_id LIKE %s LIMIT %s",
+                   (BENCH_PREFIX + "%", args.students))
+    student_ids = [student_id for (student_id,) in cursor.fetchall()]
+    cursor.close()
+    connection.close()
+    if not student_ids:
+        raise SystemExit("No benchmark students; run with --setup first")
+
+    for label, cache_size in (("text", 0), ("prepared", args.statement_cache or DEFAULT_STATEMENT_CACHE_SIZE)):
+        statement_stats.reset()
+        before = server_counters(args)
+        recorder = statement_round(args, cache_size, student_ids)
+        after = server_counters(args)
+        values = sorted(recorder.samples["total"])
+        delta = {name: after[name] - before.get(name, 0) for name in after}
+        # Text statements are parsed on every call; prepared ones only when prepared
+        parsed = delta.get("Questions", 0) - delta.get("Com_stmt_execute", 0) + delta.get("Com_stmt_prepare", 0)
+        print(f"{label:<9} {len(values) / args.compare_statements:>9.1f} lookups/s  "
+              f"p50 {percentile(values, 50) * 1000:.2f} ms  p95 {percentile(values, 95) * 1000:.2f} ms  "
+              f"server parsed {parsed} statement(s) for {delta.get('Questions', 0)} request(s)")
+        if cache_size:
+            print(f"{'':<9} cache: {statement_stats.snapshot()}")
+
+
+DASHBOARD_QUERY = "SELECT COUNT(*), COALESCE(SUM(has_voted), 0) FROM students"
+MARKER_QUERY = "SELECT full_name FROM students WHERE student_id = %s"
+
+
+def check_replicas(args):
+    """Dashboard reads from every booth thread plus a save-then-read loop, all through ReplicaRouter"""
+    replicas = parse_replicas(args.replicas)
+    if not replicas:
+        raise SystemExit("--check-replicas needs --replicas host[:port],... (or MCA_READ_REPLICAS)")
+
+    def pool_for(host, port=None):
+        return ConnectionPool(pool_size=args.concurrency + 1, host=host, port=port or 3306,
+                              database=args.database, user=args.user, password=args.password)
+
+    primary = pool_for(args.host)
+    router = ReplicaRouter(primary, [Replica(f"{host}:{port or 3306}", pool_for(host, port)) for host, port in replicas],
+                           max_lag=args.max_lag, check_interval=0.5)
+    router.check()
+    router.start()
+    marker_id = bench_student_id(1)
+    recorder = StageRecorder()
+    stale = []
+    failed_saves = []
+    deadline = time.perf_counter() + args.check_replicas
+
+    def read_one(connection, query, params=None):
+        cursor = connection.cursor()
+        try:
+            cursor.execute(query, params or ())
+            return cursor.fetchall()
+        finally:
+            cursor.close()
+
+    def reader():
+        while time.perf_counter() < deadline:
+            t = time.perf_counter()
+            try:
+                router.read(lambda connection: read_one(connection, DASHBOARD_QUERY))
+                recorder.add("total", time.perf_counter() - t)
+            except Exception:
+                recorder.error("total")
+
+    def save(name):
+        with primary.connection() as connection:
+            cursor = connection.cursor()
+            cursor.execute("UPDATE students SET full_name = %s WHERE student_id = %s", (name, marker_id))
+            cursor.close()
+
+    def writer():
+        saves = 0
+        while time.perf_counter() < deadline:
+            saves += 1
+            name = f"Bench Student 1 #{saves}"
+            try:
+                save(name)
+                router.note_write()
+                rows = router.read(lambda connection: read_one(connection, MARKER_QUERY, (marker_id,)))
+            except Exception as e:
+                failed_saves.append(f"{name}: {e}")
+            else:
+                if not rows or rows[0][0] != name:
+                    stale.append(name)
+            # Leave room for a replica to catch up, as an admin would between saves
+            time.sleep(args.max_lag / 2)
+        save("Bench Student 1")
+        return saves
+
+    with ThreadPoolExecutor(max_workers=args.concurrency + 1) as executor:
+        saves = executor.submit(writer)
+        readers = [executor.submit(reader) for _ in range(args.concurrency)]
+    router.close_all()
+    primary.close_all()
+    for future in readers:
+        future.result()
+
+    values = sorted(recorder.samples["total"])
+    print(f"{len(values) / args.check_replicas:.1f} reads/s  p50 {percentile(values, 50) * 1000:.2f} ms  "
+          f"p95 {percentile(values, 95) * 1000:.2f} ms  {recorder.errors['total']} error(s)")
+    print(f"{saves.result()} save(s), {len(failed_saves)} failed, {len(stale)} stale read-your-writes read(s)")
+    for failure in failed_saves[:5]:
+        print("  failed save", failure)
+    print("routing:", router.snapshot())
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Load-test the headless voting path")
+    parser.add_argument("--setup", action="store_true", help="recreate the database and seed students first")
+    parser.add_argument("--reset-votes", action="store_true", help="delete benchmark ballots and exit")
+    parser.add_argument("--force", action="store_true", help="allow --setup on mca_voting_system")
+    parser.add_argument("--students", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--hash-iterations", type=int, default=DEFAULT_ITERATIONS,
+                        help="PBKDF2 cost for the seeded passwords (--setup)")
+    parser.add_argument("--statement-cache", type=int, default=DEFAULT_STATEMENT_CACHE_SIZE,
+                        help="prepared statements cached per connection (0 sends plain text)")
+    parser.add_argument("--compare-statements", type=float, metavar="SECONDS",
+                        help="time the login/cache-check lookups as text and as prepared statements, then exit")
+    parser.add_argument("--server", metavar="URL",
+                        help="drive the booths through a ballot_server instead of MySQL")
+    parser.add_argument("--check-replicas", type=float, metavar="SECONDS",
+                        help="run dashboard reads through the replica router while saving, then exit")
+    parser.add_argument("--replicas", default=DEFAULT_READ_REPLICAS,
+                        help="read replicas as host[:port],... (a second connection to --host works as a stand-in)")
+    parser.add_argument("--max-lag", type=float, default=DEFAULT_MAX_LAG,
+                        help="seconds of replica lag tolerated before reads fall back to the primary")
+    parser.add_argument("--verbose", action="store_true")
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--database", default="mca_voting_bench")
+    parser.add_argument("--user", default="root")
+    parser.add_argument("--password", default="")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.reset_votes:
+            reset_votes(args)
+            return 0
+        if args.setup:
+            setup_database(args)
+        if args.compare_statements:
+            compare_statements(args)
+            return 0
+        if args.check_replicas:
+            check_replicas(args)
+            return 0
+        run_benchmark(args)
+    except Error as e:
+        print(f"Database error: {e}", file=sys.stderr)
+        return 2
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
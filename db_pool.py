@@ -0,0 +1,213 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import Optional, Dict, Any, List, Tuple
+
+import mysql.connector
+from mysql.connector import Error, InterfaceError, OperationalError
+
+from statement_cache import DEFAULT_STATEMENT_CACHE_SIZE, StatementCache
+
+
+class PoolTimeout(Error):
+    """Raised when no pooled connection becomes free in time"""
+
+
+def is_connection_error(e: Error) -> bool:
+    """True when ``e`` means the link to the server is suspect rather than the statement refused.
+
+    mysql.connector raises client-side failures as InterfaceError or
+    OperationalError, with a CR_* errno (2000-2999) or with errno -1 when
+    there is no code at all, e.g. "MySQL Connection not available".
+    """
+    errno = getattr(e, "errno", None)
+    return (isinstance(e, (InterfaceError, OperationalError)) or errno is None or errno < 0
+            or 2000 <= errno < 3000)
+
+
+class PoolStats:
+    """Checkout and wait counters for a connection pool"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.waits = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.connections_created = 0
+        self.health_checks = 0
+        self.health_failures = 0
+
+    def record_checkout(self, waited: float, blocked: bool):
+        with self._lock:
+            self.checkouts += 1
+            if blocked:
+                self.waits += 1
+            self.total_wait += waited
+            self.max_wait = max(self.max_wait, waited)
+
+    def increment(self, name: str):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return a consistent copy of the counters"""
+        with self._lock:
+            avg_wait = self.total_wait / self.checkouts if self.checkouts else 0.0
+            return {
+                "checkouts": self.checkouts,
+                "waits": self.waits,
+                "timeouts": self.timeouts,
+                "avg_wait_ms": avg_wait * 1000,
+                "max_wait_ms": self.max_wait * 1000,
+                "connections_created": self.connections_created,
+                "health_checks": self.health_checks,
+                "health_failures": self.health_failures,
+            }
+
+
+class ConnectionPool:
+    """Thread-safe pool of MySQL connections with checkout/return semantics.
+
+    Connections are opened lazily up to ``pool_size``. A connection that has
+    sat idle for longer than ``health_check_interval`` seconds is pinged when
+    it is checked out, so busy connections skip the extra round-trip.
+    Each connection carries its own cache of up to ``statement_cache_size``
+    prepared statements (see statement_cache.statement).
+    """
+
+    def __init__(self, pool_size: int = 5, acquire_timeout: float = 10.0,
+                 health_check_interval: float = 30.0,
+                 statement_cache_size: int = DEFAULT_STATEMENT_CACHE_SIZE, **connect_args):
+        if pool_size < 1:
+            raise ValueError("pool_size must be at least 1")
+        self.pool_size = pool_size
+        self.acquire_timeout = acquire_timeout
+        self.health_check_interval = health_check_interval
+        self.statement_cache_size = statement_cache_size
+        # Autocommit keeps plain SELECTs from pinning an old InnoDB snapshot
+        # on a connection that is handed between threads; writes that need a
+        # transaction start one explicitly.
+        connect_args.setdefault("autocommit", True)
+        self.connect_args = connect_args
+        self.stats = PoolStats()
+        # Most recently returned last, so the warmest connection is reused first
+        self._idle: List[Tuple[Any, float]] = []
+        self._lock = threading.Lock()
+        # Signalled whenever a connection is returned or a slot is freed
+        self._available = threading.Condition(self._lock)
+        self._created = 0
+        self._closed = False
+
+    def _open(self):
+        conn = mysql.connector.connect(**self.connect_args)
+        # Prepared statements belong to the server session, so the cache lives and dies with the connection
+        conn.statement_cache = StatementCache(conn, self.statement_cache_size) if self.statement_cache_size > 0 else None
+        self.stats.increment("connections_created")
+        return conn
+
+    def _is_healthy(self, conn, last_used: float) -> bool:
+        if time.monotonic() - last_used < self.health_check_interval:
+            return True
+        self.stats.increment("health_checks")
+        try:
+            conn.ping(reconnect=False)
+            return True
+        except Error:
+            self.stats.increment("health_failures")
+            return False
+
+    def _discard(self, conn):
+        try:
+            conn.close()
+        except Error:
+            pass
+        with self._available:
+            self._created -= 1
+            self._available.notify()
+
+    def acquire(self, timeout: Optional[float] = None):
+        """Check a connection out of the pool, opening one if there is room"""
+        timeout = self.acquire_timeout if timeout is None else timeout
+        start = time.monotonic()
+        deadline = start + timeout
+        blocked = False
+        while True:
+            with self._available:
+                while True:
+                    if self._closed:
+                        raise Error("Connection pool is closed")
+                    if self._idle:
+                        conn, last_used = self._idle.pop()
+                        opening = False
+                        break
+                    if self._created < self.pool_size:
+                        self._created += 1
+                        opening = True
+                        break
+                    blocked = True
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.stats.increment("timeouts")
+                        raise PoolTimeout(msg=f"No database connection available after {timeout:.1f}s")
+                    self._available.wait(remaining)
+
+            if opening:
+                try:
+                    conn = self._open()
+                except Error:
+                    with self._available:
+                        self._created -= 1
+                        self._available.notify()
+                    raise
+                self.stats.record_checkout(time.monotonic() - start, blocked)
+                return conn
+            if self._is_healthy(conn, last_used):
+                self.stats.record_checkout(time.monotonic() - start, blocked)
+                return conn
+            self._discard(conn)
+
+    def release(self, conn, discard: bool = False):
+        """Return a checked-out connection to the pool"""
+        if discard or self._closed:
+            self._discard(conn)
+            return
+        if conn.in_transaction:
+            try:
+                conn.rollback()
+            except Error:
+                self._discard(conn)
+                return
+        with self._available:
+            self._idle.append((conn, time.monotonic()))
+            self._available.notify()
+
+    @contextmanager
+    def connection(self, timeout: Optional[float] = None):
+        """Context manager that checks a connection out and always returns it"""
+        conn = self.acquire(timeout)
+        broken = False
+        try:
+            yield conn
+        except Error as e:
+            # After a connection error the socket itself is suspect; do not hand it to the next caller
+            broken = is_connection_error(e)
+            raise
+        finally:
+            self.release(conn, discard=broken)
+
+    def close_all(self):
+        """Close every idle connection and refuse further checkouts"""
+        with self._available:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            # Waiters wake up and see the pool is closed
+            self._available.notify_all()
+        for conn, _ in idle:
+            self._discard(conn)
+
+    def size(self) -> Dict[str, int]:
+        """Return how many connections are open and idle"""
+        with self._lock:
+            return {"open": self._created, "idle": len(self._idle), "max": self.pool_size}
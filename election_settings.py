@@ -0,0 +1,156 @@
+"""Typed, cached access to the election_settings table.
+
+The whole table is loaded once and kept in memory. At most once every
+``check_interval`` seconds a one-row probe (latest updated_at, row count
+and a checksum of the names and values) decides whether to reload it, so
+gating logins and ballot submissions on these settings adds no round-trips
+in between. The checksum catches edits that leave updated_at unchanged,
+such as two saves within the same second or an UPDATE that sets it
+explicitly.
+
+A missing or empty voting_start_date or voting_end_date leaves that side of
+the voting window open. A voting_end_date without a time runs to the end of
+that day.
+"""
+
+import threading
+import time
+from datetime import datetime, time as day_time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from mysql.connector import Error
+
+
+SETTINGS_QUERY = "SELECT setting_name, setting_value FROM election_settings"
+SETTINGS_VERSION_QUERY = ("SELECT MAX(updated_at), COUNT(*), BIT_XOR(CRC32(CONCAT(setting_name, '=', setting_value))) "
+                          "FROM election_settings")
+DATETIME_FORMATS = ("%Y-%m-%d %H:%M:%S", "%Y-%m-%d %H:%M")
+DATE_FORMAT = "%Y-%m-%d"
+
+
+class VotingClosed(Error):
+    """Raised when a ballot is submitted outside the voting window"""
+
+
+class ElectionSettings:
+    """Snapshot of election_settings with typed accessors"""
+
+    def __init__(self, values: Dict[str, str], version: Optional[tuple] = None):
+        self.values = values
+        self.version = version
+
+    def get_str(self, name: str, default: str = "") -> str:
+        value = self.values.get(name)
+        return default if value is None else value
+
+    def get_bool(self, name: str, default: bool = False) -> bool:
+        value = self.values.get(name)
+        if value is None or not value.strip():
+            return default
+        return value.strip().lower() in ("1", "true", "yes", "on")
+
+    def get_int(self, name: str, default: int = 0) -> int:
+        try:
+            return int(self.values.get(name, "").strip())
+        except ValueError:
+            return default
+
+    def get_datetime(self, name: str, end_of_day: bool = False) -> Optional[datetime]:
+        """Parse a datetime setting; a bare date is midnight, or 23:59:59.999999 with ``end_of_day``"""
+        value = (self.values.get(name) or "").strip()
+        for fmt in DATETIME_FORMATS:
+            try:
+                return datetime.strptime(value, fmt)
+            except ValueError:
+                continue
+        try:
+            day = datetime.strptime(value, DATE_FORMAT)
+        except ValueError:
+            return None
+        return datetime.combine(day.date(), day_time.max) if end_of_day else day
+
+    @property
+    def election_title(self) -> str:
+        return self.get_str("election_title", "Election")
+
+    @property
+    def voting_enabled(self) -> bool:
+        return self.get_bool("voting_enabled", True)
+
+    @property
+    def voting_start(self) -> Optional[datetime]:
+        return self.get_datetime("voting_start_date")
+
+    @property
+    def voting_end(self) -> Optional[datetime]:
+        return self.get_datetime("voting_end_date", end_of_day=True)
+
+    @property
+    def results_visible(self) -> bool:
+        return self.get_bool("results_visible", False)
+
+    @property
+    def max_votes_per_position(self) -> int:
+        return self.get_int("max_votes_per_position", 1)
+
+    def voting_status(self, now: Optional[datetime] = None) -> Tuple[bool, str]:
+        """(open, reason) for the voting window at ``now``"""
+        now = now or datetime.now()
+        if not self.voting_enabled:
+            return False, "Voting is currently disabled."
+        start, end = self.voting_start, self.voting_end
+        if start and now < start:
+            return False, f"Voting opens on {start:%d %b %Y at %H:%M}."
+        if end and now > end:
+            return False, f"Voting closed on {end:%d %b %Y at %H:%M}."
+        return True, ""
+
+
+class SettingsCache:
+    """Process-wide settings cache revalidated against updated_at"""
+
+    def __init__(self, check_interval: float = 10.0):
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._settings: Optional[ElectionSettings] = None
+        self._checked_at = 0.0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, fetch: Callable[..., Optional[List[tuple]]]) -> Optional[ElectionSettings]:
+        """Return the current settings, using ``fetch(query, params)`` only when stale"""
+        with self._lock:
+            now = time.monotonic()
+            if self._settings is not None and now - self._checked_at < self.check_interval:
+                self.hits += 1
+                return self._settings
+
+            rows = fetch(SETTINGS_VERSION_QUERY)
+            if rows is None:
+                # Keep serving the last good settings if the check failed
+                return self._settings
+            version = tuple(rows[0]) if rows else None
+            if self._settings is not None and version == self._settings.version:
+                self._checked_at = now
+                self.hits += 1
+                return self._settings
+
+            rows = fetch(SETTINGS_QUERY)
+            if rows is None:
+                return self._settings
+            self.misses += 1
+            self._settings = ElectionSettings({name: value for name, value in rows}, version)
+            self._checked_at = now
+            return self._settings
+
+    def peek(self) -> Optional[ElectionSettings]:
+        """Return the cached settings without revalidating them"""
+        return self._settings
+
+    def invalidate(self):
+        """Force the next get() to reload the settings"""
+        with self._lock:
+            self._settings = None
+
+
+settings_cache = SettingsCache()
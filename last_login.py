@@ -0,0 +1,99 @@
+"""Buffered last_login updates for students and admin users.
+
+Logins only record a timestamp in memory; a background thread writes the
+pending timestamps every few seconds as one UPDATE per batch, so a busy
+login queue never waits on an extra commit per person.
+"""
+
+import threading
+from datetime import datetime
+from typing import Dict, Optional
+
+from mysql.connector import Error
+
+from db_pool import ConnectionPool
+
+
+TABLES = ("students", "admin_users")
+
+
+class LastLoginBuffer:
+    """Collects last_login timestamps and flushes them in batches"""
+
+    def __init__(self, pool: ConnectionPool, table: str, flush_interval: float = 5.0,
+                 batch_size: int = 500):
+        if table not in TABLES:
+            raise ValueError(f"Unknown table '{table}'")
+        self.pool = pool
+        self.table = table
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self._lock = threading.Lock()
+        self._pending: Dict[int, datetime] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.flushed = 0
+        self.failures = 0
+
+    def record(self, row_id: int, when: Optional[datetime] = None):
+        """Note a successful login; never touches the database"""
+        with self._lock:
+            self._pending[row_id] = when or datetime.now()
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def _update_query(self, count: int) -> str:
+        # One statement per batch: CASE picks each row's own timestamp
+        cases = " ".join(["WHEN %s THEN %s"] * count)
+        ids = ", ".join(["%s"] * count)
+        return f"UPDATE {self.table} SET last_login = CASE id {cases} END WHERE id IN ({ids})"
+
+    def flush(self) -> int:
+        """Write every pending timestamp now; returns how many rows were sent"""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return 0
+
+        items = list(pending.items())
+        written = 0
+        try:
+            with self.pool.connection() as connection:
+                cursor = connection.cursor()
+                try:
+                    for start in range(0, len(items), self.batch_size):
+                        batch = items[start:start + self.batch_size]
+                        params = [value for pair in batch for value in pair] + [row_id for row_id, _ in batch]
+                        cursor.execute(self._update_query(len(batch)), params)
+                        written += len(batch)
+                finally:
+                    cursor.close()
+        except Error:
+            self.failures += 1
+            # Put back what was not written; a newer login keeps its own time
+            with self._lock:
+                for row_id, when in items[written:]:
+                    self._pending.setdefault(row_id, when)
+        self.flushed += written
+        return written
+
+    def _run(self):
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
+
+    def start(self):
+        """Begin flushing on a background timer"""
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name=f"last-login-{self.table}", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Stop the timer and write whatever is still pending"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.flush_interval)
+            self._thread = None
+        self.flush()
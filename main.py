@@ -2,81 +2,296 @@
 # customtkinter==5.2.0
 # mysql-connector-python==8.1.0
 # Pillow==10.0.0
+# bcrypt==4.0.1
 
+from __future__ import annotations
+
+import time
+
+from startup import StartupTimer
+
+# Started before the heavy imports below so the startup report covers them
+startup_timer = StartupTimer()
+
+# customtkinter draws the login window, so it is the one heavy import paid before first paint
 import customtkinter as ctk
-import mysql.connector
-from mysql.connector import Error
 import tkinter.messagebox as messagebox
 from tkinter import ttk
-import hashlib
-from datetime import datetime
+from datetime import datetime, timedelta
 import threading
-from typing import Optional, List, Dict, Any
+import random
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Optional, List, Dict, Any
+
+from query_executor import QueryExecutor
+from query_profiler import QueryProfiler
+
+# Everything that pulls in mysql.connector is imported where it is used,
+# which is on a worker thread after the first paint (DatabaseManager._open_pool).
+if TYPE_CHECKING:
+    from db_pool import ConnectionPool
+    from last_login import LastLoginBuffer
+    from replica_router import ReplicaRouter
+    from results import ElectionResults
 
 # Set appearance mode and color theme
 ctk.set_appearance_mode("system")
 ctk.set_default_color_theme("blue")
 
+startup_timer.mark("imports")
+
 class DatabaseManager:
-    """Handles database connections and operations"""
+    """Handles database connections and operations through a shared connection pool.
     
-    def __init__(self):
+    Writes go to the primary; reads go to a read replica (see replica_router)
+    when one is configured and current.
+    """
+    
+    def __init__(self, pool_size: int = 5, acquire_timeout: float = 10.0, connect_timeout: int = 5,
+                 replicas: Optional[str] = None):
         self.host = "localhost"
         self.database = "mca_voting_system"
         self.user = "root"
         self.password = ""
-        self.connection = None
+        self.pool_size = pool_size
+        self.acquire_timeout = acquire_timeout
+        self.connect_timeout = connect_timeout
+        # host[:port],... ; None means MCA_READ_REPLICAS
+        self.replicas = replicas
+        self.pool: Optional[ConnectionPool] = None
+        self.router: Optional[ReplicaRouter] = None
+        self._connect_lock = threading.Lock()
+        self.admin_logins: Optional[LastLoginBuffer] = None
+        # Every page runs its queries here, never on the Tk thread
+        self.executor = QueryExecutor(max_workers=pool_size)
+        # Disabled unless MCA_PROFILE_QUERIES=1 or switched on from the Performance page
+        self.profiler = QueryProfiler.from_env()
+        self.ui_root = None
     
-    def connect(self) -> bool:
-        """Establish database connection"""
-        try:
-            self.connection = mysql.connector.connect(
+    def _open_pool(self):
+        """Create the connection pool and verify that the database is reachable; raises Error"""
+        # First use of the database modules, and so of mysql.connector
+        from ballot import ensure_ballot_version
+        from db_pool import ConnectionPool
+        from last_login import LastLoginBuffer
+        from replica_router import DEFAULT_READ_REPLICAS, Replica, ReplicaRouter, parse_replicas
+        
+        with self._connect_lock:
+            if self.pool:
+                return
+            pool = ConnectionPool(
+                pool_size=self.pool_size,
+                acquire_timeout=self.acquire_timeout,
                 host=self.host,
                 database=self.database,
                 user=self.user,
-                password=self.password
+                password=self.password,
+                connection_timeout=self.connect_timeout
             )
+            with pool.connection() as connection:
+                ensure_ballot_version(connection)
+            self.admin_logins = LastLoginBuffer(pool, "admin_users")
+            self.admin_logins.start()
+            # Replica pools connect lazily; one that is down is only skipped, never fatal
+            replicas = [
+                Replica(f"{host}:{port or 3306}", ConnectionPool(
+                    pool_size=self.pool_size,
+                    acquire_timeout=self.acquire_timeout,
+                    host=host,
+                    port=port or 3306,
+                    database=self.database,
+                    user=self.user,
+                    password=self.password,
+                    connection_timeout=self.connect_timeout
+                ))
+                for host, port in parse_replicas(DEFAULT_READ_REPLICAS if self.replicas is None else self.replicas)
+            ]
+            self.router = ReplicaRouter(pool, replicas)
+            self.router.start()
+            self.pool = pool
+    
+    def connect(self) -> bool:
+        """Create the connection pool and verify that the database is reachable"""
+        from mysql.connector import Error
+        
+        try:
+            self._open_pool()
             return True
         except Error as e:
-            messagebox.showerror("Database Error", f"Failed to connect to database: {e}")
+            self._show_error("Database Error", f"Failed to connect to database: {e}")
             return False
     
+    def connect_async(self, widget, on_ready, on_failed):
+        """Connect on a worker thread so the window can paint first; callbacks run on the Tk thread"""
+        self.executor.submit(widget, self._open_pool, on_success=lambda _: on_ready(), on_error=on_failed,
+                             name="DatabaseManager.connect")
+    
     def disconnect(self):
-        """Close database connection"""
-        if self.connection and self.connection.is_connected():
-            self.connection.close()
+        """Stop background queries and close all pooled database connections"""
+        self.executor.shutdown()
+        if self.admin_logins:
+            self.admin_logins.stop()
+        if self.router:
+            self.router.close_all()
+        if self.pool:
+            self.pool.close_all()
+    
+    def _show_error(self, title: str, message: str):
+        """Show an error dialog on the Tk thread, even when called from a worker"""
+        if self.ui_root is None or threading.current_thread() is threading.main_thread():
+            messagebox.showerror(title, message)
+        else:
+            self.ui_root.after(0, lambda: messagebox.showerror(title, message))
+    
+    def pool_stats(self) -> Dict[str, Any]:
+        """Return connection pool usage and wait metrics"""
+        if not self.pool:
+            return {}
+        return {**self.pool.size(), **self.pool.stats.snapshot()}
+    
+    def replica_stats(self) -> Dict[str, Any]:
+        """Return reads per replica, their lag and how often the primary had to serve reads"""
+        if not self.router:
+            return {}
+        return self.router.snapshot()
+    
+    def request_timings(self) -> Dict[str, Dict[str, float]]:
+        """Return per-request latency of background queries"""
+        return self.executor.timings.snapshot()
+    
+    def statement_cache_stats(self) -> Dict[str, Any]:
+        """Return prepared-statement cache hits and misses"""
+        from statement_cache import statement_stats
+        
+        return statement_stats.snapshot()
+    
+    def query_stats(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """Return the statements with the most total time, when profiling is on"""
+        return self.profiler.top(limit)
     
-    def execute_query(self, query: str, params: tuple = None) -> Optional[List[tuple]]:
-        """Execute SELECT query and return results"""
+    def _explain(self, connection, query: str, params: tuple = None) -> Optional[List[tuple]]:
+        """EXPLAIN a slow SELECT on the connection that just ran it; header row first"""
+        from mysql.connector import Error
+        
+        if not query.lstrip().upper().startswith("SELECT"):
+            return None
         try:
-            if not self.connection or not self.connection.is_connected():
-                if not self.connect():
-                    return None
-            
-            cursor = self.connection.cursor()
-            cursor.execute(query, params or ())
-            result = cursor.fetchall()
+            cursor = connection.cursor()
+            cursor.execute("EXPLAIN " + query, params or ())
+            plan = [tuple(cursor.column_names)] + cursor.fetchall()
             cursor.close()
-            return result
+            return plan
+        except Error:
+            return None
+    
+    def execute_query(self, query: str, params: tuple = None, primary: bool = False) -> Optional[List[tuple]]:
+        """Execute SELECT query and return results, on a current replica unless ``primary`` is set"""
+        from mysql.connector import Error
+        from statement_cache import statement
+        
+        # Resolved once so a disabled profiler costs a single attribute check
+        profiler = self.profiler if self.profiler.enabled else None
+        try:
+            if not self.pool and not self.connect():
+                return None
+            
+            started = time.perf_counter() if profiler else 0.0
+            
+            def run(connection):
+                acquired = time.perf_counter() if profiler else 0.0
+                with statement(connection, query, params) as cursor:
+                    result = cursor.fetchall()
+                if profiler:
+                    profiler.record(query, time.perf_counter() - acquired, acquired - started, len(result),
+                                    explain=lambda: self._explain(connection, query, params))
+                return result
+            
+            return self.router.read(run, primary)
         except Error as e:
-            messagebox.showerror("Database Error", f"Query execution failed: {e}")
+            if profiler:
+                profiler.record_error(query)
+            self._show_error("Database Error", f"Query execution failed: {e}")
             return None
     
+    def execute_primary_query(self, query: str, params: tuple = None) -> Optional[List[tuple]]:
+        """Execute a SELECT on the primary, for reads that feed straight into a write"""
+        return self.execute_query(query, params, primary=True)
+    
     def execute_update(self, query: str, params: tuple = None) -> bool:
         """Execute INSERT, UPDATE, DELETE queries"""
+        from mysql.connector import Error
+        from statement_cache import statement
+        
+        profiler = self.profiler if self.profiler.enabled else None
         try:
-            if not self.connection or not self.connection.is_connected():
-                if not self.connect():
-                    return False
+            if not self.pool and not self.connect():
+                return False
             
-            cursor = self.connection.cursor()
-            cursor.execute(query, params or ())
-            self.connection.commit()
-            cursor.close()
+            started = time.perf_counter() if profiler else 0.0
+            with self.pool.connection() as connection:
+                acquired = time.perf_counter() if profiler else 0.0
+                with statement(connection, query, params) as cursor:
+                    connection.commit()
+                    if profiler:
+                        profiler.record(query, time.perf_counter() - acquired, acquired - started, cursor.rowcount)
+            self.router.note_write()
+            return True
+        except Error as e:
+            if profiler:
+                profiler.record_error(query)
+            self._show_error("Database Error", f"Update execution failed: {e}")
+            return False
+    
+    def execute_transaction(self, statements: List[tuple]) -> bool:
+        """Execute several (query, params) statements atomically in one transaction"""
+        from mysql.connector import Error
+        from statement_cache import statement
+        
+        profiler = self.profiler if self.profiler.enabled else None
+        # The statement running when an error hits; COMMIT failures count against the last one
+        query = None
+        try:
+            if not self.pool and not self.connect():
+                return False
+            
+            started = time.perf_counter() if profiler else 0.0
+            with self.pool.connection() as connection:
+                acquired = time.perf_counter() if profiler else 0.0
+                connection.start_transaction()
+                try:
+                    for query, params in statements:
+                        if profiler:
+                            began = time.perf_counter()
+                        with statement(connection, query, params) as cursor:
+                            rowcount = cursor.rowcount
+                        if profiler:
+                            # Only the first statement waited for the connection
+                            profiler.record(query, time.perf_counter() - began, acquired - started, rowcount)
+                            started = acquired
+                    connection.commit()
+                except Error:
+                    connection.rollback()
+                    raise
+            self.router.note_write()
             return True
         except Error as e:
-            messagebox.showerror("Database Error", f"Update execution failed: {e}")
+            if profiler and query is not None:
+                profiler.record_error(query)
+            self._show_error("Database Error", f"Update execution failed: {e}")
             return False
+    
+    def bump_ballot_version(self) -> bool:
+        """Invalidate cached ballots after positions or candidates change"""
+        from ballot import BUMP_BALLOT_VERSION_QUERY
+        
+        return self.execute_update(BUMP_BALLOT_VERSION_QUERY)
+    
+    def get_results(self) -> Optional[ElectionResults]:
+        """Per-candidate results, recomputed only when the vote watermark moves"""
+        from results import get_results
+        
+        return get_results(self.execute_query)
 
 
 class User:
@@ -97,29 +312,76 @@ class AuthService:
         self.db_manager = db_manager
     
     def authenticate(self, username: str, password: str) -> Optional[User]:
-        """Authenticate user credentials"""
-        # Hash the password (assuming bcrypt-like hashing in production)
-        # For demo purposes, we'll check against stored hash
+        """Authenticate user credentials.
+        
+        Verification runs a deliberately slow KDF, so call this from the
+        query executor rather than the Tk thread. Legacy or under-cost
+        hashes are replaced once the password has been confirmed.
+        """
+        from passwords import hash_password, needs_rehash, verify_password
+        
         query = """
-        SELECT id, username, email, full_name, role 
+        SELECT id, username, email, full_name, role, password_hash
         FROM admin_users 
         WHERE username = %s AND is_active = 1
         """
         
-        result = self.db_manager.execute_query(query, (username,))
+        # A deactivated account or changed password must not linger on a lagging replica
+        result = self.db_manager.execute_primary_query(query, (username,))
         
         if result:
-            user_data = result[0]
-            # In production, properly verify hashed password
-            # For demo, we'll assume password verification passed
+            *user_data, stored_hash = result[0]
+            if not verify_password(password, stored_hash):
+                return None
+            if needs_rehash(stored_hash):
+                self.db_manager.execute_update(
+                    "UPDATE admin_users SET password_hash = %s WHERE id = %s AND password_hash = %s",
+                    (hash_password(password), user_data[0], stored_hash))
+            if self.db_manager.admin_logins:
+                self.db_manager.admin_logins.record(user_data[0])
             return User(*user_data)
         
         return None
 
 
+class DashboardSnapshot:
+    """All dashboard figures captured by a single query"""
+    
+    def __init__(self, total_students: int, voted_students: int, total_candidates: int,
+                 total_votes: int, position_votes: List[Dict[str, Any]]):
+        self.total_students = total_students
+        self.voted_students = voted_students
+        self.total_candidates = total_candidates
+        self.total_votes = total_votes
+        self.position_votes = position_votes
+    
+    @property
+    def turnout(self) -> float:
+        """Voter turnout percentage among active students"""
+        if self.total_students > 0:
+            return (self.voted_students / self.total_students) * 100
+        return 0.0
+
+
 class DashboardMetrics:
     """Calculate dashboard metrics"""
     
+    SNAPSHOT_QUERY = """
+    SELECT t.total_students, t.voted_students, t.total_candidates, t.total_votes,
+           p.id, p.position_name, COALESCE(SUM(vt.vote_count), 0) AS vote_count
+    FROM (
+        SELECT (SELECT COUNT(*) FROM students WHERE is_active = 1) AS total_students,
+               (SELECT COUNT(*) FROM students WHERE is_active = 1 AND has_voted = 1) AS voted_students,
+               (SELECT COUNT(*) FROM candidates WHERE is_active = 1) AS total_candidates,
+               (SELECT COALESCE(SUM(vote_count), 0) FROM vote_tallies) AS total_votes
+    ) t
+    LEFT JOIN positions p ON p.is_active = 1
+    LEFT JOIN vote_tallies vt ON vt.position_id = p.id
+    GROUP BY t.total_students, t.voted_students, t.total_candidates, t.total_votes,
+             p.id, p.position_name, p.display_order
+    ORDER BY p.display_order
+    """
+    
     def __init__(self, db_manager: DatabaseManager):
         self.db_manager = db_manager
     
@@ -137,25 +399,25 @@ class DashboardMetrics:
     
     def get_total_votes(self) -> int:
         """Get total number of votes cast"""
-        query = "SELECT COUNT(*) FROM votes"
+        query = "SELECT COALESCE(SUM(vote_count), 0) FROM vote_tallies"
         result = self.db_manager.execute_query(query)
         return result[0][0] if result else 0
     
     def get_voter_turnout(self) -> float:
         """Calculate voter turnout percentage"""
-        total_students = self.get_total_students()
-        voted_students = self.db_manager.execute_query("SELECT COUNT(DISTINCT student_id) FROM votes")
+        query = "SELECT COUNT(*), COALESCE(SUM(has_voted = 1), 0) FROM students WHERE is_active = 1"
+        result = self.db_manager.execute_query(query)
         
-        if total_students > 0 and voted_students:
-            return (voted_students[0][0] / total_students) * 100
+        if result and result[0][0] > 0:
+            return (int(result[0][1]) / result[0][0]) * 100
         return 0.0
     
     def get_position_vote_counts(self) -> List[Dict[str, Any]]:
         """Get vote counts per position"""
         query = """
-        SELECT p.position_name, COUNT(v.id) as vote_count
+        SELECT p.position_name, COALESCE(SUM(t.vote_count), 0) as vote_count
         FROM positions p
-        LEFT JOIN votes v ON p.id = v.position_id
+        LEFT JOIN vote_tallies t ON p.id = t.position_id
         WHERE p.is_active = 1
         GROUP BY p.id, p.position_name
         ORDER BY p.display_order
@@ -163,6 +425,251 @@ class DashboardMetrics:
         
         result = self.db_manager.execute_query(query)
         return [{"position": row[0], "votes": row[1]} for row in result] if result else []
+    
+    def snapshot(self) -> DashboardSnapshot:
+        """Get every dashboard figure in one round-trip"""
+        result = self.db_manager.execute_query(self.SNAPSHOT_QUERY)
+        if not result:
+            return DashboardSnapshot(0, 0, 0, 0, [])
+        
+        total_students, voted_students, total_candidates, total_votes = result[0][:4]
+        position_votes = [{"position_id": row[4], "position": row[5], "votes": row[6]}
+                          for row in result if row[4] is not None]
+        return DashboardSnapshot(int(total_students), int(voted_students), int(total_candidates),
+                                 int(total_votes), position_votes)
+
+
+class KeysetPager:
+    """Fetches fixed-size pages ordered by a unique key, either side of a known key"""
+    
+    def __init__(self, db_manager: DatabaseManager, select_sql: str, key_column: str,
+                 key_index: int, page_size: int = 200, descending: bool = False):
+        self.db_manager = db_manager
+        self.select_sql = select_sql
+        self.key_column = key_column
+        self.key_index = key_index
+        self.page_size = page_size
+        self.descending = descending
+        self.conditions: List[str] = []
+        self.params: tuple = ()
+    
+    def set_filters(self, conditions: List[str], params: tuple = ()):
+        """Restrict every page to rows matching all ``conditions`` (SQL with %s placeholders)"""
+        self.conditions = list(conditions)
+        self.params = tuple(params)
+    
+    def _fetch(self, condition: Optional[str], params: tuple, reverse: bool) -> List[tuple]:
+        conditions = list(self.conditions)
+        if condition:
+            conditions.append(condition)
+        query = self.select_sql
+        if conditions:
+            query += " WHERE " + " AND ".join(f"({c})" for c in conditions)
+        descending = self.descending != reverse
+        query += f" ORDER BY {self.key_column} {'DESC' if descending else 'ASC'} LIMIT %s"
+        result = self.db_manager.execute_query(query, (*self.params, *params, self.page_size))
+        rows = list(result) if result else []
+        if reverse:
+            rows.reverse()
+        return rows
+    
+    def first_page(self) -> List[tuple]:
+        """Get the first page in key order"""
+        return self._fetch(None, (), False)
+    
+    def page_after(self, key) -> List[tuple]:
+        """Get the page of rows whose key follows ``key``"""
+        op = "<" if self.descending else ">"
+        return self._fetch(f"{self.key_column} {op} %s", (key,), False)
+    
+    def page_before(self, key) -> List[tuple]:
+        """Get the page of rows whose key precedes ``key``, still in page order"""
+        op = ">" if self.descending else "<"
+        return self._fetch(f"{self.key_column} {op} %s", (key,), True)
+
+
+def like_prefix(text: str) -> str:
+    """Escape ``text`` for use as a LIKE prefix pattern"""
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+
+
+def fulltext_prefix_terms(text: str) -> str:
+    """Turn free text into a BOOLEAN MODE query requiring every word as a prefix"""
+    words = ["".join(ch for ch in word if ch.isalnum()) for word in text.split()]
+    return " ".join(f"+{word}*" for word in words if word)
+
+
+def parse_datetime_filter(text: str) -> Optional[datetime]:
+    """Parse a YYYY-MM-DD or YYYY-MM-DD HH:MM filter value"""
+    for fmt in ("%Y-%m-%d %H:%M", "%Y-%m-%d"):
+        try:
+            return datetime.strptime(text, fmt)
+        except ValueError:
+            continue
+    return None
+
+
+class KeyedTreeview:
+    """Reconciles a Treeview with fresh result rows by primary key.
+    
+    Items use the row key as their iid, so a refresh only deletes, inserts,
+    updates or moves the rows that actually changed. Unchanged rows cost no
+    Tk calls at all, and selection and scroll position survive the refresh.
+    """
+    
+    def __init__(self, tree: ttk.Treeview):
+        self.tree = tree
+        # iid -> values last written, so unchanged rows are skipped without asking Tk
+        self._values: Dict[str, tuple] = {}
+    
+    @staticmethod
+    def _iid(key) -> str:
+        return str(key)
+    
+    def sync(self, rows) -> List[str]:
+        """Make the tree show exactly ``rows``, an iterable of (key, values) pairs, in order; returns their iids"""
+        fresh = OrderedDict((self._iid(key), tuple(values)) for key, values in rows)
+        children = self.tree.get_children()
+        
+        # Anchor the scroll position on the first visible row
+        anchor = children[min(int(self.tree.yview()[0] * len(children)), len(children) - 1)] if children else ""
+        
+        stale = [iid for iid in children if iid not in fresh]
+        if stale:
+            # One Tk call however many rows went away
+            self.tree.delete(*stale)
+            for iid in stale:
+                self._values.pop(iid, None)
+        
+        kept = [iid for iid in children if iid in fresh]
+        reordered = kept != [iid for iid in fresh if iid in self._values]
+        for index, (iid, values) in enumerate(fresh.items()):
+            previous = self._values.get(iid)
+            if previous is None:
+                self.tree.insert("", index, iid=iid, values=values)
+            else:
+                if previous != values:
+                    self.tree.item(iid, values=values)
+                if reordered:
+                    self.tree.move(iid, "", index)
+            self._values[iid] = values
+        
+        if anchor and anchor in fresh and (stale or len(fresh) != len(kept)):
+            total = len(fresh)
+            self.tree.yview_moveto(self.tree.index(anchor) / total if total else 0.0)
+        return list(fresh)
+    
+    def insert(self, index, rows) -> List[str]:
+        """Insert (key, values) pairs starting at ``index`` (or "end"); returns their iids"""
+        iids = []
+        for offset, (key, values) in enumerate(rows):
+            iid = self._iid(key)
+            values = tuple(values)
+            position = index if index == "end" else index + offset
+            if iid in self._values:
+                # Already shown, e.g. a row that moved across a page boundary
+                self.tree.move(iid, "", position)
+                if self._values[iid] != values:
+                    self.tree.item(iid, values=values)
+            else:
+                self.tree.insert("", position, iid=iid, values=values)
+            self._values[iid] = values
+            iids.append(iid)
+        return iids
+    
+    def remove(self, iids):
+        """Delete the given items in a single Tk call"""
+        iids = [iid for iid in iids if iid in self._values]
+        if iids:
+            self.tree.delete(*iids)
+            for iid in iids:
+                del self._values[iid]
+
+
+class PagedTreeController:
+    """Keeps a bounded window of keyset pages in a Treeview, loading neighbours as it scrolls"""
+    
+    def __init__(self, owner, tree: ttk.Treeview, scrollbar: ttk.Scrollbar, pager: KeysetPager,
+                 format_row, max_pages: int = 5):
+        self.owner = owner
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.pager = pager
+        self.format_row = format_row
+        self.max_pages = max_pages
+        self.rows = KeyedTreeview(tree)
+        # Loaded window of pages, oldest first: [first_key, last_key, item_ids]
+        self._pages = []
+        self._more_before = False
+        self._more_after = False
+        self._loading = False
+        tree.configure(yscrollcommand=self.on_scroll)
+    
+    def _key(self, row):
+        return row[self.pager.key_index]
+    
+    def reload(self):
+        """Discard the loaded window and fetch the first page in the background"""
+        self._loading = True
+        
+        def update_ui(rows):
+            # Reconcile rather than rebuild, so an unchanged first page costs nothing
+            items = self.rows.sync((self._key(row), self.format_row(row)) for row in rows)
+            self._pages = [[self._key(rows[0]), self._key(rows[-1]), items]] if rows else []
+            self._more_before = False
+            self._more_after = len(rows) == self.pager.page_size
+            self._loading = False
+        
+        # Same key for every page load: a reload supersedes whatever is in flight
+        self.owner.run_async("page", self.pager.first_page, on_success=update_ui)
+    
+    def _append_page(self, rows):
+        if not rows:
+            return
+        items = self.rows.insert("end", [(self._key(row), self.format_row(row)) for row in rows])
+        self._pages.append([self._key(rows[0]), self._key(rows[-1]), items])
+        if len(self._pages) > self.max_pages:
+            self.rows.remove(self._pages.pop(0)[2])
+            self._more_before = True
+            # Keep the row the user was looking at in view
+            self.tree.see(items[0])
+    
+    def _prepend_page(self, rows):
+        if not rows:
+            return
+        items = self.rows.insert(0, [(self._key(row), self.format_row(row)) for row in rows])
+        self._pages.insert(0, [self._key(rows[0]), self._key(rows[-1]), items])
+        if len(self._pages) > self.max_pages:
+            self.rows.remove(self._pages.pop()[2])
+            self._more_after = True
+        # Keep the row the user was looking at in view
+        self.tree.see(items[-1])
+    
+    def on_scroll(self, first, last):
+        """Forward scroll position to the scrollbar and fetch neighbouring pages lazily"""
+        self.scrollbar.set(first, last)
+        if self._loading or not self._pages:
+            return
+        if float(last) >= 0.95 and self._more_after:
+            self._load_adjacent(after=True)
+        elif float(first) <= 0.05 and self._more_before:
+            self._load_adjacent(after=False)
+    
+    def _load_adjacent(self, after: bool):
+        self._loading = True
+        key = self._pages[-1][1] if after else self._pages[0][0]
+        
+        def update_ui(rows):
+            if after:
+                self._more_after = len(rows) == self.pager.page_size
+                self._append_page(rows)
+            else:
+                self._more_before = len(rows) == self.pager.page_size
+                self._prepend_page(rows)
+            self._loading = False
+        
+        fetch = self.pager.page_after if after else self.pager.page_before
+        self.owner.run_async("page", fetch, key, on_success=update_ui)
 
 
 class LoginPage(ctk.CTkFrame):
@@ -205,8 +712,12 @@ class LoginPage(ctk.CTkFrame):
         self.password_entry.grid(row=3, column=0, padx=20, pady=10)
         
         # Login button
-        login_button = ctk.CTkButton(login_frame, text="Login", command=self.login, width=300)
-        login_button.grid(row=4, column=0, padx=20, pady=(20, 10))
+        self.login_button = ctk.CTkButton(login_frame, text="Login", command=self.login, width=300)
+        self.login_button.grid(row=4, column=0, padx=20, pady=(20, 10))
+        
+        # Connection status, shown while the database is still being reached
+        self.status_label = ctk.CTkLabel(login_frame, text="", text_color="gray")
+        self.status_label.grid(row=5, column=0, padx=20, pady=(0, 10))
         
         # Bind Enter key to login
         self.username_entry.bind("<Return>", lambda e: self.login())
@@ -215,8 +726,16 @@ class LoginPage(ctk.CTkFrame):
         # Focus on username field
         self.username_entry.focus()
     
+    def set_connecting(self, connecting: bool, text: str = "Connecting to database..."):
+        """Hold logins until the database pool is ready; the form can be filled in meanwhile"""
+        self.login_button.configure(state="disabled" if connecting else "normal")
+        self.status_label.configure(text=text if connecting else "")
+    
     def login(self):
         """Handle login attempt"""
+        if self.login_button.cget("state") == "disabled":
+            # Still connecting, or a login is already in flight
+            return
         username = self.username_entry.get().strip()
         password = self.password_entry.get().strip()
         
@@ -224,14 +743,30 @@ class LoginPage(ctk.CTkFrame):
             messagebox.showerror("Error", "Please enter both username and password")
             return
         
-        # Authenticate user
-        user = self.auth_service.authenticate(username, password)
+        def on_result(user: Optional[User]):
+            self.login_button.configure(state="normal")
+            if user:
+                self.on_login_success(user)
+            else:
+                messagebox.showerror("Error", "Invalid username or password")
+                self.password_entry.delete(0, "end")
         
-        if user:
-            self.on_login_success(user)
-        else:
-            messagebox.showerror("Error", "Invalid username or password")
-            self.password_entry.delete(0, "end")
+        def on_error(e: Exception):
+            # authenticate() has already imported passwords by the time it can fail
+            from passwords import UnsupportedHashError
+            
+            self.login_button.configure(state="normal")
+            if isinstance(e, UnsupportedHashError):
+                messagebox.showerror("Error", str(e))
+            else:
+                messagebox.showerror("Error", f"Login failed: {e}")
+        
+        # Authenticate off the Tk thread so a slow database doesn't freeze the window
+        self.login_button.configure(state="disabled")
+        self.auth_service.db_manager.executor.submit(
+            self, self.auth_service.authenticate, username, password,
+            on_success=on_result, on_error=on_error, key=(id(self), "login"),
+            name="LoginPage.login")
 
 
 class Sidebar(ctk.CTkFrame):
@@ -259,8 +794,10 @@ class Sidebar(ctk.CTkFrame):
             ("Candidates", "candidates"),
             ("Positions", "positions"),
             ("Votes", "votes"),
+            ("Results", "results"),
             ("Settings", "settings"),
-            ("Admin Users", "admin_users")
+            ("Admin Users", "admin_users"),
+            ("Performance", "performance")
         ]
         
         self.nav_buttons = {}
@@ -294,16 +831,190 @@ class Sidebar(ctk.CTkFrame):
         self.on_page_select("logout")
 
 
-class DashboardPage(ctk.CTkFrame):
-    """Dashboard page with metrics"""
+# One cheap probe shared by every cached page; each page compares only the
+# fields its data depends on.
+# students has no updated_at, so its field is the row count plus a checksum of
+# the columns the pages show; an edit, deactivation or delete of any row moves it
+DATA_VERSION_QUERY = """
+SELECT (SELECT COALESCE(MAX(id), 0) FROM votes),
+       (SELECT COALESCE(SUM(vote_count), 0) FROM vote_tallies),
+       (SELECT CONCAT(COUNT(*), ':', BIT_XOR(CRC32(CONCAT_WS('|', id, student_id, full_name, email, program,
+                                                              year_of_study, has_voted, is_active))))
+        FROM students),
+       (SELECT setting_value FROM election_settings WHERE setting_name = 'ballot_version'),
+       (SELECT MAX(updated_at) FROM election_settings)
+"""
+VERSION_VOTES = (0, 1)
+VERSION_STUDENTS = (2,)
+VERSION_BALLOT = (3,)
+VERSION_SETTINGS = (4,)
+
+
+class CachedPage(ctk.CTkFrame, ABC):
+    """Base for pages kept alive between visits.
+
+    A revisit refetches only when the page is older than STALE_AFTER seconds
+    or when the fields of DATA_VERSION_QUERY listed in VERSION_FIELDS moved.
+    """
+    
+    STALE_AFTER = 120.0
+    VERSION_FIELDS: tuple = ()
     
     def __init__(self, parent, db_manager: DatabaseManager):
         super().__init__(parent)
         self.db_manager = db_manager
+        self._loaded_at = time.monotonic()
+        self._data_version = None
+        self._probe_version(refresh=False)
+    
+    @abstractmethod
+    def refresh(self):
+        """Reload the page's data"""
+    
+    def run_async(self, key: Optional[str], fn, *args, on_success=None, on_error=None):
+        """Run ``fn(*args)`` on the shared query executor and deliver the result on the Tk thread.
+        
+        A newer request from this page with the same ``key`` supersedes an older one.
+        """
+        name = f"{type(self).__name__}.{key or getattr(fn, '__name__', 'request')}"
+        return self.db_manager.executor.submit(
+            self, fn, *args, on_success=on_success, on_error=on_error,
+            key=(id(self), key) if key else None, name=name)
+    
+    def _probe_version(self, refresh: bool, then=None):
+        """Read the version watermark; ``then(changed)`` is called once it is known"""
+        if not self.VERSION_FIELDS:
+            return
+        
+        def apply(result):
+            if not result:
+                if then:
+                    then(False)
+                return
+            version = tuple(result[0][i] for i in self.VERSION_FIELDS)
+            changed = self._data_version is not None and version != self._data_version
+            self._data_version = version
+            if refresh and changed:
+                self._loaded_at = time.monotonic()
+                self.refresh()
+            if then:
+                then(changed)
+        
+        def failed(e: Exception):
+            if then:
+                then(False)
+        
+        self.run_async("version", self.db_manager.execute_query, DATA_VERSION_QUERY,
+                       on_success=apply, on_error=failed)
+    
+    def on_show(self):
+        """Called each time the page is shown again; refetches only stale data"""
+        if time.monotonic() - self._loaded_at > self.STALE_AFTER:
+            self._loaded_at = time.monotonic()
+            self._probe_version(refresh=False)
+            self.refresh()
+        else:
+            self._probe_version(refresh=True)
+
+
+class LivePage(CachedPage):
+    """Page that can keep itself current while it is on screen.
+    
+    Live updates only re-run the page's queries when the DATA_VERSION_QUERY
+    watermark moves; while it stands still the check interval doubles up to
+    MAX_IDLE_INTERVAL. Subclasses place create_live_controls() in their
+    layout and call _schedule_check() once their widgets exist.
+    """
+    
+    REFRESH_INTERVALS = {"2 s": 2.0, "5 s": 5.0, "15 s": 15.0, "60 s": 60.0}
+    DEFAULT_INTERVAL = "5 s"
+    MAX_IDLE_INTERVAL = 60.0
+    
+    def __init__(self, parent, db_manager: DatabaseManager):
+        super().__init__(parent, db_manager)
+        self._auto_job = None
+        self._delay = self.REFRESH_INTERVALS[self.DEFAULT_INTERVAL]
+    
+    def create_live_controls(self, parent) -> ctk.CTkFrame:
+        """Build the last-updated label, Live updates switch and interval menu"""
+        live_frame = ctk.CTkFrame(parent, fg_color="transparent")
+        self.updated_label = ctk.CTkLabel(live_frame, text="")
+        self.updated_label.grid(row=0, column=0, padx=10)
+        self.live_var = ctk.BooleanVar(value=True)
+        ctk.CTkSwitch(live_frame, text="Live updates", variable=self.live_var,
+                      command=self._on_live_changed).grid(row=0, column=1, padx=10)
+        self.interval_menu = ctk.CTkOptionMenu(live_frame, values=list(self.REFRESH_INTERVALS),
+                                               command=lambda _: self._on_live_changed(), width=80)
+        self.interval_menu.set(self.DEFAULT_INTERVAL)
+        self.interval_menu.grid(row=0, column=2, padx=10)
+        return live_frame
+    
+    def mark_updated(self):
+        self.updated_label.configure(text=f"Updated {datetime.now():%H:%M:%S}")
+    
+    @property
+    def base_interval(self) -> float:
+        return self.REFRESH_INTERVALS.get(self.interval_menu.get(), 5.0)
+    
+    def _on_live_changed(self):
+        self._delay = self.base_interval
+        self._schedule_check()
+    
+    def _schedule_check(self):
+        if self._auto_job is not None:
+            self.after_cancel(self._auto_job)
+            self._auto_job = None
+        if not self.live_var.get():
+            return
+        # A little jitter keeps several open pages from probing in lockstep
+        delay = self._delay * random.uniform(0.9, 1.1)
+        self._auto_job = self.after(int(delay * 1000), self._check_for_changes)
+    
+    def _check_for_changes(self):
+        """Probe the cheap watermark and refresh only if this page's data moved"""
+        self._auto_job = None
+        if not self.winfo_ismapped():
+            # Hidden in the page cache; on_show catches up when it comes back
+            self._delay = min(self._delay * 2, self.MAX_IDLE_INTERVAL)
+            self._schedule_check()
+            return
+        
+        def checked(changed: bool):
+            if changed:
+                self._delay = self.base_interval
+            else:
+                self._delay = min(self._delay * 2, self.MAX_IDLE_INTERVAL)
+            self._schedule_check()
+        
+        self._probe_version(refresh=True, then=checked)
+    
+    def on_show(self):
+        super().on_show()
+        self._delay = self.base_interval
+        self._schedule_check()
+    
+    def destroy(self):
+        if self._auto_job is not None:
+            self.after_cancel(self._auto_job)
+            self._auto_job = None
+        super().destroy()
+
+
+class DashboardPage(LivePage):
+    """Dashboard page with metrics"""
+    
+    VERSION_FIELDS = VERSION_VOTES + VERSION_BALLOT + VERSION_STUDENTS
+
+    def __init__(self, parent, db_manager: DatabaseManager):
+        super().__init__(parent, db_manager)
         self.metrics = DashboardMetrics(db_manager)
         
         self.setup_ui()
         self.load_metrics()
+        self._schedule_check()
+    
+    def refresh(self):
+        self.load_metrics()
     
     def setup_ui(self):
         """Setup dashboard UI"""
@@ -343,10 +1054,15 @@ class DashboardPage(ctk.CTkFrame):
         self.votes_tree.column("Position", width=200)
         self.votes_tree.column("Votes", width=100)
         self.votes_tree.grid(row=1, column=0, padx=20, pady=(0, 20), sticky="nsew")
+        self.votes_rows = KeyedTreeview(self.votes_tree)
         
         # Refresh button
         refresh_btn = ctk.CTkButton(self, text="Refresh Data", command=self.load_metrics)
         refresh_btn.grid(row=3, column=0, padx=20, pady=10, sticky="w")
+        
+        # Live update controls
+        live_frame = self.create_live_controls(self)
+        live_frame.grid(row=3, column=1, padx=20, pady=10, sticky="e")
     
     def create_metric_card(self, parent, title: str, value: str, column: int) -> ctk.CTkLabel:
         """Create a metric card"""
@@ -363,54 +1079,51 @@ class DashboardPage(ctk.CTkFrame):
     
     def load_metrics(self):
         """Load and display metrics"""
-        # Fetch data in background, then update UI via .after (thread-safe)
-        def fetch_data():
-            try:
-                total_students = self.metrics.get_total_students()
-                total_candidates = self.metrics.get_total_candidates()
-                total_votes = self.metrics.get_total_votes()
-                turnout = self.metrics.get_voter_turnout()
-                position_votes = self.metrics.get_position_vote_counts()
-            except Exception as e:
-                # Schedule an error message on the main thread if needed
-                def _err():
-                    messagebox.showerror("Error", f"Failed to load metrics: {e}")
-                self.after(0, _err)
-                return
-            
-            def update_ui():
-                # Update metric cards
-                self.total_students_label.configure(text=str(total_students))
-                self.total_candidates_label.configure(text=str(total_candidates))
-                self.total_votes_label.configure(text=str(total_votes))
-                self.turnout_label.configure(text=f"{turnout:.1f}%")
-                
-                # Update votes by position
-                for item in self.votes_tree.get_children():
-                    self.votes_tree.delete(item)
-                
-                for data in position_votes:
-                    self.votes_tree.insert("", "end", values=(data["position"], data["votes"]))
+        def update_ui(snapshot: DashboardSnapshot):
+            # Update metric cards
+            self.total_students_label.configure(text=str(snapshot.total_students))
+            self.total_candidates_label.configure(text=str(snapshot.total_candidates))
+            self.total_votes_label.configure(text=str(snapshot.total_votes))
+            self.turnout_label.configure(text=f"{snapshot.turnout:.1f}%")
+            self.mark_updated()
             
-            self.after(0, update_ui)
+            # Update votes by position
+            self.votes_rows.sync((data["position_id"], (data["position"], data["votes"]))
+                                 for data in snapshot.position_votes)
+        
+        def on_error(e: Exception):
+            messagebox.showerror("Error", f"Failed to load metrics: {e}")
         
-        threading.Thread(target=fetch_data, daemon=True).start()
+        self.run_async("metrics", self.metrics.snapshot, on_success=update_ui, on_error=on_error)
 
 
-class StudentsPage(ctk.CTkFrame):
+class StudentsPage(CachedPage):
     """Students management page"""
 
+    PAGE_SIZE = 200
+    MAX_LOADED_PAGES = 5
+    STUDENTS_SELECT = """
+    SELECT id, student_id, full_name, email, program, year_of_study,
+           has_voted, is_active
+    FROM students
+    """
+
+    VERSION_FIELDS = VERSION_STUDENTS + VERSION_VOTES
+
     def __init__(self, parent, db_manager: DatabaseManager):
-        super().__init__(parent)
-        self.db_manager = db_manager
+        super().__init__(parent, db_manager)
+        self.pager = KeysetPager(db_manager, self.STUDENTS_SELECT, "student_id", 1, self.PAGE_SIZE)
 
         self.setup_ui()
         self.load_students()
 
+    def refresh(self):
+        self.load_students()
+
     def setup_ui(self):
         """Setup students page UI"""
         self.grid_columnconfigure(0, weight=1)
-        self.grid_rowconfigure(1, weight=1)
+        self.grid_rowconfigure(2, weight=1)
 
         # Title and controls
         header_frame = ctk.CTkFrame(self)
@@ -427,14 +1140,36 @@ class StudentsPage(ctk.CTkFrame):
         edit_btn = ctk.CTkButton(btn_frame, text="Edit", command=self.edit_student)
         del_btn = ctk.CTkButton(btn_frame, text="Delete", command=self.delete_student)
         refresh_btn = ctk.CTkButton(btn_frame, text="Refresh", command=self.load_students)
+        import_btn = ctk.CTkButton(btn_frame, text="Import CSV", command=self.import_csv)
         add_btn.grid(row=0, column=0, padx=5)
         edit_btn.grid(row=0, column=1, padx=5)
         del_btn.grid(row=0, column=2, padx=5)
         refresh_btn.grid(row=0, column=3, padx=5)
+        import_btn.grid(row=0, column=4, padx=5)
+
+        self.import_status_label = ctk.CTkLabel(header_frame, text="")
+        self.import_status_label.grid(row=1, column=0, columnspan=3, padx=20, pady=(0, 10), sticky="w")
+
+        # Search / filter bar
+        filter_frame = ctk.CTkFrame(self)
+        filter_frame.grid(row=1, column=0, padx=20, pady=(0, 10), sticky="ew")
+        self.id_filter = ctk.CTkEntry(filter_frame, placeholder_text="Student ID starts with", width=170)
+        self.name_filter = ctk.CTkEntry(filter_frame, placeholder_text="Name", width=170)
+        self.program_filter = ctk.CTkEntry(filter_frame, placeholder_text="Program", width=110)
+        self.voted_filter = ttk.Combobox(filter_frame, values=["Any", "Voted", "Not voted"], state="readonly", width=10)
+        self.voted_filter.set("Any")
+        self.id_filter.grid(row=0, column=0, padx=5, pady=8)
+        self.name_filter.grid(row=0, column=1, padx=5, pady=8)
+        self.program_filter.grid(row=0, column=2, padx=5, pady=8)
+        self.voted_filter.grid(row=0, column=3, padx=5, pady=8)
+        ctk.CTkButton(filter_frame, text="Search", command=self.load_students, width=80).grid(row=0, column=4, padx=5)
+        ctk.CTkButton(filter_frame, text="Clear", command=self.clear_filters, width=80).grid(row=0, column=5, padx=5)
+        for entry in (self.id_filter, self.name_filter, self.program_filter):
+            entry.bind("<Return>", lambda e: self.load_students())
 
         # Students table
         table_frame = ctk.CTkFrame(self)
-        table_frame.grid(row=1, column=0, padx=20, pady=(0, 20), sticky="nsew")
+        table_frame.grid(row=2, column=0, padx=20, pady=(0, 20), sticky="nsew")
         table_frame.grid_columnconfigure(0, weight=1)
         table_frame.grid_rowconfigure(0, weight=1)
 
@@ -445,41 +1180,50 @@ class StudentsPage(ctk.CTkFrame):
             self.students_tree.heading(col, text=col)
             self.students_tree.column(col, width=120)
 
-        # Scrollbar
+        # Scrollbar; scrolling near either end pulls in the neighbouring page
         scrollbar = ttk.Scrollbar(table_frame, orient="vertical", command=self.students_tree.yview)
-        self.students_tree.configure(yscrollcommand=scrollbar.set)
+        self.table = PagedTreeController(self, self.students_tree, scrollbar, self.pager,
+                                         self._format_row, self.MAX_LOADED_PAGES)
 
         self.students_tree.grid(row=0, column=0, sticky="nsew")
         scrollbar.grid(row=0, column=1, sticky="ns")
 
-    def load_students(self):
-        """Load students data in a separate thread to avoid UI freeze."""
-        def fetch_and_update():
-            query = """
-            SELECT id, student_id, full_name, email, program, year_of_study,
-                   has_voted, is_active
-            FROM students
-            ORDER BY student_id
-            """
-            result = self.db_manager.execute_query(query)
-            
-            def update_ui():
-                # Clear existing data
-                for item in self.students_tree.get_children():
-                    self.students_tree.delete(item)
-                
-                if result:
-                    for row in result:
-                        has_voted = "Yes" if row[6] else "No"
-                        is_active = "Active" if row[7] else "Inactive"
-                        display_row = (*row[:6], has_voted, is_active)
-                        self.students_tree.insert("", "end", values=display_row)
-            
-            # Schedule the UI update on the main thread
-            self.after(0, update_ui)
+    def _format_row(self, row) -> tuple:
+        has_voted = "Yes" if row[6] else "No"
+        is_active = "Active" if row[7] else "Inactive"
+        return (*row[:6], has_voted, is_active)
+
+    def _apply_filters(self):
+        conditions, params = [], []
+        student_id = self.id_filter.get().strip()
+        if student_id:
+            conditions.append("student_id LIKE %s")
+            params.append(like_prefix(student_id))
+        name_terms = fulltext_prefix_terms(self.name_filter.get())
+        if name_terms:
+            conditions.append("MATCH(full_name) AGAINST (%s IN BOOLEAN MODE)")
+            params.append(name_terms)
+        program = self.program_filter.get().strip()
+        if program:
+            conditions.append("program = %s")
+            params.append(program)
+        voted = self.voted_filter.get()
+        if voted != "Any":
+            conditions.append("has_voted = %s")
+            params.append(1 if voted == "Voted" else 0)
+        self.pager.set_filters(conditions, tuple(params))
+
+    def clear_filters(self):
+        """Reset the search bar and reload every student"""
+        for entry in (self.id_filter, self.name_filter, self.program_filter):
+            entry.delete(0, "end")
+        self.voted_filter.set("Any")
+        self.load_students()
 
-        # Run the database query in a background thread
-        threading.Thread(target=fetch_and_update, daemon=True).start()
+    def load_students(self):
+        """Load the first page of matching students in a separate thread to avoid UI freeze."""
+        self._apply_filters()
+        self.table.reload()
 
     def _open_student_modal(self, title="New Student", data=None):
         """Opens a modal for adding or editing a student."""
@@ -530,35 +1274,36 @@ class StudentsPage(ctk.CTkFrame):
                 messagebox.showerror("Error", "Student ID, Full Name, and Email are required.", parent=modal)
                 return
 
-            # This function will run in a background thread
-            def save_to_db():
-                ok = False
+            if not data and not password:
+                messagebox.showerror("Error", "Password is required for new students.", parent=modal)
+                return
+
+            # Runs on the query executor: hashing takes tens of milliseconds
+            def save():
+                from passwords import hash_password
+                
                 if data:  # Update existing student
                     if password:
-                        # Store plain text password
                         query = """UPDATE students SET student_id=%s, full_name=%s, email=%s, password_hash=%s, program=%s, year_of_study=%s, is_active=%s WHERE id=%s"""
-                        params = (student_id, full_name, email, password, program, year or 0, is_active, data["id"])
+                        params = (student_id, full_name, email, hash_password(password), program, year or 0, is_active, data["id"])
                     else:
                         query = """UPDATE students SET student_id=%s, full_name=%s, email=%s, program=%s, year_of_study=%s, is_active=%s WHERE id=%s"""
                         params = (student_id, full_name, email, program, year or 0, is_active, data["id"])
-                    ok = self.db_manager.execute_update(query, params)
                 else:  # Insert new student
-                    if not password:
-                        # Show error on main thread
-                        self.after(0, lambda: messagebox.showerror("Error", "Password is required for new students.", parent=modal))
-                        return
-                    # Store plain text password
                     query = """INSERT INTO students (student_id, full_name, email, password_hash, program, year_of_study, is_active) VALUES (%s, %s, %s, %s, %s, %s, %s)"""
-                    params = (student_id, full_name, email, password, program, year or 0, is_active)
-                    ok = self.db_manager.execute_update(query, params)
+                    params = (student_id, full_name, email, hash_password(password), program, year or 0, is_active)
+                return self.db_manager.execute_update(query, params)
 
-                # After DB operation, update UI on the main thread
+            def on_saved(ok: bool):
                 if ok:
-                    self.after(0, modal.destroy)
-                    self.load_students() # This will also run in a thread
+                    modal.destroy()
+                    self.load_students()
+                else:
+                    save_btn.configure(state="normal")
 
-            # Run the save operation in a thread
-            threading.Thread(target=save_to_db, daemon=True).start()
+            # Disabled until the write finishes so a double click can't save twice
+            save_btn.configure(state="disabled")
+            self.run_async(None, save, on_success=on_saved)
 
         btn_frame = ctk.CTkFrame(modal)
         btn_frame.pack(pady=10)
@@ -567,6 +1312,91 @@ class StudentsPage(ctk.CTkFrame):
         save_btn.grid(row=0, column=0, padx=10)
         cancel_btn.grid(row=0, column=1, padx=10)
 
+    def import_csv(self):
+        """Bulk import students from a CSV file in a background thread."""
+        # Only needed here, so not paid for at startup
+        from tkinter import filedialog
+        from mysql.connector import Error
+        from student_import import ChunkReport, import_students_csv
+
+        path = filedialog.askopenfilename(title="Import Students",
+                                          filetypes=[("CSV files", "*.csv"), ("All files", "*.*")])
+        if not path:
+            return
+
+        rejected = []
+
+        def on_chunk(report: ChunkReport):
+            rejected.extend(report.rejected)
+            text = (f"Chunk {report.index}: {report.inserted} imported, {len(report.rejected)} rejected "
+                    f"({report.rows_per_second:.0f} rows/s)")
+            self.after(0, lambda: self.import_status_label.configure(text=text))
+
+        def run_import():
+            try:
+                with self.db_manager.pool.connection() as connection:
+                    summary = import_students_csv(path, connection, on_chunk=on_chunk)
+                self.db_manager.router.note_write()
+            except (Error, ValueError, OSError) as e:
+                self.after(0, lambda err=e: messagebox.showerror("Import Failed", str(err)))
+                return
+
+            def done():
+                self.import_status_label.configure(
+                    text=f"Imported {summary.inserted}, rejected {summary.rejected} "
+                         f"in {summary.seconds:.1f}s ({summary.rows_per_second:.0f} rows/s)")
+                if rejected:
+                    self._show_import_rejects(path, summary.inserted, rejected)
+                else:
+                    messagebox.showinfo("Import Complete", f"Imported {summary.inserted} student(s).")
+                self.load_students()
+            self.after(0, done)
+
+        self.import_status_label.configure(text="Importing...")
+        threading.Thread(target=run_import, daemon=True).start()
+
+    def _show_import_rejects(self, path: str, inserted: int, rejected: List[tuple]):
+        """List the rejected CSV lines and offer to save them next to the input file."""
+        import csv
+        import os
+        from tkinter import filedialog
+
+        modal = ctk.CTkToplevel(self)
+        modal.title("Import Complete")
+        modal.geometry("560x420")
+        modal.transient(self)
+        modal.grab_set()
+
+        ctk.CTkLabel(modal, text=f"Imported {inserted} student(s). Rejected {len(rejected)} row(s):",
+                     font=ctk.CTkFont(size=14, weight="bold")).pack(padx=10, pady=(10, 5), anchor="w")
+        box = ctk.CTkTextbox(modal, font=ctk.CTkFont(family="Courier", size=11))
+        box.pack(padx=10, pady=5, fill="both", expand=True)
+        box.insert("end", "\n".join(f"Line {line_num}: {reason}" for line_num, reason in rejected))
+        box.configure(state="disabled")
+
+        def save_rejects():
+            base, _ = os.path.splitext(path)
+            target = filedialog.asksaveasfilename(parent=modal, title="Save Rejected Rows",
+                                                  initialdir=os.path.dirname(path),
+                                                  initialfile=os.path.basename(base) + "_rejects.csv",
+                                                  defaultextension=".csv", filetypes=[("CSV files", "*.csv")])
+            if not target:
+                return
+            try:
+                with open(target, "w", newline="", encoding="utf-8") as f:
+                    writer = csv.writer(f)
+                    writer.writerow(["line", "reason"])
+                    writer.writerows(rejected)
+            except OSError as e:
+                messagebox.showerror("Save Failed", str(e), parent=modal)
+                return
+            messagebox.showinfo("Saved", f"Wrote {len(rejected)} rejected row(s) to {target}", parent=modal)
+
+        btn_frame = ctk.CTkFrame(modal, fg_color="transparent")
+        btn_frame.pack(pady=10)
+        ctk.CTkButton(btn_frame, text="Save as CSV...", command=save_rejects).grid(row=0, column=0, padx=10)
+        ctk.CTkButton(btn_frame, text="Close", command=modal.destroy).grid(row=0, column=1, padx=10)
+
     def add_student(self):
         """Opens the modal to add a new student."""
         self._open_student_modal("Add Student")
@@ -581,24 +1411,25 @@ class StudentsPage(ctk.CTkFrame):
         item_values = self.students_tree.item(selected_item[0], "values")
         student_db_id = item_values[0]
 
-        # Fetch full data to ensure we have everything
-        query = "SELECT id, student_id, full_name, email, program, year_of_study, is_active FROM students WHERE id = %s"
-        result = self.db_manager.execute_query(query, (student_db_id,))
+        def open_modal(result):
+            if not result:
+                messagebox.showerror("Error", "Could not find the selected student in the database.")
+                return
 
-        if not result:
-            messagebox.showerror("Error", "Could not find the selected student in the database.")
-            return
+            student_data = {
+                "id": result[0][0],
+                "student_id": result[0][1],
+                "full_name": result[0][2],
+                "email": result[0][3],
+                "program": result[0][4],
+                "year_of_study": result[0][5],
+                "is_active": result[0][6]
+            }
+            self._open_student_modal("Edit Student", data=student_data)
 
-        student_data = {
-            "id": result[0][0],
-            "student_id": result[0][1],
-            "full_name": result[0][2],
-            "email": result[0][3],
-            "program": result[0][4],
-            "year_of_study": result[0][5],
-            "is_active": result[0][6]
-        }
-        self._open_student_modal("Edit Student", data=student_data)
+        # Fetch full data to ensure we have everything
+        query = "SELECT id, student_id, full_name, email, program, year_of_study, is_active FROM students WHERE id = %s"
+        self.run_async("edit", self.db_manager.execute_primary_query, query, (student_db_id,), on_success=open_modal)
 
     def delete_student(self):
         """Deletes the selected student."""
@@ -613,30 +1444,38 @@ class StudentsPage(ctk.CTkFrame):
         item_values = self.students_tree.item(selected_item[0], "values")
         student_db_id = item_values[0]
 
-        def delete_from_db():
-            query = "DELETE FROM students WHERE id = %s"
-            if self.db_manager.execute_update(query, (student_db_id,)):
-                # Show success and reload on the main thread
-                self.after(0, lambda: messagebox.showinfo("Success", "Student deleted successfully."))
+        def on_deleted(ok: bool):
+            # Error is already shown by db_manager
+            if ok:
+                messagebox.showinfo("Success", "Student deleted successfully.")
                 self.load_students()
-            else:
-                # Error is already shown by db_manager
-                pass
+
+        from tallies import TALLY_DECREMENT_STUDENT_QUERY
         
-        # Run delete in a thread
-        threading.Thread(target=delete_from_db, daemon=True).start()
+        # Deleting a student cascades to their votes, so take those votes
+        # off the running tallies in the same transaction.
+        statements = [
+            (TALLY_DECREMENT_STUDENT_QUERY, (student_db_id,)),
+            ("DELETE FROM students WHERE id = %s", (student_db_id,)),
+        ]
+        self.run_async(None, self.db_manager.execute_transaction, statements, on_success=on_deleted)
 
 
-class CandidatesPage(ctk.CTkFrame):
+class CandidatesPage(CachedPage):
     """Candidates management page with basic CRUD"""
+    VERSION_FIELDS = VERSION_BALLOT
+
     def __init__(self, parent, db_manager: DatabaseManager):
-        super().__init__(parent)
-        self.db_manager = db_manager
+        super().__init__(parent, db_manager)
         self.positions = []
         self.setup_ui()
         self.load_positions()
         self.load_candidates()
 
+    def refresh(self):
+        self.load_positions()
+        self.load_candidates()
+
     def setup_ui(self):
         self.grid_columnconfigure(0, weight=1)
         header = ctk.CTkFrame(self)
@@ -657,13 +1496,28 @@ class CandidatesPage(ctk.CTkFrame):
         del_btn.grid(row=0, column=2, padx=5)
         refresh_btn.grid(row=0, column=3, padx=5)
 
+        filter_frame = ctk.CTkFrame(self)
+        filter_frame.grid(row=1, column=0, sticky="ew", padx=20, pady=(0,10))
+        self.name_filter = ctk.CTkEntry(filter_frame, placeholder_text="Name contains", width=170)
+        self.name_filter.grid(row=0, column=0, padx=5, pady=8)
+        self.position_filter = ttk.Combobox(filter_frame, values=["All positions"], state="readonly", width=20)
+        self.position_filter.set("All positions")
+        self.position_filter.grid(row=0, column=1, padx=5, pady=8)
+        self.program_filter = ctk.CTkEntry(filter_frame, placeholder_text="Program", width=110)
+        self.program_filter.grid(row=0, column=2, padx=5, pady=8)
+        ctk.CTkButton(filter_frame, text="Search", command=self.load_candidates, width=80).grid(row=0, column=3, padx=5)
+        ctk.CTkButton(filter_frame, text="Clear", command=self.clear_filters, width=80).grid(row=0, column=4, padx=5)
+        self.name_filter.bind("<Return>", lambda e: self.load_candidates())
+        self.program_filter.bind("<Return>", lambda e: self.load_candidates())
+
         table_frame = ctk.CTkFrame(self)
-        table_frame.grid(row=1, column=0, sticky="nsew", padx=20, pady=(0,20))
+        table_frame.grid(row=2, column=0, sticky="nsew", padx=20, pady=(0,20))
         table_frame.grid_columnconfigure(0, weight=1)
         table_frame.grid_rowconfigure(0, weight=1)
 
         cols = ("ID","Name","Student ID","Position","Program","Year","Status")
         self.tree = ttk.Treeview(table_frame, columns=cols, show="headings", height=15)
+        self.rows = KeyedTreeview(self.tree)
         for c in cols:
             self.tree.heading(c, text=c)
             self.tree.column(c, width=120)
@@ -672,26 +1526,51 @@ class CandidatesPage(ctk.CTkFrame):
         self.tree.grid(row=0, column=0, sticky="nsew")
         scrollbar.grid(row=0, column=1, sticky="ns")
 
-    def load_positions(self):
+    def load_positions(self, then=None):
+        def update_ui(res):
+            self.positions = res if res else []
+            self.position_filter.configure(values=["All positions"] + [p[1] for p in self.positions])
+            if then:
+                then()
+
         q = "SELECT id, position_name FROM positions WHERE is_active = 1 ORDER BY display_order"
-        res = self.db_manager.execute_query(q)
-        self.positions = res if res else []
+        self.run_async("positions", self.db_manager.execute_query, q, on_success=update_ui)
+
+    def clear_filters(self):
+        self.name_filter.delete(0, "end")
+        self.program_filter.delete(0, "end")
+        self.position_filter.set("All positions")
+        self.load_candidates()
 
     def load_candidates(self):
-        for i in self.tree.get_children():
-            self.tree.delete(i)
-        q = """
+        conditions, params = [], []
+        name = self.name_filter.get().strip()
+        if name:
+            conditions.append("c.candidate_name LIKE %s")
+            params.append("%" + like_prefix(name))
+        for p in self.positions:
+            if p[1] == self.position_filter.get():
+                conditions.append("c.position_id = %s")
+                params.append(p[0])
+                break
+        program = self.program_filter.get().strip()
+        if program:
+            conditions.append("c.program = %s")
+            params.append(program)
+        where = ("WHERE " + " AND ".join(conditions)) if conditions else ""
+        q = f"""
         SELECT c.id, c.candidate_name, c.student_id, p.position_name, c.program, c.year_of_study, c.is_active
         FROM candidates c
         LEFT JOIN positions p ON c.position_id = p.id
+        {where}
         ORDER BY p.display_order, c.candidate_name
         """
-        res = self.db_manager.execute_query(q)
-        if not res:
-            return
-        for r in res:
-            status = "Active" if r[6] else "Inactive"
-            self.tree.insert("", "end", values=(r[0], r[1], r[2], r[3] or "", r[4], r[5], status))
+
+        def update_ui(res):
+            self.rows.sync((r[0], (r[0], r[1], r[2], r[3] or "", r[4], r[5], "Active" if r[6] else "Inactive"))
+                           for r in res or [])
+
+        self.run_async("candidates", self.db_manager.execute_query, q, tuple(params), on_success=update_ui)
 
     def _open_candidate_modal(self, title="New Candidate", data=None):
         modal = ctk.CTkToplevel(self)
@@ -773,13 +1652,26 @@ class CandidatesPage(ctk.CTkFrame):
 
             if data:  # update
                 q = """UPDATE candidates SET position_id=%s, candidate_name=%s, student_id=%s, program=%s, year_of_study=%s, is_active=%s WHERE id=%s"""
-                ok = self.db_manager.execute_update(q, (pos_id, name, student_id, program, year or 0, active, data["id"]))
+                params = (pos_id, name, student_id, program, year or 0, active, data["id"])
             else:  # insert
                 q = """INSERT INTO candidates (position_id, candidate_name, student_id, program, year_of_study, is_active) VALUES (%s,%s,%s,%s,%s,%s)"""
-                ok = self.db_manager.execute_update(q, (pos_id, name, student_id, program, year or 0, active))
-            if ok:
-                modal.destroy()
-                self.load_candidates()
+                params = (pos_id, name, student_id, program, year or 0, active)
+
+            def save():
+                ok = self.db_manager.execute_update(q, params)
+                if ok:
+                    self.db_manager.bump_ballot_version()
+                return ok
+
+            def on_saved(ok: bool):
+                if ok:
+                    modal.destroy()
+                    self.load_candidates()
+                else:
+                    save_btn.configure(state="normal")
+
+            save_btn.configure(state="disabled")
+            self.run_async(None, save, on_success=on_saved)
 
         save_btn = ctk.CTkButton(btn_frame, text="Save", command=on_save)
         cancel_btn = ctk.CTkButton(btn_frame, text="Cancel", command=modal.destroy)
@@ -787,8 +1679,7 @@ class CandidatesPage(ctk.CTkFrame):
         cancel_btn.grid(row=0,column=1,padx=5)
 
     def add_candidate(self):
-        self.load_positions()
-        self._open_candidate_modal("Add Candidate")
+        self.load_positions(then=lambda: self._open_candidate_modal("Add Candidate"))
 
     def edit_candidate(self):
         sel = self.tree.selection()
@@ -805,8 +1696,7 @@ class CandidatesPage(ctk.CTkFrame):
             "year_of_study": vals[5],
             "is_active": 1 if vals[6]=="Active" else 0
         }
-        self.load_positions()
-        self._open_candidate_modal("Edit Candidate", data=data)
+        self.load_positions(then=lambda: self._open_candidate_modal("Edit Candidate", data=data))
 
     def delete_candidate(self):
         sel = self.tree.selection()
@@ -816,19 +1706,26 @@ class CandidatesPage(ctk.CTkFrame):
         vals = self.tree.item(sel[0], "values")
         cid = vals[0]
         if messagebox.askyesno("Confirm", "Delete selected candidate?"):
-            q = "DELETE FROM candidates WHERE id=%s"
-            ok = self.db_manager.execute_update(q, (cid,))
-            if ok:
-                self.load_candidates()
+            def delete():
+                ok = self.db_manager.execute_update("DELETE FROM candidates WHERE id=%s", (cid,))
+                if ok:
+                    self.db_manager.bump_ballot_version()
+                return ok
+
+            self.run_async(None, delete, on_success=lambda ok: ok and self.load_candidates())
 
-class PositionsPage(ctk.CTkFrame):
+class PositionsPage(CachedPage):
     """Positions management page"""
+    VERSION_FIELDS = VERSION_BALLOT
+
     def __init__(self, parent, db_manager: DatabaseManager):
-        super().__init__(parent)
-        self.db_manager = db_manager
+        super().__init__(parent, db_manager)
         self.setup_ui()
         self.load_positions()
 
+    def refresh(self):
+        self.load_positions()
+
     def setup_ui(self):
         self.grid_columnconfigure(0, weight=1)
         header = ctk.CTkFrame(self)
@@ -846,6 +1743,7 @@ class PositionsPage(ctk.CTkFrame):
         table_frame.grid(row=1, column=0, sticky="nsew", padx=20, pady=(0,20))
         cols = ("ID","Position","Description","Order","Active")
         self.tree = ttk.Treeview(table_frame, columns=cols, show="headings", height=15)
+        self.rows = KeyedTreeview(self.tree)
         for c in cols:
             self.tree.heading(c, text=c)
             self.tree.column(c, width=140)
@@ -855,14 +1753,12 @@ class PositionsPage(ctk.CTkFrame):
         scrollbar.grid(row=0,column=1,sticky="ns")
 
     def load_positions(self):
-        for i in self.tree.get_children():
-            self.tree.delete(i)
+        def update_ui(res):
+            self.rows.sync((r[0], (r[0], r[1], r[2] or "", r[3] or 0, "Active" if r[4] else "Inactive"))
+                           for r in res or [])
+
         q = "SELECT id, position_name, position_description, display_order, is_active FROM positions ORDER BY display_order"
-        res = self.db_manager.execute_query(q)
-        if not res:
-            return
-        for r in res:
-            self.tree.insert("", "end", values=(r[0], r[1], r[2] or "", r[3] or 0, "Active" if r[4] else "Inactive"))
+        self.run_async("positions", self.db_manager.execute_query, q, on_success=update_ui)
 
     def _open_modal(self, title="Position", data=None):
         modal = ctk.CTkToplevel(self)
@@ -897,16 +1793,29 @@ class PositionsPage(ctk.CTkFrame):
                 return
             if data:
                 q = "UPDATE positions SET position_name=%s, position_description=%s, display_order=%s, is_active=%s WHERE id=%s"
-                ok = self.db_manager.execute_update(q, (n,d,o,a,data["id"]))
+                params = (n,d,o,a,data["id"])
             else:
                 q = "INSERT INTO positions (position_name, position_description, display_order, is_active) VALUES (%s,%s,%s,%s)"
-                ok = self.db_manager.execute_update(q, (n,d,o,a))
-            if ok:
-                modal.destroy()
-                self.load_positions()
+                params = (n,d,o,a)
+
+            def save():
+                ok = self.db_manager.execute_update(q, params)
+                if ok:
+                    self.db_manager.bump_ballot_version()
+                return ok
+
+            def on_saved(ok: bool):
+                if ok:
+                    modal.destroy()
+                    self.load_positions()
+                else:
+                    save_btn.configure(state="normal")
+
+            save_btn.configure(state="disabled")
+            self.run_async(None, save, on_success=on_saved)
 
         btn_frame = ctk.CTkFrame(modal); btn_frame.pack(pady=8)
-        ctk.CTkButton(btn_frame, text="Save", command=on_save).grid(row=0,column=0,padx=6)
+        save_btn = ctk.CTkButton(btn_frame, text="Save", command=on_save); save_btn.grid(row=0,column=0,padx=6)
         ctk.CTkButton(btn_frame, text="Cancel", command=modal.destroy).grid(row=0,column=1,padx=6)
 
     def add_position(self):
@@ -928,26 +1837,65 @@ class PositionsPage(ctk.CTkFrame):
             return
         if messagebox.askyesno("Confirm", "Delete selected position? This will cascade delete candidates/votes due to FK."):
             vals = self.tree.item(sel[0],"values")
-            q = "DELETE FROM positions WHERE id=%s"
-            ok = self.db_manager.execute_update(q, (vals[0],))
-            if ok:
-                self.load_positions()
 
-class VotesPage(ctk.CTkFrame):
+            def delete():
+                ok = self.db_manager.execute_update("DELETE FROM positions WHERE id=%s", (vals[0],))
+                if ok:
+                    self.db_manager.bump_ballot_version()
+                return ok
+
+            self.run_async(None, delete, on_success=lambda ok: ok and self.load_positions())
+
+class VotesPage(CachedPage):
     """Votes review page (delete only)"""
+    PAGE_SIZE = 200
+    VOTES_SELECT = """
+    SELECT v.id, v.student_id, p.position_name, c.candidate_name, v.vote_timestamp, v.ip_address
+    FROM votes v
+    LEFT JOIN positions p ON v.position_id = p.id
+    LEFT JOIN candidates c ON v.candidate_id = c.id
+    """
+
+    VERSION_FIELDS = VERSION_VOTES
+
     def __init__(self, parent, db_manager: DatabaseManager):
-        super().__init__(parent)
-        self.db_manager = db_manager
+        super().__init__(parent, db_manager)
+        # Newest first; v.id follows insertion order, so it doubles as the keyset key
+        self.pager = KeysetPager(db_manager, self.VOTES_SELECT, "v.id", 0, self.PAGE_SIZE, descending=True)
+        self.positions = []
         self.setup_ui()
+        self.load_positions()
+        self.load_votes()
+
+    def refresh(self):
+        self.load_positions()
         self.load_votes()
 
     def setup_ui(self):
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_rowconfigure(2, weight=1)
         header = ctk.CTkFrame(self); header.grid(row=0,column=0,sticky="ew", padx=20, pady=10)
         ctk.CTkLabel(header, text="Votes", font=ctk.CTkFont(size=20, weight="bold")).grid(row=0,column=0,sticky="w")
         ctk.CTkButton(header, text="Refresh", command=self.load_votes).grid(row=0,column=1,sticky="e")
         ctk.CTkButton(header, text="Delete Vote", command=self.delete_vote).grid(row=0,column=2,sticky="e", padx=6)
-
-        table_frame = ctk.CTkFrame(self); table_frame.grid(row=1,column=0,sticky="nsew", padx=20, pady=(0,20))
+        ctk.CTkButton(header, text="Export Votes", command=lambda: self.export("votes")).grid(row=0,column=3,sticky="e", padx=6)
+        ctk.CTkButton(header, text="Export Results", command=lambda: self.export("results")).grid(row=0,column=4,sticky="e", padx=6)
+        self.export_status = ctk.CTkLabel(header, text=""); self.export_status.grid(row=0,column=5,sticky="w", padx=6)
+
+        filters = ctk.CTkFrame(self); filters.grid(row=1,column=0,sticky="ew", padx=20, pady=(0,10))
+        self.student_filter = ctk.CTkEntry(filters, placeholder_text="Student ID starts with", width=170); self.student_filter.grid(row=0,column=0,padx=5,pady=8)
+        self.position_filter = ttk.Combobox(filters, values=["All positions"], state="readonly", width=20); self.position_filter.grid(row=0,column=1,padx=5,pady=8)
+        self.position_filter.set("All positions")
+        self.from_filter = ctk.CTkEntry(filters, placeholder_text="From YYYY-MM-DD HH:MM", width=170); self.from_filter.grid(row=0,column=2,padx=5,pady=8)
+        self.to_filter = ctk.CTkEntry(filters, placeholder_text="To YYYY-MM-DD HH:MM", width=170); self.to_filter.grid(row=0,column=3,padx=5,pady=8)
+        ctk.CTkButton(filters, text="Search", command=self.load_votes, width=80).grid(row=0,column=4,padx=5)
+        ctk.CTkButton(filters, text="Clear", command=self.clear_filters, width=80).grid(row=0,column=5,padx=5)
+        for entry in (self.student_filter, self.from_filter, self.to_filter):
+            entry.bind("<Return>", lambda e: self.load_votes())
+
+        table_frame = ctk.CTkFrame(self); table_frame.grid(row=2,column=0,sticky="nsew", padx=20, pady=(0,20))
+        table_frame.grid_columnconfigure(0, weight=1)
+        table_frame.grid_rowconfigure(0, weight=1)
         cols = ("ID","Student ID","Position","Candidate","Timestamp","IP")
         self.tree = ttk.Treeview(table_frame, columns=cols, show="headings", height=18)
         for c in cols:
@@ -955,24 +1903,85 @@ class VotesPage(ctk.CTkFrame):
             self.tree.column(c,width=140)
         self.tree.grid(row=0,column=0,sticky="nsew")
         scrollbar = ttk.Scrollbar(table_frame, orient="vertical", command=self.tree.yview)
-        self.tree.configure(yscrollcommand=scrollbar.set)
+        self.table = PagedTreeController(self, self.tree, scrollbar, self.pager, tuple)
         scrollbar.grid(row=0,column=1,sticky="ns")
 
+    def load_positions(self):
+        def update_ui(res):
+            self.positions = res if res else []
+            self.position_filter.configure(values=["All positions"] + [p[1] for p in self.positions])
+
+        q = "SELECT id, position_name FROM positions ORDER BY display_order"
+        self.run_async("positions", self.db_manager.execute_query, q, on_success=update_ui)
+
+    def _apply_filters(self) -> bool:
+        conditions, params = [], []
+        student_id = self.student_filter.get().strip()
+        if student_id:
+            conditions.append("v.student_id LIKE %s")
+            params.append(like_prefix(student_id))
+        pos = self.position_filter.get()
+        for p in self.positions:
+            if p[1] == pos:
+                conditions.append("v.position_id = %s")
+                params.append(p[0])
+                break
+        for entry, op in ((self.from_filter, ">="), (self.to_filter, "<=")):
+            text = entry.get().strip()
+            if not text:
+                continue
+            when = parse_datetime_filter(text)
+            if when is None:
+                messagebox.showerror("Error", f"Invalid date '{text}'. Use YYYY-MM-DD or YYYY-MM-DD HH:MM")
+                return False
+            if op == "<=" and ":" not in text:
+                # A bare "To" date covers the whole of that day
+                op, when = "<", when + timedelta(days=1)
+            conditions.append(f"v.vote_timestamp {op} %s")
+            params.append(when)
+        self.pager.set_filters(conditions, tuple(params))
+        return True
+
+    def clear_filters(self):
+        for entry in (self.student_filter, self.from_filter, self.to_filter):
+            entry.delete(0, "end")
+        self.position_filter.set("All positions")
+        self.load_votes()
+
     def load_votes(self):
-        for i in self.tree.get_children():
-            self.tree.delete(i)
-        q = """
-        SELECT v.id, v.student_id, p.position_name, c.candidate_name, v.vote_timestamp, v.ip_address
-        FROM votes v
-        LEFT JOIN positions p ON v.position_id = p.id
-        LEFT JOIN candidates c ON v.candidate_id = c.id
-        ORDER BY v.vote_timestamp DESC
-        """
-        res = self.db_manager.execute_query(q)
-        if not res:
+        if self._apply_filters():
+            self.table.reload()
+
+    def export(self, kind: str):
+        """Stream the vote log or results to a CSV/JSONL/Parquet file without blocking the UI"""
+        from tkinter import filedialog
+        from mysql.connector import Error
+        from vote_export import export as export_rows
+
+        path = filedialog.asksaveasfilename(
+            title="Export Votes" if kind == "votes" else "Export Results",
+            defaultextension=".csv",
+            filetypes=[("CSV", "*.csv"), ("JSON Lines", "*.jsonl"), ("Parquet", "*.parquet")])
+        if not path:
             return
-        for r in res:
-            self.tree.insert("", "end", values=r)
+
+        def on_progress(written: int):
+            self.after(0, lambda: self.export_status.configure(text=f"Exported {written} rows..."))
+
+        def run_export():
+            try:
+                # Streaming the whole vote log is exactly the load replicas are for
+                written = self.db_manager.router.read(
+                    lambda connection: export_rows(connection, kind, path, on_progress=on_progress))
+            except (Error, ValueError, OSError) as e:
+                self.after(0, lambda err=e: messagebox.showerror("Export Failed", str(err)))
+                self.after(0, lambda: self.export_status.configure(text=""))
+                return
+            self.after(0, lambda: self.export_status.configure(text=f"Exported {written} rows"))
+            self.after(0, lambda: messagebox.showinfo("Export Complete", f"Wrote {written} row(s) to {path}"))
+
+        self.export_status.configure(text="Exporting...")
+        threading.Thread(target=run_export, daemon=True).start()
 
     def delete_vote(self):
         sel = self.tree.selection()
@@ -981,19 +1990,95 @@ class VotesPage(ctk.CTkFrame):
             return
         vals = self.tree.item(sel[0],"values")
         if messagebox.askyesno("Confirm", "Delete selected vote?"):
-            q = "DELETE FROM votes WHERE id=%s"
-            ok = self.db_manager.execute_update(q, (vals[0],))
-            if ok:
-                self.load_votes()
+            from tallies import TALLY_DECREMENT_VOTE_QUERY
+            
+            statements = [
+                (TALLY_DECREMENT_VOTE_QUERY, (vals[0],)),
+                ("DELETE FROM votes WHERE id=%s", (vals[0],)),
+            ]
+            self.run_async(None, self.db_manager.execute_transaction, statements,
+                           on_success=lambda ok: ok and self.load_votes())
+
+class ResultsPage(LivePage):
+    """Per-candidate results with vote shares, winners and ties"""
+    VERSION_FIELDS = VERSION_VOTES + VERSION_BALLOT + VERSION_SETTINGS
+
+    def __init__(self, parent, db_manager: DatabaseManager):
+        super().__init__(parent, db_manager)
+        self.setup_ui()
+        self.load_results()
+        self._schedule_check()
+
+    def refresh(self):
+        self.load_results()
+
+    def setup_ui(self):
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_rowconfigure(1, weight=1)
+        header = ctk.CTkFrame(self); header.grid(row=0,column=0,sticky="ew", padx=20, pady=10)
+        header.grid_columnconfigure(1, weight=1)
+        ctk.CTkLabel(header, text="Results", font=ctk.CTkFont(size=20, weight="bold")).grid(row=0,column=0,sticky="w", padx=10)
+        self.visibility_label = ctk.CTkLabel(header, text="")
+        self.visibility_label.grid(row=0,column=1,sticky="w", padx=10)
+        ctk.CTkButton(header, text="Refresh", command=self.load_results).grid(row=0,column=2,sticky="e", padx=6)
+
+        table_frame = ctk.CTkFrame(self); table_frame.grid(row=1,column=0,sticky="nsew", padx=20, pady=(0,10))
+        table_frame.grid_columnconfigure(0, weight=1)
+        table_frame.grid_rowconfigure(0, weight=1)
+        cols = ("Position","Candidate","Votes","Share","Status")
+        self.tree = ttk.Treeview(table_frame, columns=cols, show="headings", height=18)
+        self.rows = KeyedTreeview(self.tree)
+        for c in cols:
+            self.tree.heading(c,text=c)
+            self.tree.column(c,width=160)
+        self.tree.grid(row=0,column=0,sticky="nsew")
+        scrollbar = ttk.Scrollbar(table_frame, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        scrollbar.grid(row=0,column=1,sticky="ns")
+
+        self.create_live_controls(self).grid(row=2,column=0,sticky="e", padx=20, pady=(0,10))
+
+    @staticmethod
+    def _result_rows(results: ElectionResults):
+        for position in results.positions:
+            if not position.candidates:
+                yield (position.position_id, None), (position.position_name, "No candidates", "", "", "")
+                continue
+            leaders = {c.candidate_id for c in position.leaders}
+            for candidate in position.candidates:
+                if candidate.candidate_id not in leaders:
+                    status = ""
+                elif position.tied:
+                    status = "Tied"
+                else:
+                    status = f"Winner (+{position.margin})"
+                yield ((position.position_id, candidate.candidate_id),
+                       (position.position_name, candidate.candidate_name, candidate.votes,
+                        f"{candidate.share:.1f}%", status))
+
+    def load_results(self):
+        def update_ui(results: Optional[ElectionResults]):
+            if results is None:
+                return
+            self.rows.sync(self._result_rows(results))
+            self.visibility_label.configure(
+                text="Visible to students" if results.visible else "Hidden from students (results_visible is off)")
+            self.mark_updated()
+
+        self.run_async("results", self.db_manager.get_results, on_success=update_ui)
 
-class SettingsPage(ctk.CTkFrame):
+class SettingsPage(CachedPage):
     """Election settings (edit values)"""
+    VERSION_FIELDS = VERSION_SETTINGS
+
     def __init__(self, parent, db_manager: DatabaseManager):
-        super().__init__(parent)
-        self.db_manager = db_manager
+        super().__init__(parent, db_manager)
         self.setup_ui()
         self.load_settings()
 
+    def refresh(self):
+        self.load_settings()
+
     def setup_ui(self):
         header = ctk.CTkFrame(self); header.grid(row=0,column=0,sticky="ew", padx=20, pady=10)
         ctk.CTkLabel(header, text="Election Settings", font=ctk.CTkFont(size=20, weight="bold")).grid(row=0,column=0,sticky="w")
@@ -1005,6 +2090,7 @@ class SettingsPage(ctk.CTkFrame):
         table_frame = ctk.CTkFrame(self); table_frame.grid(row=1,column=0,sticky="nsew", padx=20, pady=(0,20))
         cols = ("ID","Name","Value","Description")
         self.tree = ttk.Treeview(table_frame, columns=cols, show="headings", height=16)
+        self.rows = KeyedTreeview(self.tree)
         for c in cols:
             self.tree.heading(c,text=c)
             self.tree.column(c,width=200)
@@ -1014,14 +2100,11 @@ class SettingsPage(ctk.CTkFrame):
         scrollbar.grid(row=0,column=1,sticky="ns")
 
     def load_settings(self):
-        for i in self.tree.get_children():
-            self.tree.delete(i)
+        def update_ui(res):
+            self.rows.sync((r[0], (r[0], r[1], r[2], r[3] or "")) for r in res or [])
+
         q = "SELECT id, setting_name, setting_value, description FROM election_settings ORDER BY id"
-        res = self.db_manager.execute_query(q)
-        if not res:
-            return
-        for r in res:
-            self.tree.insert("", "end", values=(r[0], r[1], r[2], r[3] or ""))
+        self.run_async("settings", self.db_manager.execute_query, q, on_success=update_ui)
 
     def _open_modal(self, title="Setting", data=None):
         modal = ctk.CTkToplevel(self); modal.title(title); modal.geometry("520x260")
@@ -1046,15 +2129,25 @@ class SettingsPage(ctk.CTkFrame):
                 return
             if data:
                 q = "UPDATE election_settings SET setting_value=%s, description=%s WHERE id=%s"
-                ok = self.db_manager.execute_update(q, (v,d,data["id"]))
+                params = (v,d,data["id"])
             else:
                 q = "INSERT INTO election_settings (setting_name, setting_value, description) VALUES (%s,%s,%s)"
-                ok = self.db_manager.execute_update(q, (n,v,d))
-            if ok:
-                modal.destroy()
-                self.load_settings()
+                params = (n,v,d)
+
+            def on_saved(ok: bool):
+                if ok:
+                    from election_settings import settings_cache
+                    
+                    settings_cache.invalidate()
+                    modal.destroy()
+                    self.load_settings()
+                else:
+                    save_btn.configure(state="normal")
+
+            save_btn.configure(state="disabled")
+            self.run_async(None, self.db_manager.execute_update, q, params, on_success=on_saved)
         btn = ctk.CTkFrame(modal); btn.pack(pady=8)
-        ctk.CTkButton(btn, text="Save", command=on_save).grid(row=0,column=0,padx=6)
+        save_btn = ctk.CTkButton(btn, text="Save", command=on_save); save_btn.grid(row=0,column=0,padx=6)
         ctk.CTkButton(btn, text="Cancel", command=modal.destroy).grid(row=0,column=1,padx=6)
 
     def add_setting(self):
@@ -1076,19 +2169,28 @@ class SettingsPage(ctk.CTkFrame):
             return
         vals = self.tree.item(sel[0],"values")
         if messagebox.askyesno("Confirm", "Delete selected setting?"):
+            def on_deleted(ok: bool):
+                if ok:
+                    from election_settings import settings_cache
+                    
+                    settings_cache.invalidate()
+                    self.load_settings()
+
             q = "DELETE FROM election_settings WHERE id=%s"
-            ok = self.db_manager.execute_update(q,(vals[0],))
-            if ok:
-                self.load_settings()
+            self.run_async(None, self.db_manager.execute_update, q, (vals[0],), on_success=on_deleted)
+
+class AdminUsersPage(CachedPage):
+    """Admin users CRUD (passwords stored as salted PBKDF2 hashes)"""
+    VERSION_FIELDS = ()
 
-class AdminUsersPage(ctk.CTkFrame):
-    """Admin users CRUD (password stored as sha256 for demo)"""
     def __init__(self, parent, db_manager: DatabaseManager):
-        super().__init__(parent)
-        self.db_manager = db_manager
+        super().__init__(parent, db_manager)
         self.setup_ui()
         self.load_users()
 
+    def refresh(self):
+        self.load_users()
+
     def setup_ui(self):
         header = ctk.CTkFrame(self); header.grid(row=0,column=0,sticky="ew",padx=20,pady=10)
         ctk.CTkLabel(header,text="Admin Users", font=ctk.CTkFont(size=20,weight="bold")).grid(row=0,column=0,sticky="w")
@@ -1100,6 +2202,7 @@ class AdminUsersPage(ctk.CTkFrame):
         table_frame = ctk.CTkFrame(self); table_frame.grid(row=1,column=0,sticky="nsew",padx=20,pady=(0,20))
         cols = ("ID","Username","Email","Full Name","Role","Active")
         self.tree = ttk.Treeview(table_frame, columns=cols, show="headings", height=16)
+        self.rows = KeyedTreeview(self.tree)
         for c in cols:
             self.tree.heading(c,text=c)
             self.tree.column(c,width=160)
@@ -1109,14 +2212,12 @@ class AdminUsersPage(ctk.CTkFrame):
         scrollbar.grid(row=0,column=1,sticky="ns")
 
     def load_users(self):
-        for i in self.tree.get_children():
-            self.tree.delete(i)
+        def update_ui(res):
+            self.rows.sync((r[0], (r[0], r[1], r[2], r[3] or "", r[4] or "admin", "Active" if r[5] else "Inactive"))
+                           for r in res or [])
+
         q = "SELECT id, username, email, full_name, role, is_active FROM admin_users ORDER BY id"
-        res = self.db_manager.execute_query(q)
-        if not res:
-            return
-        for r in res:
-            self.tree.insert("", "end", values=(r[0], r[1], r[2], r[3] or "", r[4] or "admin", "Active" if r[5] else "Inactive"))
+        self.run_async("users", self.db_manager.execute_query, q, on_success=update_ui)
 
     def _open_modal(self, title="Admin User", data=None):
         modal = ctk.CTkToplevel(self); modal.title(title); modal.geometry("520x360")
@@ -1149,28 +2250,39 @@ class AdminUsersPage(ctk.CTkFrame):
             if not (u and e):
                 messagebox.showerror("Error", "Username and Email are required")
                 return
-            if data:
-                # if password provided, update it; otherwise leave existing hash
-                if p:
-                    ph = hashlib.sha256(p.encode("utf-8")).hexdigest()
-                    q = "UPDATE admin_users SET username=%s, email=%s, password_hash=%s, full_name=%s, role=%s, is_active=%s WHERE id=%s"
-                    ok = self.db_manager.execute_update(q,(u,e,ph,f,r,a,data["id"]))
+            if not data and not p:
+                messagebox.showerror("Error", "Password required for new user")
+                return
+
+            # Runs on the query executor: hashing takes tens of milliseconds
+            def save():
+                from passwords import hash_password
+                
+                if data:
+                    # if password provided, update it; otherwise leave existing hash
+                    if p:
+                        q = "UPDATE admin_users SET username=%s, email=%s, password_hash=%s, full_name=%s, role=%s, is_active=%s WHERE id=%s"
+                        params = (u,e,hash_password(p),f,r,a,data["id"])
+                    else:
+                        q = "UPDATE admin_users SET username=%s, email=%s, full_name=%s, role=%s, is_active=%s WHERE id=%s"
+                        params = (u,e,f,r,a,data["id"])
                 else:
-                    q = "UPDATE admin_users SET username=%s, email=%s, full_name=%s, role=%s, is_active=%s WHERE id=%s"
-                    ok = self.db_manager.execute_update(q,(u,e,f,r,a,data["id"]))
-            else:
-                if not p:
-                    messagebox.showerror("Error", "Password required for new user")
-                    return
-                ph = hashlib.sha256(p.encode("utf-8")).hexdigest()
-                q = "INSERT INTO admin_users (username, email, password_hash, full_name, role, is_active) VALUES (%s,%s,%s,%s,%s,%s)"
-                ok = self.db_manager.execute_update(q,(u,e,ph,f,r,a))
-            if ok:
-                modal.destroy()
-                self.load_users()
+                    q = "INSERT INTO admin_users (username, email, password_hash, full_name, role, is_active) VALUES (%s,%s,%s,%s,%s,%s)"
+                    params = (u,e,hash_password(p),f,r,a)
+                return self.db_manager.execute_update(q, params)
+
+            def on_saved(ok: bool):
+                if ok:
+                    modal.destroy()
+                    self.load_users()
+                else:
+                    save_btn.configure(state="normal")
+
+            save_btn.configure(state="disabled")
+            self.run_async(None, save, on_success=on_saved)
 
         btn = ctk.CTkFrame(modal); btn.pack(pady=8)
-        ctk.CTkButton(btn, text="Save", command=on_save).grid(row=0,column=0,padx=6)
+        save_btn = ctk.CTkButton(btn, text="Save", command=on_save); save_btn.grid(row=0,column=0,padx=6)
         ctk.CTkButton(btn, text="Cancel", command=modal.destroy).grid(row=0,column=1,padx=6)
 
     def add_user(self):
@@ -1193,13 +2305,196 @@ class AdminUsersPage(ctk.CTkFrame):
         vals = self.tree.item(sel[0],"values")
         if messagebox.askyesno("Confirm", "Delete selected admin user?"):
             q = "DELETE FROM admin_users WHERE id=%s"
-            ok = self.db_manager.execute_update(q,(vals[0],))
-            if ok:
-                self.load_users()
+            self.run_async(None, self.db_manager.execute_update, q, (vals[0],),
+                           on_success=lambda ok: ok and self.load_users())
+
+class PerformancePage(CachedPage):
+    """Query profiler: top statements by total time, slow-query log and request timings.
+    
+    Everything shown here is already in memory, so the page reads it on the
+    Tk thread every REFRESH_MS while it is visible and never queries the
+    database itself.
+    """
+    VERSION_FIELDS = ()
+    REFRESH_MS = 2000
+
+    def __init__(self, parent, db_manager: DatabaseManager):
+        super().__init__(parent, db_manager)
+        self.profiler = db_manager.profiler
+        self._refresh_job = None
+        self._slow_entries = {}
+        self.setup_ui()
+        self.load_stats()
+
+    def refresh(self):
+        self.load_stats()
+
+    def setup_ui(self):
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_rowconfigure((1, 2), weight=1)
+        header = ctk.CTkFrame(self); header.grid(row=0,column=0,sticky="ew", padx=20, pady=10)
+        header.grid_columnconfigure(1, weight=1)
+        ctk.CTkLabel(header, text="Performance", font=ctk.CTkFont(size=20, weight="bold")).grid(row=0,column=0,sticky="w", padx=10)
+        self.pool_label = ctk.CTkLabel(header, text="")
+        self.pool_label.grid(row=0,column=1,sticky="w", padx=10)
+        self.enabled_var = ctk.BooleanVar(value=self.profiler.enabled)
+        ctk.CTkSwitch(header, text="Profile queries", variable=self.enabled_var,
+                      command=self._apply_settings).grid(row=0,column=2,padx=6)
+        ctk.CTkLabel(header, text="Slow (ms)").grid(row=0,column=3,padx=(6,2))
+        self.threshold_entry = ctk.CTkEntry(header, width=60)
+        self.threshold_entry.insert(0, f"{self.profiler.slow_threshold * 1000:.0f}")
+        self.threshold_entry.grid(row=0,column=4,padx=(0,6))
+        self.threshold_entry.bind("<Return>", lambda e: self._apply_settings())
+        self.explain_var = ctk.BooleanVar(value=self.profiler.explain)
+        ctk.CTkCheckBox(header, text="EXPLAIN slow", variable=self.explain_var,
+                        command=self._apply_settings).grid(row=0,column=5,padx=6)
+        ctk.CTkButton(header, text="Reset", width=70, command=self.reset_stats).grid(row=0,column=6,padx=6)
+        self.replica_label = ctk.CTkLabel(header, text="")
+        self.replica_label.grid(row=1,column=0,columnspan=7,sticky="w", padx=10)
+
+        top_frame = ctk.CTkFrame(self); top_frame.grid(row=1,column=0,sticky="nsew", padx=20, pady=(0,10))
+        top_frame.grid_columnconfigure(0, weight=1)
+        top_frame.grid_rowconfigure(0, weight=1)
+        cols = ("Statement","Calls","Total ms","Avg ms","p95 ms","Max ms","Rows","Wait ms","Errors")
+        self.statements_tree = ttk.Treeview(top_frame, columns=cols, show="headings", height=10)
+        self.statement_rows = KeyedTreeview(self.statements_tree)
+        for c in cols:
+            self.statements_tree.heading(c,text=c)
+            self.statements_tree.column(c,width=80, anchor="e")
+        self.statements_tree.column("Statement", width=420, anchor="w")
+        self.statements_tree.grid(row=0,column=0,sticky="nsew")
+        scrollbar = ttk.Scrollbar(top_frame, orient="vertical", command=self.statements_tree.yview)
+        self.statements_tree.configure(yscrollcommand=scrollbar.set)
+        scrollbar.grid(row=0,column=1,sticky="ns")
+
+        bottom = ctk.CTkFrame(self); bottom.grid(row=2,column=0,sticky="nsew", padx=20, pady=(0,20))
+        bottom.grid_columnconfigure((0, 1), weight=1)
+        bottom.grid_rowconfigure(1, weight=1)
+        ctk.CTkLabel(bottom, text="Slow queries", font=ctk.CTkFont(size=14, weight="bold")).grid(row=0,column=0,sticky="w", padx=10)
+        ctk.CTkLabel(bottom, text="Requests by page", font=ctk.CTkFont(size=14, weight="bold")).grid(row=0,column=1,sticky="w", padx=10)
+        cols = ("Time","ms","Wait ms","Rows","Statement")
+        self.slow_tree = ttk.Treeview(bottom, columns=cols, show="headings", height=6)
+        self.slow_rows = KeyedTreeview(self.slow_tree)
+        for c in cols:
+            self.slow_tree.heading(c,text=c)
+            self.slow_tree.column(c,width=70)
+        self.slow_tree.column("Statement", width=300)
+        self.slow_tree.grid(row=1,column=0,sticky="nsew", padx=(10,5))
+        self.slow_tree.bind("<<TreeviewSelect>>", lambda e: self.show_plan())
+        cols = ("Request","Count","Avg ms","Max ms","Superseded")
+        self.requests_tree = ttk.Treeview(bottom, columns=cols, show="headings", height=6)
+        self.request_rows = KeyedTreeview(self.requests_tree)
+        for c in cols:
+            self.requests_tree.heading(c,text=c)
+            self.requests_tree.column(c,width=80)
+        self.requests_tree.column("Request", width=220)
+        self.requests_tree.grid(row=1,column=1,sticky="nsew", padx=(5,10))
+        self.plan_box = ctk.CTkTextbox(bottom, height=90, font=ctk.CTkFont(family="Courier", size=11))
+        self.plan_box.grid(row=2,column=0,columnspan=2,sticky="ew", padx=10, pady=(6,10))
+
+    def _apply_settings(self):
+        try:
+            self.profiler.slow_threshold = max(0.0, float(self.threshold_entry.get()) / 1000)
+        except ValueError:
+            messagebox.showerror("Error", "Slow threshold must be a number of milliseconds")
+            return
+        self.profiler.explain = self.explain_var.get()
+        self.profiler.enabled = self.enabled_var.get()
+        self.load_stats()
+
+    def reset_stats(self):
+        self.profiler.reset()
+        self.plan_box.delete("1.0", "end")
+        self.load_stats()
+
+    def load_stats(self):
+        if self._refresh_job is not None:
+            self.after_cancel(self._refresh_job)
+            self._refresh_job = None
+
+        self.statement_rows.sync(
+            (s["sql"], (s["sql"], s["count"], f"{s['total_ms']:.1f}", f"{s['avg_ms']:.2f}", f"{s['p95_ms']:.1f}",
+                        f"{s['max_ms']:.1f}", s["rows"], f"{s['avg_acquire_ms']:.2f}", s["errors"]))
+            for s in self.db_manager.query_stats(limit=50))
+
+        self._slow_entries = {}
+        slow_rows = []
+        for entry in self.profiler.slow_queries():
+            key = id(entry)
+            self._slow_entries[str(key)] = entry
+            slow_rows.append((key, (f"{entry.at:%H:%M:%S}", f"{entry.seconds * 1000:.1f}",
+                                    f"{entry.acquire_seconds * 1000:.1f}", entry.rows, entry.sql)))
+        self.slow_rows.sync(slow_rows)
+
+        self.request_rows.sync(
+            (name, (name, t["count"], f"{t['avg_ms']:.1f}", f"{t['max_ms']:.1f}", t["superseded"]))
+            for name, t in sorted(self.db_manager.request_timings().items(),
+                                  key=lambda item: item[1]["count"] * item[1]["avg_ms"], reverse=True))
+
+        pool = self.db_manager.pool_stats()
+        if pool:
+            cache = self.db_manager.statement_cache_stats()
+            self.pool_label.configure(text=f"Pool {pool['open']}/{pool['max']} open, {pool['idle']} idle, "
+                                           f"avg wait {pool['avg_wait_ms']:.1f} ms, {pool['timeouts']} timeouts; "
+                                           f"prepared statements {cache['hit_ratio']:.0%} hits ({cache['misses']} prepared)")
+        replicas = self.db_manager.replica_stats()
+        if replicas.get("replicas"):
+            parts = []
+            for r in replicas["replicas"]:
+                state = f"lag {r['lag']:.0f}s" if r["healthy"] else f"down ({r['last_error']})"
+                if r["healthy"] and not r["usable"]:
+                    state += ", not serving reads"
+                parts.append(f"{r['name']} {state}, {r['reads']} reads")
+            self.replica_label.configure(text="Replicas: " + "; ".join(parts) +
+                                              f". Primary served {replicas['primary_reads']} reads "
+                                              f"({replicas['fallbacks']} fallbacks)")
+        self._refresh_job = self.after(self.REFRESH_MS, self._tick)
+
+    def _tick(self):
+        # Stops while hidden in the page cache; on_show starts it again
+        self._refresh_job = None
+        if self.winfo_ismapped():
+            self.load_stats()
+
+    def show_plan(self):
+        sel = self.slow_tree.selection()
+        entry = self._slow_entries.get(sel[0]) if sel else None
+        self.plan_box.delete("1.0", "end")
+        if entry is None:
+            return
+        if not entry.plan:
+            self.plan_box.insert("end", entry.sql + "\n\n(no plan captured; enable EXPLAIN slow)")
+            return
+        self.plan_box.insert("end", entry.sql + "\n\n")
+        for row in entry.plan:
+            self.plan_box.insert("end", " | ".join("" if v is None else str(v) for v in row) + "\n")
+
+    def on_show(self):
+        super().on_show()
+        self.load_stats()
+
+    def destroy(self):
+        if self._refresh_job is not None:
+            self.after_cancel(self._refresh_job)
+            self._refresh_job = None
+        super().destroy()
 
 class MainApplication(ctk.CTk):
     """Main application window"""
     
+    PAGE_CLASSES = {
+        "dashboard": DashboardPage,
+        "students": StudentsPage,
+        "candidates": CandidatesPage,
+        "positions": PositionsPage,
+        "votes": VotesPage,
+        "results": ResultsPage,
+        "settings": SettingsPage,
+        "admin_users": AdminUsersPage,
+        "performance": PerformancePage,
+    }
+    MAX_CACHED_PAGES = 4
+    
     def __init__(self):
         super().__init__()
         
@@ -1207,11 +2502,10 @@ class MainApplication(ctk.CTk):
         self.geometry("1200x800")
         self.minsize(1000, 600)
         
-        # Initialize database
+        # Initialize database; the pool is opened in the background once the window is up
         self.db_manager = DatabaseManager()
-        if not self.db_manager.connect():
-            self.destroy()
-            return
+        self.db_manager.ui_root = self
+        self.db_ready = False
         
         # Initialize services
         self.auth_service = AuthService(self.db_manager)
@@ -1223,6 +2517,29 @@ class MainApplication(ctk.CTk):
         
         # Show login page
         self.show_login()
+        self.after(0, self.on_first_paint)
+        self.connect_database()
+    
+    def on_first_paint(self):
+        self.update_idletasks()
+        startup_timer.mark("first paint")
+    
+    def connect_database(self):
+        """Open the connection pool on a worker thread, offering a retry if it fails"""
+        def on_ready():
+            self.db_ready = True
+            startup_timer.mark("db ready")
+            self.login_page.set_connecting(False)
+        
+        def on_failed(e: Exception):
+            self.login_page.set_connecting(True, "Database unavailable")
+            if messagebox.askretrycancel("Database Error", f"Failed to connect to database: {e}"):
+                self.login_page.set_connecting(True)
+                self.connect_database()
+            else:
+                self.on_closing()
+        
+        self.db_manager.connect_async(self, on_ready, on_failed)
     
     def show_login(self):
         """Display login page"""
@@ -1233,6 +2550,7 @@ class MainApplication(ctk.CTk):
         # Create login page
         self.login_page = LoginPage(self, self.auth_service, self.on_login_success)
         self.login_page.grid(row=0, column=0, sticky="nsew")
+        self.login_page.set_connecting(not self.db_ready)
     
     def on_login_success(self, user: User):
         """Handle successful login"""
@@ -1256,6 +2574,10 @@ class MainApplication(ctk.CTk):
         self.content_frame.grid_columnconfigure(0, weight=1)
         self.content_frame.grid_rowconfigure(0, weight=1)
         
+        # Pages are cached per login session
+        self.pages = OrderedDict()
+        self.current_page_id = None
+        
         # Create sidebar (it will NOT auto-select a page now)
         self.sidebar = Sidebar(self, self.on_page_select)
         self.sidebar.grid(row=0, column=0, sticky="nsew")
@@ -1271,30 +2593,33 @@ class MainApplication(ctk.CTk):
             self.show_page(page_id)
     
     def show_page(self, page_id: str):
-        """Display selected page"""
-        # Clear current page
-        for widget in self.content_frame.winfo_children():
-            widget.destroy()
+        """Display selected page, reusing a live instance when one is cached"""
+        page_class = self.PAGE_CLASSES.get(page_id)
+        if page_class is None:
+            for widget in self.content_frame.winfo_children():
+                widget.grid_remove()
+            not_found = ctk.CTkLabel(self.content_frame, text="Page Not Found",
+                                     font=ctk.CTkFont(size=24))
+            not_found.grid(row=0, column=0, sticky="nsew")
+            return
 
-        # Create appropriate page
-        if page_id == "dashboard":
-            page = DashboardPage(self.content_frame, self.db_manager)
-        elif page_id == "students":
-            page = StudentsPage(self.content_frame, self.db_manager)
-        elif page_id == "candidates":
-            page = CandidatesPage(self.content_frame, self.db_manager)
-        elif page_id == "positions":
-            page = PositionsPage(self.content_frame, self.db_manager)
-        elif page_id == "votes":
-            page = VotesPage(self.content_frame, self.db_manager)
-        elif page_id == "settings":
-            page = SettingsPage(self.content_frame, self.db_manager)
-        elif page_id == "admin_users":
-            page = AdminUsersPage(self.content_frame, self.db_manager)
+        # Hide the current page without destroying it
+        if self.current_page_id in self.pages:
+            self.pages[self.current_page_id].grid_remove()
+
+        page = self.pages.get(page_id)
+        if page is None:
+            page = page_class(self.content_frame, self.db_manager)
+            self.pages[page_id] = page
+            # Bound memory: drop the least recently shown page
+            while len(self.pages) > self.MAX_CACHED_PAGES:
+                _, evicted = self.pages.popitem(last=False)
+                evicted.destroy()
         else:
-            page = ctk.CTkLabel(self.content_frame, text="Page Not Found",
-                               font=ctk.CTkFont(size=24))
+            self.pages.move_to_end(page_id)
+            page.on_show()
 
+        self.current_page_id = page_id
         page.grid(row=0, column=0, sticky="nsew")
     
     def logout(self):
@@ -44,7 +44,7 @@ CREATE TABLE `admin_users` (
 --
 
 INSERT INTO `admin_users` (`id`, `username`, `email`, `password_hash`, `full_name`, `role`, `is_active`, `created_at`, `last_login`) VALUES
-(1, 'admin', 'admin@mca.ac.mw', '$2y$10$92IXUNpkjO0rOQ5byMi.Ye4oKoEa3Ro9llC/.og/at2.uheWG/igi', 'System Administrator', 'super_admin', 1, '2025-08-20 10:39:42', NULL);
+(1, 'admin', 'admin@mca.ac.mw', '$pbkdf2-sha256$200000$/WeonLi/2HRHgrQU6fpi0A$UjuSAj4Bv+zQvpBT4avenELNDATRnInyFHtyGUcMhxw', 'System Administrator', 'super_admin', 1, '2025-08-20 10:39:42', NULL);
 
 -- --------------------------------------------------------
 
@@ -118,7 +118,8 @@ INSERT INTO `election_settings` (`id`, `setting_name`, `setting_value`, `descrip
 (4, 'voting_start_date', '2024-03-01 08:00:00', 'When voting period begins', '2025-08-20 10:39:09'),
 (5, 'voting_end_date', '2024-03-03 18:00:00', 'When voting period ends', '2025-08-20 10:39:09'),
 (6, 'results_visible', 'true', 'Whether results are visible to students', '2025-08-20 10:39:09'),
-(7, 'max_votes_per_position', '1', 'Maximum votes allowed per position', '2025-08-20 10:39:09');
+(7, 'max_votes_per_position', '1', 'Maximum votes allowed per position', '2025-08-20 10:39:09'),
+(8, 'ballot_version', '1', 'Bumped whenever positions or candidates change; invalidates cached ballots', '2025-08-20 10:39:09');
 
 -- --------------------------------------------------------
 
@@ -229,6 +230,18 @@ CREATE TABLE `votes` (
   `ip_address` varchar(45) DEFAULT NULL
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci;
 
+-- --------------------------------------------------------
+
+--
+-- Table structure for table `vote_tallies`
+--
+
+CREATE TABLE `vote_tallies` (
+  `position_id` int(11) NOT NULL,
+  `candidate_id` int(11) NOT NULL,
+  `vote_count` int(11) NOT NULL DEFAULT 0
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci;
+
 --
 -- Indexes for dumped tables
 --
@@ -269,7 +282,12 @@ ALTER TABLE `positions`
 ALTER TABLE `students`
   ADD PRIMARY KEY (`id`),
   ADD UNIQUE KEY `student_id` (`student_id`),
-  ADD UNIQUE KEY `email` (`email`);
+  ADD UNIQUE KEY `email` (`email`),
+  ADD KEY `login_lookup` (`student_id`,`password_hash`,`has_voted`,`is_active`),
+  ADD KEY `has_voted_is_active` (`has_voted`,`is_active`),
+  ADD KEY `program` (`program`);
+ALTER TABLE `students`
+  ADD FULLTEXT KEY `full_name` (`full_name`);
 
 --
 -- Indexes for table `votes`
@@ -278,6 +296,14 @@ ALTER TABLE `votes`
   ADD PRIMARY KEY (`id`),
   ADD UNIQUE KEY `unique_vote` (`student_id`,`position_id`),
   ADD KEY `position_id` (`position_id`),
+  ADD KEY `candidate_id` (`candidate_id`),
+  ADD KEY `vote_timestamp` (`vote_timestamp`);
+
+--
+-- Indexes for table `vote_tallies`
+--
+ALTER TABLE `vote_tallies`
+  ADD PRIMARY KEY (`position_id`,`candidate_id`),
   ADD KEY `candidate_id` (`candidate_id`);
 
 --
@@ -300,7 +326,7 @@ ALTER TABLE `candidates`
 -- AUTO_INCREMENT for table `election_settings`
 --
 ALTER TABLE `election_settings`
-  MODIFY `id` int(11) NOT NULL AUTO_INCREMENT, AUTO_INCREMENT=8;
+  MODIFY `id` int(11) NOT NULL AUTO_INCREMENT, AUTO_INCREMENT=9;
 
 --
 -- AUTO_INCREMENT for table `positions`
@@ -338,6 +364,13 @@ ALTER TABLE `votes`
   ADD CONSTRAINT `votes_ibfk_1` FOREIGN KEY (`student_id`) REFERENCES `students` (`student_id`) ON DELETE CASCADE,
   ADD CONSTRAINT `votes_ibfk_2` FOREIGN KEY (`position_id`) REFERENCES `positions` (`id`) ON DELETE CASCADE,
   ADD CONSTRAINT `votes_ibfk_3` FOREIGN KEY (`candidate_id`) REFERENCES `candidates` (`id`) ON DELETE CASCADE;
+
+--
+-- Constraints for table `vote_tallies`
+--
+ALTER TABLE `vote_tallies`
+  ADD CONSTRAINT `vote_tallies_ibfk_1` FOREIGN KEY (`position_id`) REFERENCES `positions` (`id`) ON DELETE CASCADE,
+  ADD CONSTRAINT `vote_tallies_ibfk_2` FOREIGN KEY (`candidate_id`) REFERENCES `candidates` (`id`) ON DELETE CASCADE;
 COMMIT;
 
 /*!40101 SET CHARACTER_SET_CLIENT=@OLD_CHARACTER_SET_CLIENT */;
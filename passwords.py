@@ -0,0 +1,255 @@
+"""Password hashing and verification for admin and student accounts.
+
+New hashes are PBKDF2-HMAC-SHA256 from hashlib, stored as
+
+    $pbkdf2-sha256$<iterations>$<salt>$<digest>
+
+with base64 salt and digest. The iteration count is the cost factor; the
+default can be raised with the MCA_PBKDF2_ITERATIONS environment variable
+and existing hashes are upgraded on the next successful login.
+
+bcrypt hashes ($2y$, $2b$, $2a$), as seeded for the default admin by older
+copies of mca_voting_system.sql, verify when the bcrypt package is installed. Older rows - unsalted sha256
+hex from the first admin screen and plaintext student passwords - still
+verify, and needs_rehash() flags them so they are replaced on login.
+
+hashlib and bcrypt release the GIL while hashing, so a thread pool spreads
+the work over every core:
+
+    # hash every plaintext student password in parallel
+    python passwords.py migrate --workers 8
+    # logins per second at a given cost
+    python passwords.py bench --iterations 200000 --threads 4
+"""
+
+import argparse
+import base64
+import hashlib
+import hmac
+import os
+import re
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Sequence, Tuple
+
+import mysql.connector
+from mysql.connector import Error
+
+
+DEFAULT_ITERATIONS = int(os.environ.get("MCA_PBKDF2_ITERATIONS", "200000"))
+SALT_BYTES = 16
+PBKDF2_PREFIX = "$pbkdf2-sha256$"
+
+SCHEME_PBKDF2 = "pbkdf2-sha256"
+SCHEME_BCRYPT = "bcrypt"
+SCHEME_SHA256 = "sha256"
+SCHEME_PLAINTEXT = "plaintext"
+
+_BCRYPT_PATTERN = re.compile(r"^\$2[abxy]\$\d{2}\$[./A-Za-z0-9]{53}$")
+_SHA256_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+
+
+class UnsupportedHashError(ValueError):
+    """Raised when a stored hash needs a library that is not installed"""
+
+
+def _b64(data: bytes) -> str:
+    return base64.b64encode(data).decode("ascii").rstrip("=")
+
+
+def _unb64(text: str) -> bytes:
+    return base64.b64decode(text + "=" * (-len(text) % 4))
+
+
+def identify(stored: Optional[str]) -> str:
+    """Name the scheme a stored password_hash value uses"""
+    stored = stored or ""
+    if stored.startswith(PBKDF2_PREFIX):
+        return SCHEME_PBKDF2
+    if _BCRYPT_PATTERN.match(stored):
+        return SCHEME_BCRYPT
+    if _SHA256_PATTERN.match(stored):
+        return SCHEME_SHA256
+    return SCHEME_PLAINTEXT
+
+
+def hash_password(password: str, iterations: Optional[int] = None) -> str:
+    """Hash ``password`` with a fresh random salt"""
+    iterations = iterations or DEFAULT_ITERATIONS
+    salt = os.urandom(SALT_BYTES)
+    digest = hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt, iterations)
+    return f"{PBKDF2_PREFIX}{iterations}${_b64(salt)}${_b64(digest)}"
+
+
+def _verify_bcrypt(password: str, stored: str) -> bool:
+    try:
+        import bcrypt
+    except ImportError:
+        raise UnsupportedHashError("This account uses a bcrypt hash; install the bcrypt package (pip install bcrypt)")
+    # PHP writes $2y$; the bcrypt package only knows $2b$, which is the same algorithm
+    normalized = "$2b$" + stored[4:] if stored.startswith(("$2y$", "$2x$")) else stored
+    return bcrypt.checkpw(password.encode("utf-8"), normalized.encode("ascii"))
+
+
+def verify_password(password: str, stored: Optional[str]) -> bool:
+    """Check ``password`` against any supported stored form"""
+    if not stored or password is None:
+        return False
+    scheme = identify(stored)
+    if scheme == SCHEME_PBKDF2:
+        try:
+            iterations, salt, digest = stored[len(PBKDF2_PREFIX):].split("$")
+            expected = _unb64(digest)
+            actual = hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), _unb64(salt), int(iterations))
+        except ValueError:
+            return False
+        return hmac.compare_digest(actual, expected)
+    if scheme == SCHEME_BCRYPT:
+        return _verify_bcrypt(password, stored)
+    if scheme == SCHEME_SHA256:
+        hashed = hashlib.sha256(password.encode("utf-8")).hexdigest()
+        # A 64-character hex plaintext password is possible too
+        return hmac.compare_digest(hashed, stored) or hmac.compare_digest(password, stored)
+    return hmac.compare_digest(password.encode("utf-8"), stored.encode("utf-8"))
+
+
+def needs_rehash(stored: Optional[str], iterations: Optional[int] = None) -> bool:
+    """True for any legacy scheme or a PBKDF2 hash below the current cost"""
+    if identify(stored) != SCHEME_PBKDF2:
+        return True
+    try:
+        return int(stored[len(PBKDF2_PREFIX):].split("$")[0]) < (iterations or DEFAULT_ITERATIONS)
+    except ValueError:
+        return True
+
+
+def hash_many(passwords: Sequence[str], iterations: Optional[int] = None, workers: Optional[int] = None) -> List[str]:
+    """Hash a batch of passwords across a thread pool, preserving order"""
+    if len(passwords) <= 1:
+        return [hash_password(p, iterations) for p in passwords]
+    workers = workers or os.cpu_count() or 4
+    with ThreadPoolExecutor(max_workers=min(workers, len(passwords))) as pool:
+        return list(pool.map(lambda p: hash_password(p, iterations), passwords))
+
+
+STUDENT_PASSWORDS_QUERY = "SELECT id, password_hash FROM students"
+STUDENT_REHASH_QUERY = "UPDATE students SET password_hash = %s WHERE id = %s AND password_hash = %s"
+ADMIN_PASSWORDS_QUERY = "SELECT id, password_hash FROM admin_users"
+
+
+def migrate_student_passwords(connection, iterations: Optional[int] = None, workers: Optional[int] = None,
+                              batch_size: int = 500) -> Tuple[int, int]:
+    """Replace plaintext student passwords with hashes; returns (upgraded, left for next login).
+
+    Only plaintext can be rehashed without the user: hashes are upgraded
+    when their owner next logs in. Each UPDATE only applies if the row still
+    holds the value that was read, so a password changed meanwhile is kept.
+    """
+    cursor = connection.cursor()
+    try:
+        cursor.execute(STUDENT_PASSWORDS_QUERY)
+        rows = cursor.fetchall()
+    finally:
+        cursor.close()
+
+    plaintext = [(row_id, stored) for row_id, stored in rows if identify(stored) == SCHEME_PLAINTEXT and stored]
+    pending = sum(1 for _, stored in rows if identify(stored) != SCHEME_PLAINTEXT and needs_rehash(stored, iterations))
+
+    upgraded = 0
+    for start in range(0, len(plaintext), batch_size):
+        batch = plaintext[start:start + batch_size]
+        hashes = hash_many([stored for _, stored in batch], iterations, workers)
+        cursor = connection.cursor()
+        connection.start_transaction()
+        try:
+            cursor.executemany(STUDENT_REHASH_QUERY,
+                               [(new, row_id, old) for (row_id, old), new in zip(batch, hashes)])
+            upgraded += cursor.rowcount
+            connection.commit()
+        except Exception:
+            connection.rollback()
+            raise
+        finally:
+            cursor.close()
+    return upgraded, pending
+
+
+def benchmark(iterations: int, threads: int, seconds: float) -> Tuple[int, float]:
+    """Verify one hash from ``threads`` threads for ``seconds``; returns (logins, elapsed)"""
+    stored = hash_password("benchmark-password", iterations)
+    deadline = time.perf_counter() + seconds
+    lock = threading.Lock()
+    count = [0]
+
+    def worker():
+        done = 0
+        while time.perf_counter() < deadline:
+            verify_password("benchmark-password", stored)
+            done += 1
+        with lock:
+            count[0] += done
+
+    started = time.perf_counter()
+    pool = [threading.Thread(target=worker) for _ in range(threads)]
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    return count[0], time.perf_counter() - started
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Password hash migration and cost benchmark")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    migrate = sub.add_parser("migrate", help="hash every plaintext student password")
+    migrate.add_argument("--iterations", type=int, default=DEFAULT_ITERATIONS)
+    migrate.add_argument("--workers", type=int, default=os.cpu_count() or 4)
+    migrate.add_argument("--batch-size", type=int, default=500)
+    migrate.add_argument("--host", default="localhost")
+    migrate.add_argument("--database", default="mca_voting_system")
+    migrate.add_argument("--user", default="root")
+    migrate.add_argument("--password", default="")
+
+    bench = sub.add_parser("bench", help="report logins/sec at a cost factor")
+    bench.add_argument("--iterations", type=int, default=DEFAULT_ITERATIONS)
+    bench.add_argument("--threads", type=int, default=1)
+    bench.add_argument("--seconds", type=float, default=3.0)
+    args = parser.parse_args(argv)
+
+    if args.command == "bench":
+        logins, elapsed = benchmark(args.iterations, args.threads, args.seconds)
+        rate = logins / elapsed if elapsed > 0 else 0.0
+        print(f"pbkdf2-sha256, {args.iterations} iterations, {args.threads} thread(s): "
+              f"{rate:.1f} logins/s ({1000 * args.threads / rate if rate else 0:.1f} ms per login)")
+        return 0
+
+    try:
+        connection = mysql.connector.connect(host=args.host, database=args.database,
+                                             user=args.user, password=args.password)
+    except Error as e:
+        print(f"Failed to connect to database: {e}", file=sys.stderr)
+        return 2
+
+    start = time.perf_counter()
+    try:
+        upgraded, pending = migrate_student_passwords(connection, args.iterations, args.workers, args.batch_size)
+        cursor = connection.cursor()
+        cursor.execute(ADMIN_PASSWORDS_QUERY)
+        admin_pending = sum(1 for _, stored in cursor.fetchall() if needs_rehash(stored, args.iterations))
+        cursor.close()
+    except Error as e:
+        print(f"Migration failed: {e}", file=sys.stderr)
+        return 1
+    finally:
+        connection.close()
+
+    print(f"Hashed {upgraded} plaintext student password(s) in {time.perf_counter() - start:.1f}s; "
+          f"{pending} student and {admin_pending} admin hash(es) will be upgraded at next login")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,120 @@
+"""Background execution of database work for the Tk front ends.
+
+Pages hand blocking calls to a shared QueryExecutor instead of running them
+on the Tk mainloop; results come back through callbacks scheduled with
+``after`` so widgets are only ever touched from the Tk thread.
+"""
+
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class RequestTimings:
+    """Count, total and worst duration per request name"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats: Dict[str, list] = {}
+
+    def record(self, name: str, seconds: float, cancelled: bool = False):
+        with self._lock:
+            stats = self._stats.setdefault(name, [0, 0.0, 0.0, 0])
+            if cancelled:
+                stats[3] += 1
+                return
+            stats[0] += 1
+            stats[1] += seconds
+            stats[2] = max(stats[2], seconds)
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {
+                name: {
+                    "count": count,
+                    "avg_ms": (total / count * 1000) if count else 0.0,
+                    "max_ms": worst * 1000,
+                    "superseded": superseded,
+                }
+                for name, (count, total, worst, superseded) in self._stats.items()
+            }
+
+
+class QueryExecutor:
+    """Runs blocking database work on a bounded thread pool.
+
+    Callbacks are marshalled back onto the Tk thread with ``widget.after``.
+    Submitting with a ``key`` supersedes any earlier request with the same
+    key: it is cancelled if it has not started yet and its callbacks are
+    dropped if it has.
+    """
+
+    def __init__(self, max_workers: int = 4):
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="db")
+        self._lock = threading.Lock()
+        self._latest: Dict[Hashable, Future] = {}
+        self.timings = RequestTimings()
+
+    def submit(self, widget, fn: Callable[..., Any], *args,
+               on_success: Optional[Callable[[Any], None]] = None,
+               on_error: Optional[Callable[[Exception], None]] = None,
+               key: Optional[Hashable] = None, name: Optional[str] = None) -> Future:
+        """Run ``fn(*args)`` in the background and hand its result to ``on_success`` on the Tk thread"""
+        name = name or getattr(fn, "__qualname__", "request")
+
+        def timed():
+            start = time.perf_counter()
+            try:
+                return fn(*args)
+            finally:
+                self.timings.record(name, time.perf_counter() - start)
+
+        future = self._pool.submit(timed)
+        if key is not None:
+            with self._lock:
+                previous = self._latest.get(key)
+                self._latest[key] = future
+            if previous is not None and previous.cancel():
+                self.timings.record(name, 0.0, cancelled=True)
+
+        def deliver(done: Future):
+            if done.cancelled():
+                return
+            if key is not None:
+                with self._lock:
+                    if self._latest.get(key) is not done:
+                        return
+                    del self._latest[key]
+            error = done.exception()
+
+            def callback():
+                try:
+                    if not widget.winfo_exists():
+                        return
+                except Exception:
+                    return
+                if error is not None:
+                    if on_error:
+                        on_error(error)
+                elif on_success:
+                    on_success(done.result())
+
+            try:
+                widget.after(0, callback)
+            except RuntimeError:
+                # The Tk mainloop has already gone away
+                pass
+
+        future.add_done_callback(deliver)
+        return future
+
+    def cancel(self, key: Hashable):
+        """Drop the pending request for ``key``, if any"""
+        with self._lock:
+            future = self._latest.pop(key, None)
+        if future is not None:
+            future.cancel()
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
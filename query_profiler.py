@@ -0,0 +1,161 @@
+"""Per-statement latency statistics and a slow-query log for DatabaseManager.
+
+Statements are grouped by their normalized SQL: literals become ``?`` and
+IN lists collapse to ``IN (...)``, so every call of one query shape lands
+in the same entry. Each entry keeps a log-scale latency histogram, rows
+returned and time spent waiting for a pooled connection. Statements slower
+than the threshold go into a bounded slow-query log, optionally with their
+EXPLAIN plan.
+
+Profiling is off unless MCA_PROFILE_QUERIES=1 or it is switched on from the
+Performance page; while off, DatabaseManager skips every hook after a
+single attribute check. MCA_SLOW_QUERY_MS (default 200) sets the
+threshold and MCA_EXPLAIN_SLOW=1 captures plans.
+"""
+
+import bisect
+import os
+import re
+import threading
+from collections import deque
+from datetime import datetime
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional
+
+
+# Upper bounds in milliseconds; anything slower lands in the last bucket
+BUCKET_BOUNDS_MS = (0.5, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+_STRING_LITERAL = re.compile(r"'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\bIN\s*\((?:\s*(?:\?|%s)\s*,)*\s*(?:\?|%s)\s*\)", re.IGNORECASE)
+_WHITESPACE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=1024)
+def normalize_sql(query: str) -> str:
+    """Collapse a statement to its shape so repeated calls share one entry"""
+    shape = _STRING_LITERAL.sub("?", query)
+    shape = _NUMBER_LITERAL.sub("?", shape)
+    shape = _IN_LIST.sub("IN (...)", shape)
+    return _WHITESPACE.sub(" ", shape).strip()
+
+
+class StatementStats:
+    """Latency histogram and totals for one normalized statement"""
+
+    def __init__(self, sql: str):
+        self.sql = sql
+        self.buckets = [0] * (len(BUCKET_BOUNDS_MS) + 1)
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.rows = 0
+        self.acquire_total = 0.0
+
+    def record(self, seconds: float, acquire_seconds: float, rows: int):
+        self.buckets[bisect.bisect_left(BUCKET_BOUNDS_MS, seconds * 1000)] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self.rows += rows
+        self.acquire_total += acquire_seconds
+
+    def percentile(self, p: float) -> float:
+        """Bucket upper bound, in ms, below which ``p`` percent of calls finished"""
+        if not self.count:
+            return 0.0
+        target = self.count * p / 100
+        seen = 0
+        for index, n in enumerate(self.buckets):
+            seen += n
+            if seen >= target:
+                bound = BUCKET_BOUNDS_MS[index] if index < len(BUCKET_BOUNDS_MS) else float("inf")
+                return min(bound, self.max * 1000)
+        return self.max * 1000
+
+    def snapshot(self) -> Dict[str, object]:
+        return {
+            "sql": self.sql,
+            "count": self.count,
+            "errors": self.errors,
+            "total_ms": self.total * 1000,
+            "avg_ms": (self.total / self.count * 1000) if self.count else 0.0,
+            "p50_ms": self.percentile(50),
+            "p95_ms": self.percentile(95),
+            "max_ms": self.max * 1000,
+            "rows": self.rows,
+            "avg_acquire_ms": (self.acquire_total / self.count * 1000) if self.count else 0.0,
+        }
+
+
+class SlowQuery:
+    """One entry of the slow-query log; parameters are never kept"""
+
+    def __init__(self, sql: str, seconds: float, acquire_seconds: float, rows: int,
+                 plan: Optional[List[tuple]] = None):
+        self.at = datetime.now()
+        self.sql = sql
+        self.seconds = seconds
+        self.acquire_seconds = acquire_seconds
+        self.rows = rows
+        self.plan = plan
+
+
+class QueryProfiler:
+    """Thread-safe collector behind DatabaseManager's query instrumentation"""
+
+    def __init__(self, enabled: bool = False, slow_threshold: float = 0.2, explain: bool = False,
+                 slow_log_size: int = 200):
+        self.enabled = enabled
+        self.slow_threshold = slow_threshold
+        self.explain = explain
+        self._lock = threading.Lock()
+        self._stats: Dict[str, StatementStats] = {}
+        self._slow: deque = deque(maxlen=slow_log_size)
+
+    @classmethod
+    def from_env(cls) -> "QueryProfiler":
+        return cls(enabled=os.environ.get("MCA_PROFILE_QUERIES") == "1",
+                   slow_threshold=float(os.environ.get("MCA_SLOW_QUERY_MS", "200")) / 1000,
+                   explain=os.environ.get("MCA_EXPLAIN_SLOW") == "1")
+
+    def record(self, query: str, seconds: float, acquire_seconds: float = 0.0, rows: int = 0,
+               explain: Optional[Callable[[], Optional[List[tuple]]]] = None):
+        """Add one execution; ``explain()`` is only called for slow statements when plans are wanted"""
+        sql = normalize_sql(query)
+        with self._lock:
+            stats = self._stats.get(sql)
+            if stats is None:
+                stats = self._stats[sql] = StatementStats(sql)
+            stats.record(seconds, acquire_seconds, rows)
+        if seconds >= self.slow_threshold:
+            plan = explain() if explain is not None and self.explain else None
+            with self._lock:
+                self._slow.append(SlowQuery(sql, seconds, acquire_seconds, rows, plan))
+
+    def record_error(self, query: str):
+        sql = normalize_sql(query)
+        with self._lock:
+            stats = self._stats.get(sql)
+            if stats is None:
+                stats = self._stats[sql] = StatementStats(sql)
+            stats.errors += 1
+
+    def top(self, limit: int = 20, by: str = "total_ms") -> List[Dict[str, object]]:
+        """Statement snapshots, largest ``by`` first"""
+        with self._lock:
+            snapshots = [stats.snapshot() for stats in self._stats.values()]
+        snapshots.sort(key=lambda s: s[by], reverse=True)
+        return snapshots[:limit]
+
+    def slow_queries(self) -> List[SlowQuery]:
+        """Slow-query log, newest first"""
+        with self._lock:
+            return list(reversed(self._slow))
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+            self._slow.clear()
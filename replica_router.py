@@ -0,0 +1,253 @@
+"""Read/write splitting across the primary and its read replicas.
+
+Writes always go to the primary. ReplicaRouter sends reads to a replica
+when it is caught up, so the admin dashboard and list pages do not compete
+with ballot commits. Replicas take turns.
+
+A background thread measures each replica's lag every ``check_interval``
+seconds. A replica serves reads only while two things hold:
+
+- its measured lag, plus the time since the measurement, is within
+  ``max_lag``;
+- the primary's state it is known to reflect is newer than this process's
+  last write (read-your-writes).
+
+After an admin save, reads therefore stay on the primary until a lag check
+shows the replica has caught up with it. When no replica qualifies, the
+primary serves the read.
+
+A replica that cannot be reached is skipped until its next successful check.
+So is one whose replication has stopped. A server that reports no
+replication status at all counts as current, so a second connection to the
+primary can stand in for a replica when testing.
+
+MCA_READ_REPLICAS lists replicas as comma-separated host[:port] entries.
+MCA_REPLICA_MAX_LAG (default 5) is the most lag, in seconds, a replica may
+have and still serve reads.
+"""
+
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from mysql.connector import Error
+
+from db_pool import ConnectionPool, PoolTimeout, is_connection_error
+
+
+DEFAULT_READ_REPLICAS = os.environ.get("MCA_READ_REPLICAS", "")
+DEFAULT_MAX_LAG = float(os.environ.get("MCA_REPLICA_MAX_LAG", "5"))
+
+# SHOW REPLICA STATUS needs MySQL 8.0.22+ or MariaDB 10.5+; older servers only know the SLAVE spelling
+REPLICA_STATUS_QUERIES = ("SHOW REPLICA STATUS", "SHOW SLAVE STATUS")
+LAG_COLUMNS = ("Seconds_Behind_Source", "Seconds_Behind_Master")
+# The server reports lag in whole seconds
+LAG_RESOLUTION = 1.0
+
+
+def parse_replicas(spec: str) -> List[Tuple[str, Optional[int]]]:
+    """Split 'host[:port],...' into (host, port) pairs; port is None when not given"""
+    replicas = []
+    for item in spec.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        host, _, port = item.partition(":")
+        replicas.append((host, int(port) if port else None))
+    return replicas
+
+
+def replication_lag(connection) -> Optional[float]:
+    """Seconds the server is behind its source.
+
+    Returns 0.0 for a server that is not a replica and None when replication
+    is stopped. Raises Error if the server will not report its status.
+    """
+    last_error = None
+    for query in REPLICA_STATUS_QUERIES:
+        cursor = connection.cursor(dictionary=True)
+        try:
+            cursor.execute(query)
+            rows = cursor.fetchall()
+        except Error as e:
+            # A connection error means the link is down; a syntax error means try the older spelling
+            if is_connection_error(e):
+                raise
+            last_error = e
+            continue
+        finally:
+            cursor.close()
+        lag = 0.0
+        # Multi-source replicas return one row per channel; the slowest one counts
+        for row in rows:
+            seconds = next((row[column] for column in LAG_COLUMNS if column in row), None)
+            if seconds is None:
+                return None
+            lag = max(lag, float(seconds))
+        return lag
+    raise last_error
+
+
+class Replica:
+    """One read replica's pool and its last lag measurement"""
+
+    def __init__(self, name: str, pool: ConnectionPool):
+        self.name = name
+        self.pool = pool
+        self.healthy = False
+        self.lag: Optional[float] = None
+        self.checked_at = 0.0
+        # Monotonic time up to which the primary's writes are known to be visible here
+        self.caught_up_to = 0.0
+        self.reads = 0
+        self.failures = 0
+        self.last_error: Optional[str] = None
+
+    def staleness(self, now: float) -> float:
+        """Worst-case lag right now: the measured lag plus the age of the measurement"""
+        return self.lag + (now - self.checked_at)
+
+
+class ReplicaRouter:
+    """Chooses the pool each read runs on and tracks replica lag"""
+
+    def __init__(self, primary: ConnectionPool, replicas: List[Replica], max_lag: float = DEFAULT_MAX_LAG,
+                 check_interval: float = 2.0):
+        self.primary = primary
+        self.replicas = replicas
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._next = 0
+        self._last_write: Optional[float] = None
+        self.primary_reads = 0
+        # Reads the primary took because no replica was current enough
+        self.fallbacks = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def note_write(self):
+        """Record a committed write; reads stay on the primary until a replica has caught up with it"""
+        with self._lock:
+            self._last_write = time.monotonic()
+
+    def _usable(self, replica: Replica, now: float) -> bool:
+        if not replica.healthy or replica.staleness(now) > self.max_lag:
+            return False
+        return self._last_write is None or replica.caught_up_to >= self._last_write
+
+    def read_pool(self) -> ConnectionPool:
+        """Pool for the next read: a current replica in turn, otherwise the primary"""
+        now = time.monotonic()
+        with self._lock:
+            usable = [replica for replica in self.replicas if self._usable(replica, now)]
+            if not usable:
+                self.primary_reads += 1
+                if self.replicas:
+                    self.fallbacks += 1
+                return self.primary
+            replica = usable[self._next % len(usable)]
+            self._next += 1
+            replica.reads += 1
+            return replica.pool
+
+    def mark_failed(self, pool: ConnectionPool, error: Exception):
+        """Stop reading from a replica until its next successful lag check"""
+        with self._lock:
+            for replica in self.replicas:
+                if replica.pool is pool:
+                    replica.healthy = False
+                    replica.failures += 1
+                    replica.last_error = str(error)
+
+    def read(self, fn: Callable[[Any], Any], primary: bool = False):
+        """Call ``fn(connection)`` for a read and return its result.
+
+        If the chosen replica fails at the connection level, it is marked
+        down and ``fn`` runs again on the primary. ``fn`` must therefore be
+        safe to repeat.
+        """
+        pool = self.primary if primary else self.read_pool()
+        if pool is not self.primary:
+            try:
+                with pool.connection() as connection:
+                    return fn(connection)
+            except PoolTimeout:
+                # Busy rather than broken; let the primary take this one
+                pass
+            except Error as e:
+                if not is_connection_error(e):
+                    raise
+                self.mark_failed(pool, e)
+            with self._lock:
+                self.primary_reads += 1
+                self.fallbacks += 1
+        with self.primary.connection() as connection:
+            return fn(connection)
+
+    def check(self):
+        """Measure every replica's lag once"""
+        for replica in self.replicas:
+            try:
+                with replica.pool.connection(timeout=self.check_interval) as connection:
+                    # Taken before the query, so caught_up_to never runs ahead of the server
+                    measured = time.monotonic()
+                    lag = replication_lag(connection)
+            except Error as e:
+                self.mark_failed(replica.pool, e)
+                continue
+            with self._lock:
+                replica.checked_at = measured
+                replica.lag = lag
+                replica.healthy = lag is not None
+                if lag is None:
+                    replica.last_error = "Replication is stopped"
+                else:
+                    replica.last_error = None
+                    replica.caught_up_to = measured - lag - LAG_RESOLUTION
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.check()
+            self._stop.wait(self.check_interval)
+
+    def start(self):
+        """Begin checking replica lag on a background thread"""
+        if self.replicas and self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="replica-lag", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.check_interval * 2)
+            self._thread = None
+
+    def close_all(self):
+        """Stop the lag checks and close every replica connection; the primary is left to its owner"""
+        self.stop()
+        for replica in self.replicas:
+            replica.pool.close_all()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Read counts and the latest lag of each replica"""
+        now = time.monotonic()
+        with self._lock:
+            return {
+                "primary_reads": self.primary_reads,
+                "fallbacks": self.fallbacks,
+                "replicas": [
+                    {
+                        "name": replica.name,
+                        "healthy": replica.healthy,
+                        "usable": self._usable(replica, now),
+                        "lag": replica.lag,
+                        "reads": replica.reads,
+                        "failures": replica.failures,
+                        "last_error": replica.last_error,
+                    }
+                    for replica in self.replicas
+                ],
+            }
@@ -0,0 +1,239 @@
+"""Per-candidate election results from the vote_tallies table.
+
+A single query reads every active position with its candidates and their
+running counts; vote shares, winners, margins and ties are derived from
+that in Python. Results are cached against a watermark (latest vote id,
+tally sum, ballot version and the results_visible flag), so re-reading them
+after each new vote costs one cheap probe plus, when something moved, one
+indexed scan of the small tally table.
+
+    python results.py
+"""
+
+import argparse
+import sys
+import threading
+import time
+from typing import Callable, List, Optional
+
+import mysql.connector
+from mysql.connector import Error
+
+
+RESULTS_WATERMARK_QUERY = """
+SELECT (SELECT COALESCE(MAX(id), 0) FROM votes),
+       (SELECT COALESCE(SUM(vote_count), 0) FROM vote_tallies),
+       (SELECT setting_value FROM election_settings WHERE setting_name = 'ballot_version'),
+       (SELECT setting_value FROM election_settings WHERE setting_name = 'results_visible')
+"""
+# The watermark rides along on every row so the cached results and the
+# stamp they are checked against always come from the same read.
+RESULTS_QUERY = """
+SELECT w.max_vote_id, w.tally_sum, w.ballot_version, w.results_visible,
+       p.id, p.position_name, c.id, c.candidate_name, COALESCE(t.vote_count, 0)
+FROM (
+    SELECT (SELECT COALESCE(MAX(id), 0) FROM votes) AS max_vote_id,
+           (SELECT COALESCE(SUM(vote_count), 0) FROM vote_tallies) AS tally_sum,
+           (SELECT setting_value FROM election_settings WHERE setting_name = 'ballot_version') AS ballot_version,
+           (SELECT setting_value FROM election_settings WHERE setting_name = 'results_visible') AS results_visible
+) w
+JOIN positions p ON p.is_active = 1
+LEFT JOIN candidates c ON c.position_id = p.id
+LEFT JOIN vote_tallies t ON t.position_id = p.id AND t.candidate_id = c.id
+WHERE c.id IS NULL OR c.is_active = 1 OR t.vote_count > 0
+ORDER BY p.display_order, p.id, COALESCE(t.vote_count, 0) DESC, c.id
+"""
+
+
+def _truthy(value) -> bool:
+    return str(value).strip().lower() in ("1", "true", "yes", "on")
+
+
+class CandidateResult:
+    """One candidate's count and share of their position's votes"""
+
+    def __init__(self, candidate_id: int, candidate_name: str, votes: int, share: float):
+        self.candidate_id = candidate_id
+        self.candidate_name = candidate_name
+        self.votes = votes
+        self.share = share
+
+
+class PositionResult:
+    """Candidates for one position, most votes first"""
+
+    def __init__(self, position_id: int, position_name: str):
+        self.position_id = position_id
+        self.position_name = position_name
+        self.candidates: List[CandidateResult] = []
+        self.total_votes = 0
+
+    @property
+    def leaders(self) -> List[CandidateResult]:
+        """Every candidate sharing the highest count; empty before any votes"""
+        if not self.candidates or self.candidates[0].votes == 0:
+            return []
+        top = self.candidates[0].votes
+        return [c for c in self.candidates if c.votes == top]
+
+    @property
+    def tied(self) -> bool:
+        return len(self.leaders) > 1
+
+    @property
+    def winner(self) -> Optional[CandidateResult]:
+        """The single leading candidate, or None while tied or empty"""
+        leaders = self.leaders
+        return leaders[0] if len(leaders) == 1 else None
+
+    @property
+    def margin(self) -> int:
+        """Votes between first and second place (0 when tied)"""
+        if not self.candidates:
+            return 0
+        runner_up = self.candidates[1].votes if len(self.candidates) > 1 else 0
+        return self.candidates[0].votes - runner_up
+
+
+class ElectionResults:
+    """Snapshot of every position's results at one watermark"""
+
+    def __init__(self, watermark: Optional[tuple], positions: List[PositionResult]):
+        self.watermark = watermark
+        self.positions = positions
+
+    @property
+    def visible(self) -> bool:
+        """Whether the results_visible setting allows showing these to students"""
+        return bool(self.watermark) and _truthy(self.watermark[3])
+
+    @classmethod
+    def from_rows(cls, rows: List[tuple]) -> "ElectionResults":
+        """Build results from RESULTS_QUERY rows"""
+        watermark = tuple(rows[0][:4]) if rows else None
+        positions: List[PositionResult] = []
+        counts = []
+        for row in rows:
+            pos_id, pos_name, cand_id, cand_name, votes = row[4:]
+            if not positions or positions[-1].position_id != pos_id:
+                positions.append(PositionResult(pos_id, pos_name))
+                counts.append([])
+            if cand_id is not None:
+                counts[-1].append((cand_id, cand_name, int(votes)))
+        for position, candidates in zip(positions, counts):
+            position.total_votes = sum(votes for _, _, votes in candidates)
+            total = position.total_votes
+            position.candidates = [
+                CandidateResult(cand_id, name, votes, votes / total * 100 if total else 0.0)
+                for cand_id, name, votes in candidates
+            ]
+        return cls(watermark, positions)
+
+
+class ResultsCache:
+    """Process-wide results cache keyed by the vote watermark.
+
+    The watermark is re-read at most once every ``check_interval`` seconds;
+    the full results query only runs when it has moved.
+    """
+
+    def __init__(self, check_interval: float = 1.0):
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._results: Optional[ElectionResults] = None
+        self._checked_at = 0.0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, fetch: Callable[..., Optional[List[tuple]]]) -> Optional[ElectionResults]:
+        """Return current results, using ``fetch(query, params)`` only when stale"""
+        with self._lock:
+            now = time.monotonic()
+            if self._results is not None and now - self._checked_at < self.check_interval:
+                self.hits += 1
+                return self._results
+
+            if self._results is not None:
+                rows = fetch(RESULTS_WATERMARK_QUERY)
+                if rows is None:
+                    # Keep serving the last good results if the check failed
+                    return self._results
+                if rows and tuple(rows[0]) == self._results.watermark:
+                    self._checked_at = now
+                    self.hits += 1
+                    return self._results
+
+            rows = fetch(RESULTS_QUERY)
+            if rows is None:
+                return self._results
+            self.misses += 1
+            self._results = ElectionResults.from_rows(rows)
+            self._checked_at = now
+            return self._results
+
+    def invalidate(self):
+        """Force the next get() to reload the results"""
+        with self._lock:
+            self._results = None
+
+
+results_cache = ResultsCache()
+
+
+def get_results(fetch: Callable[..., Optional[List[tuple]]], for_students: bool = False,
+                cache: ResultsCache = results_cache) -> Optional[ElectionResults]:
+    """Current results; None for students while results_visible is off"""
+    results = cache.get(fetch)
+    if for_students and results is not None and not results.visible:
+        return None
+    return results
+
+
+def format_results(results: ElectionResults) -> str:
+    """Plain-text rendering used by the command line"""
+    lines = []
+    for position in results.positions:
+        if position.tied:
+            status = "tied between " + ", ".join(c.candidate_name for c in position.leaders)
+        elif position.winner:
+            status = f"{position.winner.candidate_name} leads by {position.margin}"
+        else:
+            status = "no votes yet"
+        lines.append(f"{position.position_name} ({position.total_votes} votes): {status}")
+        for candidate in position.candidates:
+            lines.append(f"  {candidate.candidate_name:<30} {candidate.votes:>7} {candidate.share:>6.1f}%")
+    return "\n".join(lines)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Print per-candidate election results")
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--database", default="mca_voting_system")
+    parser.add_argument("--user", default="root")
+    parser.add_argument("--password", default="")
+    args = parser.parse_args(argv)
+
+    try:
+        connection = mysql.connector.connect(host=args.host, database=args.database,
+                                             user=args.user, password=args.password)
+    except Error as e:
+        print(f"Failed to connect to database: {e}", file=sys.stderr)
+        return 2
+
+    try:
+        cursor = connection.cursor()
+        cursor.execute(RESULTS_QUERY)
+        results = ElectionResults.from_rows(cursor.fetchall())
+        cursor.close()
+    except Error as e:
+        print(f"Query failed: {e}", file=sys.stderr)
+        return 1
+    finally:
+        connection.close()
+
+    print(format_results(results))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,35 @@
+"""Startup timing for the admin and student apps.
+
+Each entry point creates a StartupTimer before its heavy imports and marks
+the milestones it reaches: imports done, first paint of the login window,
+database pool ready. Once all three are in, one line goes to the terminal:
+
+    startup: imports 212 ms, first paint 348 ms, db ready 391 ms
+"""
+
+import time
+from typing import Dict
+
+
+MILESTONES = ("imports", "first paint", "db ready")
+
+
+class StartupTimer:
+    """Milliseconds from process start-up to each named milestone"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.marks: Dict[str, float] = {}
+        self.reported = False
+
+    def mark(self, name: str):
+        """Record ``name`` the first time it is reached; later calls are ignored"""
+        if name not in self.marks:
+            self.marks[name] = time.perf_counter() - self.started
+        if not self.reported and all(m in self.marks for m in MILESTONES):
+            self.reported = True
+            print(self.report())
+
+    def report(self) -> str:
+        parts = [f"{name} {self.marks[name] * 1000:.0f} ms" for name in MILESTONES if name in self.marks]
+        return "startup: " + ", ".join(parts)
@@ -0,0 +1,136 @@
+"""Per-connection cache of server-side prepared statements.
+
+ConnectionPool gives every connection it opens a StatementCache holding up
+to ``statement_cache_size`` prepared cursors keyed by SQL text, least
+recently used first out. A statement is parsed by the server once per
+connection and then only re-executed, with parameters sent in the binary
+protocol. ``statement()`` is what query code uses; on a connection without
+a cache (size 0, or one opened outside the pool) it falls back to a plain
+text cursor, so the same code runs either way.
+
+MCA_STATEMENT_CACHE sets the default size (32; 0 turns caching off).
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Dict
+
+from mysql.connector import Error
+
+
+DEFAULT_STATEMENT_CACHE_SIZE = int(os.environ.get("MCA_STATEMENT_CACHE", "32"))
+
+
+class StatementCacheStats:
+    """Hit, miss and eviction counts across every connection's cache"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.errors = 0
+
+    def increment(self, name: str):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "errors": self.errors,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+            }
+
+    def reset(self):
+        with self._lock:
+            self.hits = self.misses = self.evictions = self.errors = 0
+
+
+statement_stats = StatementCacheStats()
+
+
+class StatementCache:
+    """LRU of prepared cursors for a single connection.
+
+    A connection is only used by one thread at a time, so the cache itself
+    needs no lock.
+    """
+
+    def __init__(self, connection, capacity: int, stats: StatementCacheStats = statement_stats):
+        self.connection = connection
+        self.capacity = capacity
+        self.stats = stats
+        self._cursors: "OrderedDict[str, tuple]" = OrderedDict()
+
+    def execute(self, sql: str, params: tuple = None):
+        """Run ``sql`` on its prepared cursor, preparing it on first use; returns the cursor"""
+        entry = self._cursors.get(sql)
+        if entry is not None:
+            self._cursors.move_to_end(sql)
+            self.stats.increment("hits")
+        else:
+            self.stats.increment("misses")
+            entry = (sql, self.connection.cursor(prepared=True))
+            self._cursors[sql] = entry
+            while len(self._cursors) > self.capacity:
+                _, (_, evicted) = self._cursors.popitem(last=False)
+                self._close(evicted)
+                self.stats.increment("evictions")
+
+        # The connector only skips re-preparing when it is handed the very
+        # string object it prepared, so always execute the cached one.
+        prepared_sql, cursor = entry
+        try:
+            cursor.execute(prepared_sql, params or ())
+        except Error:
+            self.stats.increment("errors")
+            self.discard(sql)
+            raise
+        return cursor
+
+    def discard(self, sql: str):
+        entry = self._cursors.pop(sql, None)
+        if entry is not None:
+            self._close(entry[1])
+
+    @staticmethod
+    def _close(cursor):
+        try:
+            # Deallocates the statement on the server
+            cursor.close()
+        except Error:
+            pass
+
+    def clear(self):
+        while self._cursors:
+            _, (_, cursor) = self._cursors.popitem()
+            self._close(cursor)
+
+    def __len__(self) -> int:
+        return len(self._cursors)
+
+
+@contextmanager
+def statement(connection, sql: str, params: tuple = None):
+    """Execute ``sql`` and yield the cursor, prepared and cached when the connection allows.
+
+    Read every row before the block ends; a cached cursor is reused by the
+    next call with the same SQL.
+    """
+    cache = getattr(connection, "statement_cache", None)
+    if cache is not None:
+        yield cache.execute(sql, params)
+        return
+    cursor = connection.cursor()
+    try:
+        cursor.execute(sql, params or ())
+        yield cursor
+    finally:
+        cursor.close()
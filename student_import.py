@@ -0,0 +1,211 @@
+"""Streaming bulk import of students from CSV.
+
+The file is read row by row and inserted in fixed-size chunks, each in its
+own transaction, so memory stays flat however large the intake is. Expected
+columns (header row required):
+
+    student_id, full_name, email, program, year_of_study, password
+
+Passwords are hashed before insert, spread over a thread pool per chunk.
+Run from the command line with ``python student_import.py intake.csv``.
+"""
+
+import argparse
+import csv
+import re
+import sys
+import time
+from typing import Callable, Iterator, List, Optional, Tuple
+
+import mysql.connector
+from mysql.connector import Error
+
+from passwords import hash_many
+
+
+REQUIRED_COLUMNS = ("student_id", "full_name", "email", "program", "year_of_study", "password")
+STUDENT_INSERT_QUERY = """INSERT INTO students (student_id, full_name, email, password_hash, program, year_of_study, is_active)
+VALUES (%s, %s, %s, %s, %s, %s, 1)"""
+EMAIL_PATTERN = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+
+
+class ChunkReport:
+    """Outcome of one committed chunk"""
+
+    def __init__(self, index: int, inserted: int, rejected: List[Tuple[int, str]], seconds: float):
+        self.index = index
+        self.inserted = inserted
+        self.rejected = rejected
+        self.seconds = seconds
+
+    @property
+    def rows_per_second(self) -> float:
+        total = self.inserted + len(self.rejected)
+        return total / self.seconds if self.seconds > 0 else 0.0
+
+
+class ImportSummary:
+    """Running totals for an import"""
+
+    def __init__(self):
+        self.chunks = 0
+        self.inserted = 0
+        self.rejected = 0
+        self.seconds = 0.0
+
+    def add(self, report: ChunkReport):
+        self.chunks += 1
+        self.inserted += report.inserted
+        self.rejected += len(report.rejected)
+        self.seconds += report.seconds
+
+    @property
+    def rows_per_second(self) -> float:
+        total = self.inserted + self.rejected
+        return total / self.seconds if self.seconds > 0 else 0.0
+
+
+def validate_row(row: dict) -> Tuple[Optional[tuple], Optional[str]]:
+    """Return (insert params, None) for a good row or (None, reason) for a bad one"""
+    values = {col: (row.get(col) or "").strip() for col in REQUIRED_COLUMNS}
+    missing = [col for col in REQUIRED_COLUMNS if col != "program" and not values[col]]
+    if missing:
+        return None, f"missing {', '.join(missing)}"
+    if not EMAIL_PATTERN.match(values["email"]):
+        return None, f"invalid email '{values['email']}'"
+    try:
+        year = int(values["year_of_study"])
+    except ValueError:
+        return None, f"invalid year_of_study '{values['year_of_study']}'"
+    if not 1 <= year <= 10:
+        return None, f"year_of_study out of range: {year}"
+    return (values["student_id"], values["full_name"], values["email"], values["password"],
+            values["program"], year), None
+
+
+def _chunks(reader: csv.DictReader, size: int) -> Iterator[List[Tuple[int, dict]]]:
+    chunk = []
+    for row in reader:
+        chunk.append((reader.line_num, row))
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _insert_chunk(connection, rows: List[Tuple[int, tuple]]) -> List[Tuple[int, str]]:
+    """Insert one validated chunk in a single transaction; returns rows the database refused"""
+    rejected = []
+    cursor = connection.cursor()
+    connection.start_transaction()
+    try:
+        cursor.executemany(STUDENT_INSERT_QUERY, [params for _, params in rows])
+        connection.commit()
+        return rejected
+    except mysql.connector.IntegrityError:
+        connection.rollback()
+    except Exception:
+        connection.rollback()
+        cursor.close()
+        raise
+
+    # A duplicate somewhere in the batch; redo it row by row so only the
+    # offending rows are rejected. Each failed statement rolls back on its
+    # own without aborting the surrounding transaction.
+    connection.start_transaction()
+    try:
+        for line_num, params in rows:
+            try:
+                cursor.execute(STUDENT_INSERT_QUERY, params)
+            except mysql.connector.IntegrityError as e:
+                rejected.append((line_num, e.msg))
+        connection.commit()
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        cursor.close()
+    return rejected
+
+
+def _hash_passwords(valid: List[Tuple[int, tuple]], workers: Optional[int]) -> List[Tuple[int, tuple]]:
+    hashes = hash_many([params[3] for _, params in valid], workers=workers)
+    return [(line_num, params[:3] + (hashed,) + params[4:])
+            for (line_num, params), hashed in zip(valid, hashes)]
+
+
+def import_students_csv(path: str, connection, batch_size: int = 1000,
+                        on_chunk: Optional[Callable[[ChunkReport], None]] = None,
+                        should_stop: Optional[Callable[[], bool]] = None,
+                        hash_workers: Optional[int] = None) -> ImportSummary:
+    """Stream ``path`` into the students table in batches of ``batch_size`` rows"""
+    summary = ImportSummary()
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.DictReader(f)
+        missing = [col for col in REQUIRED_COLUMNS if col not in (reader.fieldnames or [])]
+        if missing:
+            raise ValueError(f"CSV is missing column(s): {', '.join(missing)}")
+
+        for index, chunk in enumerate(_chunks(reader, batch_size), 1):
+            if should_stop and should_stop():
+                break
+            start = time.perf_counter()
+            valid, rejected = [], []
+            for line_num, row in chunk:
+                params, reason = validate_row(row)
+                if params is None:
+                    rejected.append((line_num, reason))
+                else:
+                    valid.append((line_num, params))
+            if valid:
+                valid = _hash_passwords(valid, hash_workers)
+            refused = _insert_chunk(connection, valid) if valid else []
+            report = ChunkReport(index, len(valid) - len(refused), sorted(rejected + refused),
+                                 time.perf_counter() - start)
+            summary.add(report)
+            if on_chunk:
+                on_chunk(report)
+    return summary
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Bulk import students from a CSV file")
+    parser.add_argument("csv_path")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--hash-workers", type=int, default=None, help="threads for password hashing")
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--database", default="mca_voting_system")
+    parser.add_argument("--user", default="root")
+    parser.add_argument("--password", default="")
+    args = parser.parse_args(argv)
+
+    try:
+        connection = mysql.connector.connect(host=args.host, database=args.database,
+                                             user=args.user, password=args.password)
+    except Error as e:
+        print(f"Failed to connect to database: {e}", file=sys.stderr)
+        return 2
+
+    def report(chunk: ChunkReport):
+        print(f"chunk {chunk.index}: {chunk.inserted} inserted, {len(chunk.rejected)} rejected, "
+              f"{chunk.rows_per_second:.0f} rows/s")
+        for line_num, reason in chunk.rejected:
+            print(f"  line {line_num}: {reason}")
+
+    try:
+        summary = import_students_csv(args.csv_path, connection, args.batch_size, on_chunk=report,
+                                      hash_workers=args.hash_workers)
+    except (Error, ValueError, OSError) as e:
+        print(f"Import failed: {e}", file=sys.stderr)
+        return 1
+    finally:
+        connection.close()
+
+    print(f"Imported {summary.inserted} student(s), rejected {summary.rejected} "
+          f"in {summary.seconds:.1f}s ({summary.rows_per_second:.0f} rows/s)")
+    return 0 if summary.rejected == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,85 +1,300 @@
+from __future__ import annotations
+
+import argparse
+import time
+
+from startup import StartupTimer
+
+# Started before the heavy imports below so the startup report covers them
+startup_timer = StartupTimer()
+
+# customtkinter draws the login window, so it is the one heavy import paid before first paint
 import customtkinter as ctk
-import mysql.connector
-from mysql.connector import Error
 import os
+import sqlite3
+import threading
 import tkinter.messagebox as messagebox
 from tkinter import ttk
 from datetime import datetime
-from typing import Optional, List, Dict, Any
+from typing import TYPE_CHECKING, Optional, List, Dict, Any
+
+from query_executor import QueryExecutor, RequestTimings
+
+# Everything that pulls in mysql.connector is imported where it is used,
+# which is on a worker thread after the first paint (DatabaseManager._open_pool).
+if TYPE_CHECKING:
+    from ballot import Ballot
+    from ballot_client import BallotClient
+    from ballot_journal import BallotJournal, JournalReplayer
+    from db_pool import ConnectionPool
+    from last_login import LastLoginBuffer
+    from voting_service import LoginResult, VotingService
 
 # Set appearance mode and color theme
 ctk.set_appearance_mode("system")
 ctk.set_default_color_theme("blue")
 
+startup_timer.mark("imports")
+
+# Kiosk mode revalidates the ballot and settings on this interval. It is
+# shorter than the pool's 30 s health-check window, so the connection a
+# login picks up has always been used recently and needs no ping.
+KIOSK_PREFETCH_MS = 15000
+
 class DatabaseManager:
-    """Handles database connections and operations"""
+    """Handles database connections and operations through a shared connection pool.
+    
+    Given a ``server`` URL it runs in client mode instead: login, ballot and
+    submit go to ballot_server over HTTP and the booth opens no MySQL
+    connection at all.
+    """
     
-    def __init__(self):
+    def __init__(self, pool_size: int = 5, acquire_timeout: float = 10.0, journal_path: Optional[str] = None,
+                 connect_timeout: int = 5, server: Optional[str] = None):
         self.host = "localhost"
         self.database = "mca_voting_system"
         self.user = "root"
         self.password = ""
-        self.connection = None
+        self.pool_size = pool_size
+        self.acquire_timeout = acquire_timeout
+        self.connect_timeout = connect_timeout
+        self.server = server
+        self.pool: Optional[ConnectionPool] = None
+        self.client: Optional[BallotClient] = None
+        self._connect_lock = threading.Lock()
+        self.voting: Optional[VotingService] = None
+        self.last_logins: Optional[LastLoginBuffer] = None
+        # None means ballot_journal.DEFAULT_JOURNAL_PATH
+        self.journal_path = journal_path
+        self.journal: Optional[BallotJournal] = None
+        self.replayer: Optional[JournalReplayer] = None
+        self.executor = QueryExecutor(max_workers=pool_size)
+        self.ui_root = None
     
-    def connect(self) -> bool:
-        """Establish database connection"""
-        try:
-            self.connection = mysql.connector.connect(
+    def _open_pool(self):
+        """Create the connection pool and verify that the database is reachable; raises Error"""
+        # First use of the database modules, and so of mysql.connector
+        from ballot import ballot_cache
+        from ballot_client import BallotClient
+        from ballot_journal import DEFAULT_JOURNAL_PATH, BallotJournal, JournalReplayer
+        from db_pool import ConnectionPool
+        from last_login import LastLoginBuffer
+        from voting_service import VotingService
+
+        with self._connect_lock:
+            if self.voting:
+                return
+            if self.server:
+                client = BallotClient(self.server, timeout=self.acquire_timeout)
+                client.health()
+                # Same login/load_ballot/submit calls as VotingService
+                self.client = self.voting = client
+                return
+            pool = ConnectionPool(
+                pool_size=self.pool_size,
+                acquire_timeout=self.acquire_timeout,
                 host=self.host,
                 database=self.database,
                 user=self.user,
-                password=self.password
+                password=self.password,
+                connection_timeout=self.connect_timeout
             )
+            pool.release(pool.acquire())
+            self.last_logins = LastLoginBuffer(pool, "students")
+            self.last_logins.start()
+            self.voting = VotingService(pool, ballot_cache, self.last_logins)
+            self.pool = pool
+
+            try:
+                self.journal = BallotJournal(self.journal_path or DEFAULT_JOURNAL_PATH)
+                self.replayer = JournalReplayer(self.journal, self.pool.connection)
+                self.replayer.start()
+            except sqlite3.Error as e:
+                self.journal = None
+                self._show_error("Ballot Journal", f"Could not open the local ballot journal ({e}); "
+                                                   "ballots will be sent straight to the server.")
+
+    def connect(self) -> bool:
+        """Create the connection pool and verify that the database is reachable"""
+        from mysql.connector import Error
+
+        try:
+            self._open_pool()
             return True
         except Error as e:
-            messagebox.showerror("Database Error", f"Failed to connect to database: {e}")
+            self._show_error("Database Error", f"Failed to connect to database: {e}")
             return False
+
+    def connect_async(self, widget, on_ready, on_failed):
+        """Connect on a worker thread so the window can paint first; callbacks run on the Tk thread"""
+        self.executor.submit(widget, self._open_pool, on_success=lambda _: on_ready(), on_error=on_failed,
+                             name="DatabaseManager.connect")
     
     def disconnect(self):
-        """Close database connection"""
-        if self.connection and self.connection.is_connected():
-            self.connection.close()
+        """Stop background queries and close all pooled database connections"""
+        self.executor.shutdown()
+        if self.replayer:
+            self.replayer.stop()
+        if self.journal:
+            from ballot_journal import STATUS_PENDING
+
+            pending = self.journal.counts()[STATUS_PENDING]
+            if pending:
+                print(f"{pending} ballot(s) are still in the local journal; run 'python ballot_journal.py replay'")
+            self.journal.close()
+        if self.last_logins:
+            self.last_logins.stop()
+        if self.client:
+            self.client.close()
+        if self.pool:
+            self.pool.close_all()
+    
+    def _show_error(self, title: str, message: str):
+        """Show an error dialog on the Tk thread, even when called from a worker"""
+        if self.ui_root is None or threading.current_thread() is threading.main_thread():
+            messagebox.showerror(title, message)
+        else:
+            self.ui_root.after(0, lambda: messagebox.showerror(title, message))
+    
+    def pool_stats(self) -> Dict[str, Any]:
+        """Return connection pool usage and wait metrics"""
+        if not self.pool:
+            return {}
+        return {**self.pool.size(), **self.pool.stats.snapshot()}
+    
+    def statement_cache_stats(self) -> Dict[str, Any]:
+        """Return prepared-statement cache hits and misses"""
+        from statement_cache import statement_stats
+
+        return statement_stats.snapshot()
     
     def execute_query(self, query: str, params: tuple = None) -> Optional[List[tuple]]:
         """Execute SELECT query and return results"""
+        from mysql.connector import Error
+        from statement_cache import statement
+
         try:
-            if not self.connection or not self.connection.is_connected():
-                if not self.connect():
-                    return None
+            if not self.pool and not self.connect():
+                return None
             
-            cursor = self.connection.cursor()
-            cursor.execute(query, params or ())
-            result = cursor.fetchall()
-            cursor.close()
+            with self.pool.connection() as connection:
+                with statement(connection, query, params) as cursor:
+                    result = cursor.fetchall()
             return result
         except Error as e:
-            messagebox.showerror("Database Error", f"Query execution failed: {e}")
+            self._show_error("Database Error", f"Query execution failed: {e}")
             return None
     
     def execute_update(self, query: str, params: tuple = None) -> bool:
         """Execute INSERT, UPDATE, DELETE queries"""
+        from mysql.connector import Error
+        from statement_cache import statement
+
         try:
-            if not self.connection or not self.connection.is_connected():
-                if not self.connect():
-                    return False
+            if not self.pool and not self.connect():
+                return False
             
-            cursor = self.connection.cursor()
-            cursor.execute(query, params or ())
-            self.connection.commit()
-            cursor.close()
+            with self.pool.connection() as connection:
+                with statement(connection, query, params):
+                    connection.commit()
             return True
         except Error as e:
-            self.connection.rollback()
-            messagebox.showerror("Database Error", f"Update execution failed: {e}")
+            self._show_error("Database Error", f"Update execution failed: {e}")
+            return False
+    
+    def submit_ballot(self, db_student_id: int, student_id_str: str, selections: Dict[int, int],
+                      ip_address: Optional[str] = None) -> bool:
+        """Record a ballot in the local journal, or commit it directly when there is no journal.
+
+        The journal write is fsync'd before this returns; the replayer then
+        commits the votes and the has_voted flag in a single transaction, so
+        the booth keeps working at local-disk speed through a server outage.
+        """
+        from mysql.connector import Error
+        from ballot import BallotAlreadyCast
+        from election_settings import VotingClosed
+
+        try:
+            if not self.voting and not self.connect():
+                return False
+            
+            if self.journal is None:
+                self.voting.submit(db_student_id, student_id_str, selections, ip_address)
+                return True
+            self.voting.ensure_voting_open()
+            self.journal.append(db_student_id, student_id_str, selections, ip_address)
+            self.replayer.wake()
+            return True
+        except BallotAlreadyCast:
+            self._show_error("Already Voted", "You have already cast your vote. You cannot vote again.")
+            return False
+        except VotingClosed as e:
+            self._show_error("Voting Closed", e.msg)
+            return False
+        except Error as e:
+            self._show_error("Database Error", f"Vote submission failed: {e}")
+            return False
+        except sqlite3.Error as e:
+            self._show_error("Ballot Journal", f"Could not record the ballot locally: {e}")
             return False
+    
+    def login_student(self, student_id: str, password: str) -> Optional[LoginResult]:
+        """Check student credentials; returns None if the database could not be reached"""
+        from mysql.connector import Error
+
+        try:
+            if not self.voting and not self.connect():
+                return None
+            return self.voting.login(student_id, password)
+        except Error as e:
+            self._show_error("Database Error", f"Query execution failed: {e}")
+            return None
+    
+    def get_ballot(self) -> Optional[Ballot]:
+        """Return the active ballot from the shared cache, loading it if stale"""
+        from ballot import ballot_cache
+
+        if self.client:
+            return self.client.load_ballot()
+        return ballot_cache.get(self.execute_query)
+
+    def cached_ballot(self) -> Optional[Ballot]:
+        """Return the last ballot loaded, without revalidating it"""
+        from ballot import ballot_cache
+
+        return self.client.peek() if self.client else ballot_cache.peek()
+
+    def prefetch(self) -> Optional[Ballot]:
+        """Revalidate the cached ballot and settings; errors propagate instead of showing a dialog"""
+        if not self.voting:
+            return None
+        if not self.client:
+            # In client mode the service keeps the settings fresh
+            self.voting.settings()
+        return self.voting.load_ballot()
+    
+    def ballot_commit_stats(self) -> Dict[str, Any]:
+        """Return ballot commit latency figures"""
+        from ballot import commit_latency
+
+        return commit_latency.snapshot()
+
+    def journal_stats(self) -> Dict[str, Any]:
+        """Return journal counts and replay progress"""
+        if not self.journal:
+            return {}
+        return {**self.journal.counts(), "replayed": self.replayer.replayed,
+                "replay_failures": self.replayer.failures, "last_error": self.replayer.last_error}
+
 
 class StudentLoginPage(ctk.CTkFrame):
     """Login page UI for students."""
     
-    def __init__(self, parent, db_manager: DatabaseManager, on_login_success):
+    def __init__(self, parent, db_manager: DatabaseManager, on_login_success, confirm_login: bool = True):
         super().__init__(parent)
         self.db_manager = db_manager
         self.on_login_success = on_login_success
+        self.confirm_login = confirm_login
         self.setup_ui()
 
     def setup_ui(self):
@@ -106,16 +321,37 @@ class StudentLoginPage(ctk.CTkFrame):
                                           show="*", width=300)
         self.password_entry.grid(row=3, column=0, padx=20, pady=10)
         
-        login_button = ctk.CTkButton(login_frame, text="Login", command=self.login, width=300)
-        login_button.grid(row=4, column=0, padx=20, pady=(20, 10))
+        self.login_button = ctk.CTkButton(login_frame, text="Login", command=self.login, width=300)
+        self.login_button.grid(row=4, column=0, padx=20, pady=(20, 10))
+
+        self.status_label = ctk.CTkLabel(login_frame, text="", font=ctk.CTkFont(size=11), text_color="gray")
+        self.status_label.grid(row=5, column=0, padx=20, pady=(0, 10))
         
         self.student_id_entry.bind("<Return>", lambda e: self.login())
         self.password_entry.bind("<Return>", lambda e: self.login())
         
         self.student_id_entry.focus()
 
+    def set_connecting(self, connecting: bool, text: str = "Connecting to database..."):
+        """Hold logins until the database pool is ready."""
+        self.login_button.configure(state="disabled" if connecting else "normal")
+        self.status_label.configure(text=text if connecting else "")
+
+    def reset(self):
+        """Clear the form for the next voter (kiosk mode)."""
+        self.student_id_entry.delete(0, "end")
+        self.password_entry.delete(0, "end")
+        self.login_button.configure(state="normal")
+        self.student_id_entry.focus()
+
+    def set_status(self, text: str):
+        self.status_label.configure(text=text)
+
     def login(self):
         """Handle student login attempt."""
+        if self.login_button.cget("state") == "disabled":
+            # Still connecting, or a login is already in flight
+            return
         student_id = self.student_id_entry.get().strip()
         password = self.password_entry.get().strip()
 
@@ -123,40 +359,56 @@ class StudentLoginPage(ctk.CTkFrame):
             messagebox.showerror("Error", "Please enter both Student ID and password.")
             return
 
-        try:
-            # Assuming 'password_hash' column now stores plain text
-            query = "SELECT id, password_hash, has_voted FROM students WHERE student_id = %s AND is_active = 1"
-            result = self.db_manager.execute_query(query, (student_id,))
-
-            if result:
-                db_id, stored_password, has_voted = result[0]
-                
-                # Plain text password check
-                if password == stored_password:
-                    if has_voted:
-                        messagebox.showinfo("Already Voted", "You have already cast your vote. You cannot vote again.")
-                    else:
-                        messagebox.showinfo("Success", "Login successful!")
-                        self.on_login_success(db_id, student_id)
-                else:
-                    messagebox.showerror("Error", "Incorrect password. Please try again.")
-                    self.password_entry.delete(0, "end")
+        def on_result(result: Optional[LoginResult]):
+            self.login_button.configure(state="normal")
+            if result is None:
+                # Error message is shown by db_manager
+                return
+            # Already loaded on the worker that produced the result
+            from voting_service import LOGIN_ALREADY_VOTED, LOGIN_BAD_PASSWORD, LOGIN_INACTIVE, LOGIN_VOTING_CLOSED
+
+            if result.ok:
+                if self.confirm_login:
+                    messagebox.showinfo("Success", "Login successful!")
+                self.on_login_success(result.db_student_id, student_id)
+            elif result.status == LOGIN_ALREADY_VOTED:
+                messagebox.showinfo("Already Voted", "You have already cast your vote. You cannot vote again.")
+            elif result.status == LOGIN_BAD_PASSWORD:
+                messagebox.showerror("Error", "Incorrect password. Please try again.")
+                self.password_entry.delete(0, "end")
+            elif result.status == LOGIN_INACTIVE:
+                messagebox.showerror("Error", "This student account is inactive. Please contact the election office.")
+            elif result.status == LOGIN_VOTING_CLOSED:
+                messagebox.showinfo("Voting Closed", result.message)
             else:
                 messagebox.showerror("Error", "Student ID not found or inactive. Please try again.")
-        except Exception as e:
+
+        def on_error(e: Exception):
+            self.login_button.configure(state="normal")
             messagebox.showerror("Login Error", f"An unexpected error occurred: {e}")
 
+        self.login_button.configure(state="disabled")
+        self.db_manager.executor.submit(self, self.db_manager.login_student, student_id, password,
+                                        on_success=on_result, on_error=on_error,
+                                        key=(id(self), "login"), name="StudentLoginPage.login")
+
 
 class VotingPage(ctk.CTkFrame):
     """Voting page UI."""
     
-    def __init__(self, parent, db_manager: DatabaseManager, db_student_id: int, student_id_str: str, on_logout):
+    def __init__(self, parent, db_manager: DatabaseManager, db_student_id: Optional[int], student_id_str: Optional[str],
+                 on_logout, on_ready=None):
         super().__init__(parent)
         self.db_manager = db_manager
         self.db_student_id = db_student_id
         self.student_id_str = student_id_str
         self.on_logout = on_logout
+        self.on_ready = on_ready
         self.votes_to_cast = {} # {position_id: candidate_id}
+        self.vote_vars: List[ctk.StringVar] = []
+        self.ballot: Optional[Ballot] = None
+        self.ballot_ready = False
+        self.submit_button = None
         
         self.setup_ui()
 
@@ -179,38 +431,81 @@ class VotingPage(ctk.CTkFrame):
         scrollable_frame = ctk.CTkScrollableFrame(self, label_text="Select one candidate for each position")
         scrollable_frame.grid(row=1, column=0, padx=20, pady=(0, 20), sticky="nsew")
         scrollable_frame.grid_columnconfigure(0, weight=1)
+        self.scrollable_frame = scrollable_frame
 
-        try:
-            positions_query = "SELECT id, position_name FROM positions WHERE is_active = 1 ORDER BY display_order"
-            positions = self.db_manager.execute_query(positions_query)
+        loading_label = ctk.CTkLabel(scrollable_frame, text="Loading ballot...", font=ctk.CTkFont(size=16))
+        loading_label.pack(pady=50)
+
+        def on_loaded(ballot: Optional[Ballot]):
+            loading_label.destroy()
+            self.build_ballot(ballot)
+
+        def on_error(e: Exception):
+            loading_label.configure(text=f"Error loading ballot: {e}")
 
-            if not positions:
+        # The ballot comes from the database on a worker thread; widgets are built once it arrives
+        self.db_manager.executor.submit(self, self.db_manager.get_ballot, on_success=on_loaded,
+                                        on_error=on_error, name="VotingPage.load_ballot")
+
+    def shows(self, ballot: Ballot) -> bool:
+        """True if the page is already built from this ballot"""
+        if ballot is self.ballot:
+            return True
+        # Without a version only the same cached object is known to be unchanged
+        return ballot.version is not None and self.ballot is not None and ballot.version == self.ballot.version
+
+    def build_ballot(self, ballot: Optional[Ballot]):
+        """Create one radio group per position on the loaded ballot."""
+        scrollable_frame = self.scrollable_frame
+        for child in scrollable_frame.winfo_children():
+            child.destroy()
+        self.votes_to_cast = {}
+        self.vote_vars = []
+        self.ballot = ballot
+        try:
+            if not ballot or not ballot.positions:
+                if self.submit_button is not None:
+                    self.submit_button.grid_remove()
                 ctk.CTkLabel(scrollable_frame, text="No voting positions are currently available.", font=ctk.CTkFont(size=16)).pack(pady=50)
                 return
 
-            for pos_id, pos_name in positions:
+            for position in ballot.positions:
+                pos_id = position.position_id
                 pos_frame = ctk.CTkFrame(scrollable_frame)
                 pos_frame.pack(fill="x", padx=10, pady=10)
-                ctk.CTkLabel(pos_frame, text=pos_name, font=ctk.CTkFont(size=16, weight="bold")).pack(anchor="w", padx=20, pady=(5,0))
-                
-                candidates_query = "SELECT id, candidate_name FROM candidates WHERE position_id = %s AND is_active = 1"
-                candidates = self.db_manager.execute_query(candidates_query, (pos_id,))
+                ctk.CTkLabel(pos_frame, text=position.position_name, font=ctk.CTkFont(size=16, weight="bold")).pack(anchor="w", padx=20, pady=(5,0))
                 
-                if candidates:
+                if position.candidates:
                     vote_var = ctk.StringVar()
-                    for cand_id, cand_name in candidates:
+                    self.vote_vars.append(vote_var)
+                    for cand_id, cand_name in position.candidates:
                         rb = ctk.CTkRadioButton(pos_frame, text=cand_name, variable=vote_var, value=str(cand_id),
                                                 command=lambda p=pos_id, c=cand_id: self.select_candidate(p, c))
                         rb.pack(anchor="w", padx=40, pady=5)
                 else:
                     ctk.CTkLabel(pos_frame, text="No candidates for this position.").pack(anchor="w", padx=40, pady=5)
 
-            self.submit_button = ctk.CTkButton(self, text="Submit All Votes", command=self.submit_votes, height=40)
+            if self.submit_button is None:
+                self.submit_button = ctk.CTkButton(self, text="Submit All Votes", command=self.submit_votes, height=40)
             self.submit_button.grid(row=2, column=0, padx=20, pady=20)
+            self.ballot_ready = True
+            if self.on_ready:
+                self.on_ready()
 
         except Exception as e:
             ctk.CTkLabel(scrollable_frame, text=f"Error loading ballot: {e}", font=ctk.CTkFont(size=16)).pack(pady=50)
 
+    def reset(self, db_student_id: int, student_id_str: str):
+        """Hand the already-built ballot to the next voter (kiosk mode)."""
+        self.db_student_id = db_student_id
+        self.student_id_str = student_id_str
+        self.votes_to_cast = {}
+        for vote_var in self.vote_vars:
+            vote_var.set("")
+        if self.submit_button is not None:
+            self.submit_button.configure(state="normal")
+        self.scrollable_frame._parent_canvas.yview_moveto(0)
+
     def select_candidate(self, position_id, candidate_id):
         """Store the selected candidate for a given position."""
         self.votes_to_cast[position_id] = candidate_id
@@ -224,46 +519,55 @@ class VotingPage(ctk.CTkFrame):
         if not messagebox.askyesno("Confirm Vote", f"You are about to cast {len(self.votes_to_cast)} vote(s). This action cannot be undone. Proceed?"):
             return
 
-        try:
-            # Insert all votes
-            vote_query = "INSERT INTO votes (student_id, position_id, candidate_id, vote_timestamp, ip_address) VALUES (%s, %s, %s, %s, %s)"
-            timestamp = datetime.now()
-            ip_address = "127.0.0.1" # Placeholder IP
-
-            for pos_id, cand_id in self.votes_to_cast.items():
-                # FIX: Use self.student_id_str instead of self.db_student_id
-                params = (self.student_id_str, pos_id, cand_id, timestamp, ip_address)
-                if not self.db_manager.execute_update(vote_query, params):
-                    # Error message is shown by db_manager, so we just stop
-                    return
-
-            # Mark the student as having voted
-            # Note: We use the primary key (db_student_id) for the UPDATE, which is correct and efficient.
-            update_student_query = "UPDATE students SET has_voted = 1 WHERE id = %s"
-            if not self.db_manager.execute_update(update_student_query, (self.db_student_id,)):
+        def on_submitted(ok: bool):
+            if not ok:
+                # Error message is shown by db_manager, so we just stop
+                self.submit_button.configure(state="normal")
                 return
 
             messagebox.showinfo("Success", "Thank you for your vote! Your votes have been recorded.")
             self.on_logout() # Log out automatically after voting
 
-        except Exception as e:
+        def on_error(e: Exception):
+            self.submit_button.configure(state="normal")
             messagebox.showerror("Error", f"An error occurred while submitting your votes: {e}")
 
+        ip_address = "127.0.0.1" # Placeholder IP
+        # All votes and the has_voted flag commit together, so a failure
+        # part-way through never leaves a partial ballot behind.
+        self.submit_button.configure(state="disabled")
+        self.db_manager.executor.submit(self, self.db_manager.submit_ballot, self.db_student_id,
+                                        self.student_id_str, dict(self.votes_to_cast), ip_address,
+                                        on_success=on_submitted, on_error=on_error,
+                                        name="VotingPage.submit_votes")
+
 
 class StudentApp(ctk.CTk):
-    """Main application window for the student portal."""
+    """Main application window for the student portal.
+
+    In kiosk mode the login and voting pages are built once and reset
+    between voters, and the ballot is revalidated in the background while
+    the login page is up, so the ballot appears as soon as a login succeeds.
+    With ``server`` set, the booth votes through ballot_server instead of
+    connecting to MySQL.
+    """
     
-    def __init__(self):
+    def __init__(self, kiosk: bool = False, server: Optional[str] = None):
         super().__init__()
+        self.kiosk = kiosk
+        self.time_to_ballot = RequestTimings()
+        self._login_at: Optional[float] = None
+        self._prefetch_job = None
+        self.voting_page: Optional[VotingPage] = None
         
         self.title("Student Voting Portal")
         self.geometry("800x600")
         self.minsize(600, 500)
         
-        self.db_manager = DatabaseManager()
-        if not self.db_manager.connect():
-            self.after(100, self.destroy) # Schedule destroy to allow messagebox to show
-            return
+        # The pool is opened in the background once the window is up
+        self.db_manager = DatabaseManager(server=server)
+        self.db_manager.ui_root = self
+        self.db_ready = False
 
         self.current_db_student_id = None
         self.current_student_id_str = None
@@ -271,31 +575,113 @@ class StudentApp(ctk.CTk):
         self.grid_columnconfigure(0, weight=1)
         self.grid_rowconfigure(0, weight=1)
         
+        if self.kiosk:
+            self.login_page = StudentLoginPage(self, self.db_manager, self.on_login_success, confirm_login=False)
+
         self.show_login_page()
         self.protocol("WM_DELETE_WINDOW", self.on_closing)
+        self.after(0, self.on_first_paint)
+        self.connect_database()
+
+    def on_first_paint(self):
+        self.update_idletasks()
+        startup_timer.mark("first paint")
+
+    def connect_database(self):
+        """Open the connection pool on a worker thread, offering a retry if it fails."""
+        def on_ready():
+            self.db_ready = True
+            startup_timer.mark("db ready")
+            self.login_page.set_connecting(False)
+            if self.kiosk:
+                # Built hidden now; its ballot loads while the first voter logs in
+                self.voting_page = VotingPage(self, self.db_manager, None, None, self.logout,
+                                              on_ready=self.on_ballot_ready)
+                self._prefetch_job = self.after(KIOSK_PREFETCH_MS, self.prefetch_ballot)
+
+        def on_failed(e: Exception):
+            self.login_page.set_connecting(True, "Database unavailable")
+            if messagebox.askretrycancel("Database Error", f"Failed to connect to database: {e}"):
+                self.login_page.set_connecting(True)
+                self.connect_database()
+            else:
+                self.on_closing()
+
+        self.db_manager.connect_async(self, on_ready, on_failed)
 
     def show_login_page(self):
         """Display the login page."""
+        if self.kiosk:
+            if self.voting_page is not None:
+                self.voting_page.grid_remove()
+            self.login_page.reset()
+            self.login_page.grid(row=0, column=0, sticky="nsew")
+            self.login_page.set_connecting(not self.db_ready)
+            return
+
         for widget in self.winfo_children():
             widget.destroy()
         
         self.login_page = StudentLoginPage(self, self.db_manager, self.on_login_success)
         self.login_page.grid(row=0, column=0, sticky="nsew")
+        self.login_page.set_connecting(not self.db_ready)
 
     def on_login_success(self, db_student_id: int, student_id_str: str):
         """Handle successful login."""
         self.current_db_student_id = db_student_id
         self.current_student_id_str = student_id_str
+        self._login_at = time.perf_counter()
         self.show_voting_page()
 
     def show_voting_page(self):
         """Display the main voting page."""
+        if self.kiosk:
+            latest = self.db_manager.cached_ballot()
+            if latest is not None and not self.voting_page.shows(latest):
+                self.voting_page.build_ballot(latest)
+            self.voting_page.reset(self.current_db_student_id, self.current_student_id_str)
+            self.login_page.grid_remove()
+            self.voting_page.grid(row=0, column=0, sticky="nsew")
+            if self.voting_page.ballot_ready:
+                self.on_ballot_ready()
+            return
+
         for widget in self.winfo_children():
             widget.destroy()
             
-        self.voting_page = VotingPage(self, self.db_manager, self.current_db_student_id, self.current_student_id_str, self.logout)
+        self.voting_page = VotingPage(self, self.db_manager, self.current_db_student_id, self.current_student_id_str, self.logout,
+                                      on_ready=self.on_ballot_ready)
         self.voting_page.grid(row=0, column=0, sticky="nsew")
 
+    def on_ballot_ready(self):
+        """Record the time from a successful login to a drawn ballot."""
+        if self._login_at is None:
+            return
+        self.update_idletasks()
+        elapsed = time.perf_counter() - self._login_at
+        self._login_at = None
+        self.time_to_ballot.record("time_to_ballot", elapsed)
+        if not self.kiosk:
+            return
+        stats = self.time_to_ballot.snapshot()["time_to_ballot"]
+        self.login_page.set_status(f"Time to ballot: {elapsed * 1000:.0f} ms "
+                                   f"(avg {stats['avg_ms']:.0f} ms over {stats['count']} voter(s))")
+
+    def prefetch_ballot(self):
+        """Revalidate the ballot in the background and rebuild the hidden voting page if it changed."""
+        def on_fetched(ballot: Optional[Ballot]):
+            # Never rebuild under a voter; show_voting_page picks up the change instead
+            if ballot is not None and not self.voting_page.shows(ballot) \
+                    and not self.voting_page.winfo_ismapped():
+                self.voting_page.build_ballot(ballot)
+            self._prefetch_job = self.after(KIOSK_PREFETCH_MS, self.prefetch_ballot)
+
+        def on_error(e: Exception):
+            self._prefetch_job = self.after(KIOSK_PREFETCH_MS, self.prefetch_ballot)
+
+        self.db_manager.executor.submit(self, self.db_manager.prefetch, on_success=on_fetched, on_error=on_error,
+                                        key=(id(self), "prefetch"), name="StudentApp.prefetch_ballot")
+
     def logout(self):
         """Handle logout."""
         self.current_db_student_id = None
@@ -304,10 +690,21 @@ class StudentApp(ctk.CTk):
 
     def on_closing(self):
         """Handle application closing."""
+        if self._prefetch_job is not None:
+            self.after_cancel(self._prefetch_job)
+        stats = self.time_to_ballot.snapshot().get("time_to_ballot")
+        if stats:
+            print(f"Time to ballot: {stats['count']} voter(s), avg {stats['avg_ms']:.1f} ms, max {stats['max_ms']:.1f} ms")
         self.db_manager.disconnect()
         self.destroy()
 
 
 if __name__ == "__main__":
-    app = StudentApp()
+    parser = argparse.ArgumentParser(description="Student voting portal")
+    parser.add_argument("--kiosk", action="store_true",
+                        help="keep the ballot built between voters and prefetch changes in the background")
+    parser.add_argument("--server", metavar="URL",
+                        help="vote through a ballot_server at URL instead of connecting to MySQL")
+    args = parser.parse_args()
+    app = StudentApp(kiosk=args.kiosk, server=args.server)
     app.mainloop()
\ No newline at end of file
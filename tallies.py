@@ -0,0 +1,121 @@
+"""Maintenance for the vote_tallies table.
+
+vote_tallies holds one running count per (position, candidate) and is kept
+in step with votes by ballot.commit_ballot and the admin delete paths. Run
+this module to check it against votes or to rebuild it:
+
+    python tallies.py verify
+    python tallies.py rebuild
+"""
+
+import argparse
+import sys
+from typing import List, Tuple
+
+import mysql.connector
+from mysql.connector import Error
+
+
+TALLY_INCREMENT_QUERY = """INSERT INTO vote_tallies (position_id, candidate_id, vote_count)
+VALUES (%s, %s, 1) ON DUPLICATE KEY UPDATE vote_count = vote_count + 1"""
+
+# Decrement the tallies for votes that are about to be deleted; run these in
+# the same transaction as the matching DELETE.
+TALLY_DECREMENT_VOTE_QUERY = """UPDATE vote_tallies t
+JOIN votes v ON v.position_id = t.position_id AND v.candidate_id = t.candidate_id
+SET t.vote_count = t.vote_count - 1
+WHERE v.id = %s"""
+TALLY_DECREMENT_STUDENT_QUERY = """UPDATE vote_tallies t
+JOIN votes v ON v.position_id = t.position_id AND v.candidate_id = t.candidate_id
+JOIN students s ON s.student_id = v.student_id
+SET t.vote_count = t.vote_count - 1
+WHERE s.id = %s"""
+
+TALLY_DRIFT_QUERY = """
+SELECT a.position_id, a.candidate_id, a.actual, COALESCE(t.vote_count, 0)
+FROM (SELECT position_id, candidate_id, COUNT(*) AS actual
+      FROM votes GROUP BY position_id, candidate_id) a
+LEFT JOIN vote_tallies t ON t.position_id = a.position_id AND t.candidate_id = a.candidate_id
+WHERE t.vote_count IS NULL OR t.vote_count <> a.actual
+UNION ALL
+SELECT t.position_id, t.candidate_id, 0, t.vote_count
+FROM vote_tallies t
+WHERE t.vote_count <> 0
+  AND NOT EXISTS (SELECT 1 FROM votes v
+                  WHERE v.position_id = t.position_id AND v.candidate_id = t.candidate_id)
+ORDER BY 1, 2
+"""
+TALLY_REBUILD_QUERIES = (
+    "DELETE FROM vote_tallies",
+    """INSERT INTO vote_tallies (position_id, candidate_id, vote_count)
+    SELECT position_id, candidate_id, COUNT(*) FROM votes GROUP BY position_id, candidate_id""",
+)
+
+
+def find_drift(connection) -> List[Tuple[int, int, int, int]]:
+    """Return (position_id, candidate_id, actual, tallied) for every mismatch"""
+    cursor = connection.cursor()
+    try:
+        cursor.execute(TALLY_DRIFT_QUERY)
+        return [(int(p), int(c), int(actual), int(tallied)) for p, c, actual, tallied in cursor.fetchall()]
+    finally:
+        cursor.close()
+
+
+def rebuild_tallies(connection) -> List[Tuple[int, int, int, int]]:
+    """Recompute vote_tallies from votes in one transaction; returns the drift that was fixed"""
+    connection.start_transaction()
+    cursor = connection.cursor()
+    try:
+        # Lock the votes being counted so no ballot commits between the
+        # drift check and the rebuild.
+        cursor.execute("SELECT COUNT(*) FROM votes FOR UPDATE")
+        cursor.fetchall()
+        drift = find_drift(connection)
+        for query in TALLY_REBUILD_QUERIES:
+            cursor.execute(query)
+        connection.commit()
+        return drift
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        cursor.close()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Verify or rebuild the vote_tallies table")
+    parser.add_argument("command", choices=["verify", "rebuild"])
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--database", default="mca_voting_system")
+    parser.add_argument("--user", default="root")
+    parser.add_argument("--password", default="")
+    args = parser.parse_args(argv)
+
+    try:
+        connection = mysql.connector.connect(host=args.host, database=args.database,
+                                             user=args.user, password=args.password)
+    except Error as e:
+        print(f"Failed to connect to database: {e}", file=sys.stderr)
+        return 2
+
+    try:
+        if args.command == "verify":
+            drift = find_drift(connection)
+        else:
+            drift = rebuild_tallies(connection)
+    finally:
+        connection.close()
+
+    for position_id, candidate_id, actual, tallied in drift:
+        print(f"position {position_id} candidate {candidate_id}: votes={actual} tally={tallied} "
+              f"drift={tallied - actual:+d}")
+    if args.command == "verify":
+        print(f"{len(drift)} tally row(s) out of step with votes")
+        return 1 if drift else 0
+    print(f"Rebuilt vote_tallies; corrected {len(drift)} row(s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
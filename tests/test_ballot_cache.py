@@ -0,0 +1,53 @@
+"""BallotCache revalidation, with and without a ballot_version row."""
+
+import pytest
+
+pytest.importorskip("mysql.connector")
+
+from ballot import BALLOT_QUERY, BALLOT_VERSION_QUERY, BallotCache
+
+
+class FakeSettings:
+    """Answers the two ballot queries and logs which ran"""
+
+    def __init__(self, version):
+        self.version = version
+        self.queries = []
+
+    def fetch(self, query, params=None):
+        self.queries.append(query)
+        if query == BALLOT_VERSION_QUERY:
+            return [] if self.version is None else [(self.version,)]
+        assert query == BALLOT_QUERY
+        return [(self.version, 1, "President", 10, "Alice"), (self.version, 1, "President", 11, "Bob")]
+
+
+def test_unchanged_version_keeps_the_cached_ballot():
+    settings = FakeSettings("3")
+    cache = BallotCache(check_interval=0)
+    first = cache.get(settings.fetch)
+    assert cache.get(settings.fetch) is first
+    assert settings.queries == [BALLOT_QUERY, BALLOT_VERSION_QUERY]
+
+    settings.version = "4"
+    assert cache.get(settings.fetch).version == "4"
+    assert cache.misses == 2
+
+
+def test_ballot_without_version_is_reloaded_once_stale():
+    settings = FakeSettings(None)
+    cache = BallotCache(check_interval=0)
+    first = cache.get(settings.fetch)
+    second = cache.get(settings.fetch)
+    assert first.version is None
+    assert second is not first
+    # Nothing to compare a version probe against, so it is skipped
+    assert settings.queries == [BALLOT_QUERY, BALLOT_QUERY]
+
+
+def test_ballot_without_version_is_served_within_interval():
+    settings = FakeSettings(None)
+    cache = BallotCache(check_interval=60)
+    first = cache.get(settings.fetch)
+    assert cache.get(settings.fetch) is first
+    assert settings.queries == [BALLOT_QUERY]
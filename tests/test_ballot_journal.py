@@ -0,0 +1,234 @@
+"""Journal append and replay against a stand-in MySQL connection.
+
+FakeDatabase understands just the statements commit_ballot and
+replay_entry send, and can be told to fail the Nth ballot with a given
+error.
+"""
+
+from contextlib import contextmanager
+
+import pytest
+
+mysql_connector = pytest.importorskip("mysql.connector")
+from mysql.connector import errors
+
+from ballot import BallotAlreadyCast, MARK_VOTED_QUERY
+import ballot_journal
+from ballot_journal import (SERVER_VOTES_QUERY, STATUS_APPLIED, STATUS_PENDING, STATUS_REJECTED, BallotJournal,
+                            replay_entry, replay_pending)
+
+
+class FakeDatabase:
+    """Committed has_voted flags and votes, shared by every FakeConnection"""
+
+    def __init__(self):
+        self.voted = set()
+        self.votes = {}
+        self.fail_on_ballot = None
+        self.failure = None
+        self.ballots_seen = 0
+
+    def connection(self):
+        return FakeConnection(self)
+
+    @contextmanager
+    def connect(self):
+        yield self.connection()
+
+
+class FakeCursor:
+    def __init__(self, connection):
+        self.connection = connection
+        self.rowcount = -1
+        self._rows = []
+
+    def execute(self, sql, params=()):
+        self.connection.execute(self, sql, params)
+
+    def fetchall(self):
+        return self._rows
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    def __init__(self, db: FakeDatabase):
+        self.db = db
+        self._voted = set()
+        self._votes = {}
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def start_transaction(self):
+        self._voted, self._votes = set(), {}
+
+    def commit(self):
+        self.db.voted |= self._voted
+        for student_id, selections in self._votes.items():
+            self.db.votes.setdefault(student_id, {}).update(selections)
+        self._voted, self._votes = set(), {}
+
+    def rollback(self):
+        self._voted, self._votes = set(), {}
+
+    def execute(self, cursor, sql, params):
+        if sql == MARK_VOTED_QUERY:
+            self.db.ballots_seen += 1
+            if self.db.ballots_seen == self.db.fail_on_ballot:
+                raise self.db.failure
+            db_id = params[0]
+            cursor.rowcount = 0 if db_id in self.db.voted or db_id in self._voted else 1
+            if cursor.rowcount:
+                self._voted.add(db_id)
+        elif sql.startswith("INSERT INTO votes"):
+            for i in range(0, len(params), 5):
+                student_id, pos_id, cand_id = params[i:i + 3]
+                self._votes.setdefault(student_id, {})[pos_id] = cand_id
+        elif sql == SERVER_VOTES_QUERY:
+            cursor._rows = list(self.db.votes.get(params[0], {}).items())
+        # Tally bumps need no bookkeeping here
+
+
+@pytest.fixture
+def journal(tmp_path):
+    journal = BallotJournal(str(tmp_path / "journal.db"))
+    yield journal
+    journal.close()
+
+
+def test_append_rejects_second_ballot_for_student(journal):
+    journal.append(1, "S001", {1: 10})
+    with pytest.raises(BallotAlreadyCast):
+        journal.append(1, "S001", {1: 11})
+    assert journal.counts()[STATUS_PENDING] == 1
+
+
+def test_replay_entry_applies_ballot(journal):
+    db = FakeDatabase()
+    journal.append(1, "S001", {1: 10, 2: 20})
+    entry, = journal.pending()
+    assert replay_entry(db.connection(), entry) == (STATUS_APPLIED, None)
+    assert db.voted == {1}
+    assert db.votes == {"S001": {1: 10, 2: 20}}
+
+
+def test_replay_entry_already_cast_with_same_votes_is_applied(journal):
+    db = FakeDatabase()
+    # An earlier replay committed, but the journal was not updated in time
+    db.voted.add(1)
+    db.votes["S001"] = {1: 10, 2: 20}
+    journal.append(1, "S001", {1: 10, 2: 20})
+    entry, = journal.pending()
+    assert replay_entry(db.connection(), entry) == (STATUS_APPLIED, None)
+
+
+def test_replay_entry_already_cast_with_other_votes_is_rejected(journal):
+    db = FakeDatabase()
+    # The student voted at another booth
+    db.voted.add(1)
+    db.votes["S001"] = {1: 11, 2: 20}
+    journal.append(1, "S001", {1: 10, 2: 20})
+    entry, = journal.pending()
+    status, error = replay_entry(db.connection(), entry)
+    assert status == STATUS_REJECTED
+    assert "different ballot" in error
+
+
+def test_replay_entry_reraises_client_errors(journal):
+    db = FakeDatabase()
+    db.fail_on_ballot = 1
+    db.failure = errors.OperationalError(msg="Lost connection to MySQL server during query", errno=2013)
+    journal.append(1, "S001", {1: 10})
+    entry, = journal.pending()
+    with pytest.raises(errors.OperationalError):
+        replay_entry(db.connection(), entry)
+
+
+@pytest.mark.parametrize("failure", [
+    # No errno at all; mysql.connector reports -1
+    errors.OperationalError("MySQL Connection not available"),
+    errors.Error("Connection dropped"),
+    errors.InterfaceError(msg="Broken pipe"),
+    errors.DatabaseError(msg="Lock wait timeout exceeded; try restarting transaction", errno=1205),
+    errors.InternalError(msg="Deadlock found when trying to get lock; try restarting transaction", errno=1213),
+], ids=["errno-less operational", "bare error", "interface", "lock wait timeout", "deadlock"])
+def test_replay_entry_reraises_retryable_errors(journal, failure):
+    db = FakeDatabase()
+    db.fail_on_ballot = 1
+    db.failure = failure
+    journal.append(1, "S001", {1: 10})
+    entry, = journal.pending()
+    with pytest.raises(type(failure)):
+        replay_entry(db.connection(), entry)
+
+
+def test_replay_pending_leaves_deadlocked_ballot_pending(journal):
+    db = FakeDatabase()
+    db.fail_on_ballot = 1
+    db.failure = errors.InternalError(msg="Deadlock found when trying to get lock", errno=1213)
+    journal.append(1, "S001", {1: 10})
+    with pytest.raises(errors.InternalError):
+        replay_pending(journal, db.connect)
+    assert journal.counts()[STATUS_PENDING] == 1
+
+
+def test_replay_entry_rejects_on_server_errors(journal):
+    db = FakeDatabase()
+    db.fail_on_ballot = 1
+    db.failure = errors.DatabaseError(msg="Cannot add or update a child row", errno=1452)
+    journal.append(1, "S001", {1: 10})
+    entry, = journal.pending()
+    status, error = replay_entry(db.connection(), entry)
+    assert status == STATUS_REJECTED
+    assert "child row" in error
+
+
+def test_replay_pending_keeps_outcomes_settled_before_a_connection_error(journal):
+    db = FakeDatabase()
+    db.fail_on_ballot = 2
+    db.failure = errors.OperationalError(msg="Lost connection to MySQL server during query", errno=2013)
+    for n in range(1, 4):
+        journal.append(n, f"S00{n}", {1: 10})
+
+    with pytest.raises(errors.OperationalError):
+        replay_pending(journal, db.connect)
+
+    assert journal.counts() == {STATUS_PENDING: 2, STATUS_APPLIED: 1, STATUS_REJECTED: 0}
+    assert [entry.db_student_id for entry in journal.pending()] == [2, 3]
+
+    # Once the server is back the rest goes through
+    db.fail_on_ballot = None
+    assert replay_pending(journal, db.connect) == 2
+    assert journal.counts() == {STATUS_PENDING: 0, STATUS_APPLIED: 3, STATUS_REJECTED: 0}
+
+
+def test_requeue_moves_rejected_ballots_back_to_pending(journal):
+    for n in range(1, 4):
+        journal.append(n, f"S00{n}", {1: 10})
+    first, second, third = journal.pending()
+    journal.mark({first.entry_id: (STATUS_REJECTED, "Student had already voted with a different ballot"),
+                  second.entry_id: (STATUS_REJECTED, "Cannot add or update a child row"),
+                  third.entry_id: (STATUS_APPLIED, None)})
+
+    assert [(entry.student_id, error) for entry, error in journal.rejected()] == [
+        ("S001", "Student had already voted with a different ballot"), ("S002", "Cannot add or update a child row")]
+    assert journal.requeue([second.entry_id, third.entry_id]) == 1
+    assert [entry.student_id for entry in journal.pending()] == ["S002"]
+    assert journal.requeue() == 1
+    assert journal.counts() == {STATUS_PENDING: 2, STATUS_APPLIED: 1, STATUS_REJECTED: 0}
+
+
+def test_cli_lists_and_requeues_rejected_ballots(tmp_path, capsys):
+    path = str(tmp_path / "journal.db")
+    journal = BallotJournal(path)
+    journal.append(1, "S001", {1: 10})
+    entry, = journal.pending()
+    journal.mark({entry.entry_id: (STATUS_REJECTED, "Student had already voted with a different ballot")})
+    journal.close()
+
+    assert ballot_journal.main(["rejected", "--journal", path]) == 0
+    assert "S001" in capsys.readouterr().out
+    assert ballot_journal.main(["requeue", str(entry.entry_id), "--journal", path]) == 0
+    assert "1 pending, 0 applied, 0 rejected" in capsys.readouterr().out
@@ -0,0 +1,88 @@
+"""Resending /submit: the client never repeats a POST, the server accepts a resend."""
+
+import asyncio
+import http.client
+
+import pytest
+
+pytest.importorskip("mysql.connector")
+
+import ballot_client
+from ballot_client import BallotClient, ServiceError
+from ballot_server import BallotServer, HTTPError, Session
+
+
+class FakeService:
+    def __init__(self):
+        self.submitted = []
+
+    def submit(self, db_student_id, student_id, selections, ip_address):
+        self.submitted.append((db_student_id, selections))
+        return 0.25
+
+
+def test_resent_submit_gets_the_original_reply():
+    service = FakeService()
+    server = BallotServer(service, workers=1, booth_key=None)
+    server.sessions["token"] = Session(7, "MCA/001", expires=float("inf"))
+    body = {"token": "token", "selections": {"1": 2}}
+
+    async def submit_twice():
+        return await server.submit(body, "10.0.0.5"), await server.submit(body, "10.0.0.5")
+
+    try:
+        first, second = asyncio.run(submit_twice())
+    finally:
+        server.executor.shutdown()
+    assert first == second == (200, {"ok": True, "commit_seconds": 0.25})
+    assert service.submitted == [(7, {1: 2})]
+
+
+def test_unknown_token_is_still_refused():
+    server = BallotServer(FakeService(), workers=1, booth_key=None)
+    try:
+        with pytest.raises(HTTPError) as raised:
+            asyncio.run(server.submit({"token": "nope", "selections": {}}, "10.0.0.5"))
+    finally:
+        server.executor.shutdown()
+    assert raised.value.status == 401
+
+
+class DroppingConnection:
+    """Every request fails as if the service closed an idle keep-alive socket"""
+
+    requests = []
+
+    def __init__(self, host, port, timeout=None):
+        pass
+
+    def request(self, method, path, body=None, headers=None):
+        self.requests.append((method, path))
+        raise http.client.RemoteDisconnected("Remote end closed connection without response")
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def client(monkeypatch):
+    DroppingConnection.requests = []
+    monkeypatch.setattr(ballot_client.http.client, "HTTPConnection", DroppingConnection)
+    client = BallotClient("http://booths:8080", booth_key=None)
+    # As if an earlier request had left a keep-alive connection open
+    client._local.connection = DroppingConnection("booths", 8080)
+    return client
+
+
+def test_get_is_retried_on_a_fresh_connection(client):
+    with pytest.raises(ServiceError):
+        client.health()
+    assert DroppingConnection.requests == [("GET", "/health"), ("GET", "/health")]
+
+
+def test_submit_is_not_repeated_and_keeps_the_token(client):
+    client._tokens[7] = "token"
+    with pytest.raises(ServiceError):
+        client.submit(7, "MCA/001", {1: 2})
+    assert DroppingConnection.requests == [("POST", "/submit")]
+    assert client._tokens[7] == "token"
@@ -0,0 +1,108 @@
+"""ConnectionPool checkout and hand-off, with connect() replaced by a stub."""
+
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("mysql.connector")
+from mysql.connector import errors
+
+import db_pool
+from db_pool import ConnectionPool, PoolTimeout
+
+
+class FakeConnection:
+    in_transaction = False
+
+    def __init__(self, number):
+        self.number = number
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    opened = []
+
+    def connect(**kwargs):
+        opened.append(FakeConnection(len(opened)))
+        return opened[-1]
+
+    monkeypatch.setattr(db_pool.mysql.connector, "connect", connect)
+    pool = ConnectionPool(pool_size=1, statement_cache_size=0)
+    pool.opened = opened
+    return pool
+
+
+def acquire_in_thread(pool, timeout):
+    result = {}
+
+    def run():
+        try:
+            result["conn"] = pool.acquire(timeout)
+        except Exception as e:
+            result["error"] = e
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    return thread, result
+
+
+def test_released_connection_goes_to_waiter(pool):
+    conn = pool.acquire()
+    thread, result = acquire_in_thread(pool, 5.0)
+    time.sleep(0.05)
+    pool.release(conn)
+    thread.join(1.0)
+    assert result["conn"] is conn
+    assert pool.stats.snapshot()["waits"] == 1
+
+
+def test_discard_wakes_waiter_to_open_a_new_connection(pool):
+    conn = pool.acquire()
+    thread, result = acquire_in_thread(pool, 5.0)
+    time.sleep(0.05)
+    started = time.monotonic()
+    pool.release(conn, discard=True)
+    thread.join(1.0)
+    assert not thread.is_alive()
+    assert time.monotonic() - started < 1.0
+    assert conn.closed
+    assert result["conn"] is pool.opened[1]
+    assert pool.size()["open"] == 1
+
+
+@pytest.mark.parametrize("failure, discarded", [
+    (errors.OperationalError(msg="Lost connection to MySQL server during query", errno=2013), True),
+    # mysql.connector gives errno -1 when there is no code
+    (errors.OperationalError("MySQL Connection not available"), True),
+    (errors.Error("Connection dropped"), True),
+    (errors.ProgrammingError(msg="You have an error in your SQL syntax", errno=1064), False),
+], ids=["CR_SERVER_LOST", "errno-less operational", "bare error", "server error"])
+def test_connection_discards_after_connection_errors(pool, failure, discarded):
+    with pytest.raises(type(failure)):
+        with pool.connection() as conn:
+            raise failure
+    assert conn.closed is discarded
+    assert pool.size()["idle"] == (0 if discarded else 1)
+    assert (pool.acquire() is conn) is not discarded
+
+
+def test_acquire_times_out_when_pool_is_full(pool):
+    pool.acquire()
+    with pytest.raises(PoolTimeout):
+        pool.acquire(0.05)
+    assert pool.stats.snapshot()["timeouts"] == 1
+
+
+def test_close_all_wakes_waiters(pool):
+    pool.acquire()
+    thread, result = acquire_in_thread(pool, 5.0)
+    time.sleep(0.05)
+    pool.close_all()
+    thread.join(1.0)
+    assert not thread.is_alive()
+    assert "closed" in str(result["error"])
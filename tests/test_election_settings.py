@@ -0,0 +1,45 @@
+"""ElectionSettings parsing and SettingsCache revalidation."""
+
+from datetime import datetime
+
+import pytest
+
+pytest.importorskip("mysql.connector")
+
+from election_settings import SETTINGS_QUERY, SETTINGS_VERSION_QUERY, ElectionSettings, SettingsCache
+
+
+def test_date_only_end_runs_to_end_of_day():
+    settings = ElectionSettings({"voting_start_date": "2025-08-20", "voting_end_date": "2025-08-20"})
+    assert settings.voting_start == datetime(2025, 8, 20)
+    assert settings.voting_status(datetime(2025, 8, 20, 17, 30)) == (True, "")
+    is_open, reason = settings.voting_status(datetime(2025, 8, 21, 0, 0))
+    assert not is_open
+    assert "20 Aug 2025" in reason
+
+
+def test_end_with_time_is_exact():
+    settings = ElectionSettings({"voting_end_date": "2025-08-20 17:00"})
+    assert settings.voting_status(datetime(2025, 8, 20, 16, 59))[0]
+    assert not settings.voting_status(datetime(2025, 8, 20, 17, 1))[0]
+
+
+def test_checksum_change_reloads_with_same_updated_at():
+    stamp = datetime(2025, 8, 20, 10, 0)
+    state = {"checksum": 1, "values": [("voting_enabled", "1")], "loads": 0}
+
+    def fetch(query, params=None):
+        if query == SETTINGS_VERSION_QUERY:
+            return [(stamp, 1, state["checksum"])]
+        assert query == SETTINGS_QUERY
+        state["loads"] += 1
+        return state["values"]
+
+    cache = SettingsCache(check_interval=0)
+    assert cache.get(fetch).voting_enabled
+    cache.get(fetch)
+    assert state["loads"] == 1
+
+    state["checksum"], state["values"] = 2, [("voting_enabled", "0")]
+    assert not cache.get(fetch).voting_enabled
+    assert state["loads"] == 2
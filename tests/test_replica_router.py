@@ -0,0 +1,173 @@
+"""ReplicaRouter routing decisions with stand-in pools.
+
+Lag measurements are injected straight into Replica, so no server or
+background thread is involved.
+"""
+
+import time
+from contextlib import contextmanager
+
+import pytest
+
+pytest.importorskip("mysql.connector")
+from mysql.connector import errors
+
+from replica_router import Replica, ReplicaRouter, replication_lag
+
+
+class FakePool:
+    """Hands out its own name as the connection, or raises ``failure``"""
+
+    def __init__(self, name):
+        self.name = name
+        self.failure = None
+        self.used = 0
+
+    @contextmanager
+    def connection(self, timeout=None):
+        if self.failure is not None:
+            raise self.failure
+        self.used += 1
+        yield self.name
+
+    def close_all(self):
+        pass
+
+
+def make_router(lag=0.0, age=0.0, max_lag=5.0):
+    primary = FakePool("primary")
+    replica = Replica("replica:3306", FakePool("replica"))
+    router = ReplicaRouter(primary, [replica], max_lag=max_lag)
+    measure(replica, lag, age)
+    return router, primary, replica
+
+
+def measure(replica, lag, age=0.0):
+    """Record a lag check taken ``age`` seconds ago, as ReplicaRouter.check would"""
+    measured = time.monotonic() - age
+    replica.healthy = lag is not None
+    replica.lag = lag
+    replica.checked_at = measured
+    if lag is not None:
+        replica.caught_up_to = measured - lag - 1.0
+
+
+def test_current_replica_serves_reads():
+    router, primary, replica = make_router(lag=0.0)
+    assert router.read_pool() is replica.pool
+    assert router.snapshot()["replicas"][0]["reads"] == 1
+
+
+def test_lag_above_max_falls_back_to_primary():
+    router, primary, replica = make_router(lag=6.0)
+    assert router.read_pool() is primary
+    assert router.fallbacks == 1
+
+
+def test_stale_measurement_counts_as_lag():
+    # Measured current, but the check is older than max_lag
+    router, primary, replica = make_router(lag=0.0, age=6.0)
+    assert router.read_pool() is primary
+
+
+def test_reads_stay_on_primary_until_replica_catches_up_with_write():
+    router, primary, replica = make_router(lag=0.0, age=0.0)
+    router.note_write()
+    assert router.read_pool() is primary
+
+    # A check taken after the write that still shows lag does not cover it
+    time.sleep(0.01)
+    measure(replica, lag=2.0)
+    assert router.read_pool() is primary
+
+    # Once the replica reflects the primary past the write, reads return to it
+    replica.caught_up_to = time.monotonic()
+    assert router.read_pool() is replica.pool
+
+
+def test_client_error_marks_replica_failed_and_reruns_on_primary():
+    router, primary, replica = make_router(lag=0.0)
+    replica.pool.failure = errors.InterfaceError(msg="Can't connect to MySQL server", errno=2003)
+
+    assert router.read(lambda connection: connection) == "primary"
+    assert not replica.healthy
+    assert replica.failures == 1
+    assert router.read_pool() is primary
+
+
+@pytest.mark.parametrize("failure", [
+    errors.OperationalError(msg="Lost connection to MySQL server during query", errno=2013),
+    # mysql.connector gives errno -1 when there is no code
+    errors.OperationalError("MySQL Connection not available"),
+], ids=["CR_SERVER_LOST", "errno-less"])
+def test_client_error_inside_the_read_also_reruns_on_primary(failure):
+    router, primary, replica = make_router(lag=0.0)
+
+    def query(connection):
+        if connection == "replica":
+            raise failure
+        return connection
+
+    assert router.read(query) == "primary"
+    assert not replica.healthy
+
+
+def test_server_error_is_raised_without_failover():
+    router, primary, replica = make_router(lag=0.0)
+
+    def query(connection):
+        raise errors.ProgrammingError(msg="You have an error in your SQL syntax", errno=1064)
+
+    with pytest.raises(errors.ProgrammingError):
+        router.read(query)
+    assert replica.healthy
+    assert primary.used == 0
+
+
+class StatusConnection:
+    """Answers SHOW REPLICA/SLAVE STATUS with canned rows"""
+
+    def __init__(self, replies):
+        self.replies = replies
+
+    def cursor(self, dictionary=False):
+        connection = self
+
+        class Cursor:
+            def execute(self, query):
+                reply = connection.replies[query]
+                if isinstance(reply, Exception):
+                    raise reply
+                self.rows = reply
+
+            def fetchall(self):
+                return self.rows
+
+            def close(self):
+                pass
+
+        return Cursor()
+
+
+def test_replication_lag_is_none_when_replication_stopped():
+    connection = StatusConnection({"SHOW REPLICA STATUS": [{"Seconds_Behind_Source": None}]})
+    assert replication_lag(connection) is None
+
+
+def test_replication_lag_falls_back_to_slave_status():
+    connection = StatusConnection({
+        "SHOW REPLICA STATUS": errors.ProgrammingError(msg="You have an error in your SQL syntax", errno=1064),
+        "SHOW SLAVE STATUS": [{"Seconds_Behind_Master": 3}, {"Seconds_Behind_Master": 7}],
+    })
+    assert replication_lag(connection) == 7.0
+
+
+def test_server_without_replication_counts_as_current():
+    connection = StatusConnection({"SHOW REPLICA STATUS": []})
+    assert replication_lag(connection) == 0.0
+
+
+def test_replication_lag_raises_errno_less_connection_errors():
+    connection = StatusConnection({"SHOW REPLICA STATUS": errors.OperationalError("MySQL Connection not available")})
+    with pytest.raises(errors.OperationalError):
+        replication_lag(connection)
@@ -0,0 +1,210 @@
+"""Streaming export of the vote log and per-candidate results for auditors.
+
+Rows are read through an unbuffered cursor with fetchmany() and written in
+chunks, so memory use does not depend on the size of the votes table. The
+output format follows the file extension: .csv, .jsonl, or .parquet (the
+last needs the optional pyarrow package).
+
+    python vote_export.py votes audit/votes.csv
+    python vote_export.py results audit/results.parquet
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from datetime import datetime, date
+from decimal import Decimal
+from typing import Callable, List, Optional
+
+import mysql.connector
+from mysql.connector import Error
+
+
+VOTE_LOG_COLUMNS = ["vote_id", "student_id", "position_id", "position_name",
+                    "candidate_id", "candidate_name", "vote_timestamp", "ip_address"]
+VOTE_LOG_QUERY = """
+SELECT v.id, v.student_id, v.position_id, p.position_name, v.candidate_id, c.candidate_name,
+       v.vote_timestamp, v.ip_address
+FROM votes v
+LEFT JOIN positions p ON v.position_id = p.id
+LEFT JOIN candidates c ON v.candidate_id = c.id
+ORDER BY v.id
+"""
+
+# Counted from votes rather than vote_tallies so the audit does not depend
+# on the incrementally maintained table.
+RESULTS_COLUMNS = ["position_id", "position_name", "candidate_id", "candidate_name", "votes"]
+RESULTS_QUERY = """
+SELECT p.id, p.position_name, c.id, c.candidate_name, COUNT(v.id)
+FROM positions p
+JOIN candidates c ON c.position_id = p.id
+LEFT JOIN votes v ON v.candidate_id = c.id AND v.position_id = p.id
+GROUP BY p.id, p.position_name, p.display_order, c.id, c.candidate_name
+ORDER BY p.display_order, p.id, COUNT(v.id) DESC, c.id
+"""
+
+EXPORTS = {
+    "votes": (VOTE_LOG_QUERY, VOTE_LOG_COLUMNS),
+    "results": (RESULTS_QUERY, RESULTS_COLUMNS),
+}
+FORMATS = (".csv", ".jsonl", ".parquet")
+
+
+def _plain(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat(sep=" ") if isinstance(value, datetime) else value.isoformat()
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    return value
+
+
+class CsvChunkWriter:
+    def __init__(self, path: str, columns: List[str]):
+        self._file = open(path, "w", newline="", encoding="utf-8")
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(columns)
+
+    def write(self, rows: List[tuple]):
+        self._writer.writerows([[_plain(v) for v in row] for row in rows])
+
+    def close(self):
+        self._file.close()
+
+
+class JsonLinesChunkWriter:
+    def __init__(self, path: str, columns: List[str]):
+        self._file = open(path, "w", encoding="utf-8")
+        self._columns = columns
+
+    def write(self, rows: List[tuple]):
+        self._file.writelines(
+            json.dumps(dict(zip(self._columns, (_plain(v) for v in row)))) + "\n" for row in rows)
+
+    def close(self):
+        self._file.close()
+
+
+class ParquetChunkWriter:
+    """Writes each chunk as one Parquet row group"""
+
+    def __init__(self, path: str, columns: List[str]):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise ValueError("Parquet export needs the pyarrow package (pip install pyarrow)")
+        self._pa = pyarrow
+        self._pq = pyarrow.parquet
+        self._path = path
+        self._columns = columns
+        self._writer = None
+        self._schema = None
+
+    def write(self, rows: List[tuple]):
+        data = {name: [_plain(row[i]) for row in rows] for i, name in enumerate(self._columns)}
+        if self._writer is None:
+            # Infer the schema from the first chunk; a column that is all
+            # NULL there (e.g. ip_address) is one of the text columns.
+            inferred = self._pa.table(data).schema
+            self._schema = self._pa.schema([
+                field.with_type(self._pa.string()) if self._pa.types.is_null(field.type) else field
+                for field in inferred
+            ])
+            self._writer = self._pq.ParquetWriter(self._path, self._schema)
+        self._writer.write_table(self._pa.table(data, schema=self._schema))
+
+    def close(self):
+        if self._writer is None:
+            # No rows at all; still leave a valid, empty file behind
+            table = self._pa.table({name: self._pa.array([], type=self._pa.string()) for name in self._columns})
+            self._pq.write_table(table, self._path)
+        else:
+            self._writer.close()
+
+
+def open_writer(path: str, columns: List[str]):
+    """Pick a chunk writer from the file extension"""
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".csv":
+        return CsvChunkWriter(path, columns)
+    if ext == ".jsonl":
+        return JsonLinesChunkWriter(path, columns)
+    if ext == ".parquet":
+        return ParquetChunkWriter(path, columns)
+    raise ValueError(f"Unsupported export format '{ext}'; use one of {', '.join(FORMATS)}")
+
+
+def export_query(connection, query: str, columns: List[str], path: str, chunk_size: int = 5000,
+                 on_progress: Optional[Callable[[int], None]] = None,
+                 should_stop: Optional[Callable[[], bool]] = None) -> int:
+    """Stream the result of ``query`` into ``path``; returns the number of rows written"""
+    writer = open_writer(path, columns)
+    # Unbuffered: rows stay on the server until fetchmany() asks for them
+    cursor = connection.cursor(buffered=False)
+    written = 0
+    try:
+        cursor.execute(query)
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            writer.write(rows)
+            written += len(rows)
+            if on_progress:
+                on_progress(written)
+            if should_stop and should_stop():
+                # The rest of the result must be drained before the
+                # connection can be reused
+                while cursor.fetchmany(chunk_size):
+                    pass
+                break
+    finally:
+        cursor.close()
+        writer.close()
+    return written
+
+
+def export(connection, kind: str, path: str, chunk_size: int = 5000,
+           on_progress: Optional[Callable[[int], None]] = None,
+           should_stop: Optional[Callable[[], bool]] = None) -> int:
+    """Export the 'votes' log or the per-candidate 'results' to ``path``"""
+    query, columns = EXPORTS[kind]
+    return export_query(connection, query, columns, path, chunk_size, on_progress, should_stop)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Export the vote log or results for auditing")
+    parser.add_argument("kind", choices=sorted(EXPORTS))
+    parser.add_argument("path", help="output file (.csv, .jsonl or .parquet)")
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--database", default="mca_voting_system")
+    parser.add_argument("--user", default="root")
+    parser.add_argument("--password", default="")
+    args = parser.parse_args(argv)
+
+    try:
+        connection = mysql.connector.connect(host=args.host, database=args.database,
+                                             user=args.user, password=args.password)
+    except Error as e:
+        print(f"Failed to connect to database: {e}", file=sys.stderr)
+        return 2
+
+    start = time.perf_counter()
+    try:
+        written = export(connection, args.kind, args.path, args.chunk_size)
+    except (Error, ValueError, OSError) as e:
+        print(f"Export failed: {e}", file=sys.stderr)
+        return 1
+    finally:
+        connection.close()
+
+    print(f"Wrote {written} row(s) to {args.path} in {time.perf_counter() - start:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,131 @@
+"""Headless student voting flow: login, ballot load and ballot submission.
+
+This is the logic behind StudentLoginPage and VotingPage without any Tk
+dependency, so it can be driven by the benchmark harness as well as the GUI.
+Database errors propagate as mysql.connector errors; callers decide how to
+surface them.
+"""
+
+from typing import Optional, Dict, List
+
+from mysql.connector import Error
+
+from ballot import Ballot, BallotCache, ballot_cache, commit_ballot
+from db_pool import ConnectionPool
+from election_settings import ElectionSettings, SettingsCache, VotingClosed, settings_cache
+from last_login import LastLoginBuffer
+from passwords import STUDENT_REHASH_QUERY, hash_password, needs_rehash, verify_password
+from results import ElectionResults, get_results
+from statement_cache import statement
+
+
+# Answered entirely from the login_lookup covering index (student_id,
+# password_hash, has_voted, is_active; InnoDB appends id), so a login is a
+# single index probe with no clustered-row lookup.
+STUDENT_LOGIN_QUERY = "SELECT id, password_hash, has_voted, is_active FROM students WHERE student_id = %s"
+
+LOGIN_OK = "ok"
+LOGIN_NOT_FOUND = "not_found"
+LOGIN_BAD_PASSWORD = "bad_password"
+LOGIN_ALREADY_VOTED = "already_voted"
+LOGIN_INACTIVE = "inactive"
+LOGIN_VOTING_CLOSED = "voting_closed"
+
+
+class LoginResult:
+    """Outcome of a student login attempt"""
+
+    def __init__(self, status: str, db_student_id: Optional[int] = None, student_id: Optional[str] = None,
+                 message: str = ""):
+        self.status = status
+        self.db_student_id = db_student_id
+        self.student_id = student_id
+        self.message = message
+
+    @property
+    def ok(self) -> bool:
+        return self.status == LOGIN_OK
+
+
+class VotingService:
+    """Runs the student voting flow against a connection pool"""
+
+    def __init__(self, pool: ConnectionPool, cache: BallotCache = ballot_cache,
+                 last_logins: Optional[LastLoginBuffer] = None,
+                 settings_cache: SettingsCache = settings_cache):
+        self.pool = pool
+        self.cache = cache
+        self.last_logins = last_logins
+        self.settings_cache = settings_cache
+
+    def _query(self, query: str, params: tuple = None) -> List[tuple]:
+        with self.pool.connection() as connection:
+            # Prepared once per pooled connection, then only executed
+            with statement(connection, query, params) as cursor:
+                return cursor.fetchall()
+
+    def _execute(self, query: str, params: tuple = None):
+        with self.pool.connection() as connection:
+            with statement(connection, query, params):
+                connection.commit()
+
+    def login(self, student_id: str, password: str) -> LoginResult:
+        """Check a student's credentials and voting status.
+
+        Verification costs tens of milliseconds by design, so keep this off
+        the Tk thread. Plaintext or under-cost hashes are replaced once the
+        password has been confirmed.
+        """
+        rows = self._query(STUDENT_LOGIN_QUERY, (student_id,))
+        if not rows:
+            return LoginResult(LOGIN_NOT_FOUND)
+        db_id, stored_hash, has_voted, is_active = rows[0]
+        if not verify_password(password, stored_hash):
+            return LoginResult(LOGIN_BAD_PASSWORD)
+        if not is_active:
+            return LoginResult(LOGIN_INACTIVE)
+        if needs_rehash(stored_hash):
+            self._execute(STUDENT_REHASH_QUERY, (hash_password(password), db_id, stored_hash))
+        if self.last_logins is not None:
+            # Written later in a batch, not as a commit on the login path
+            self.last_logins.record(db_id)
+        if has_voted:
+            return LoginResult(LOGIN_ALREADY_VOTED, db_id, student_id)
+        is_open, reason = self.settings().voting_status()
+        if not is_open:
+            return LoginResult(LOGIN_VOTING_CLOSED, db_id, student_id, reason)
+        return LoginResult(LOGIN_OK, db_id, student_id)
+
+    def settings(self) -> ElectionSettings:
+        """Election settings from the shared cache; no query while it is fresh"""
+        try:
+            settings = self.settings_cache.get(self._query)
+        except Error:
+            # Database unreachable: the last settings read still apply
+            settings = self.settings_cache.peek()
+        return settings or ElectionSettings({})
+
+    def ensure_voting_open(self):
+        """Raise VotingClosed unless the voting window is open right now"""
+        is_open, reason = self.settings().voting_status()
+        if not is_open:
+            raise VotingClosed(msg=reason)
+
+    def load_ballot(self) -> Optional[Ballot]:
+        """Return the active ballot, from the shared cache when it is fresh"""
+        return self.cache.get(self._query)
+
+    def results(self) -> Optional[ElectionResults]:
+        """Current results as students may see them; None while results_visible is off"""
+        return get_results(self._query, for_students=True)
+
+    def submit(self, db_student_id: int, student_id: str, selections: Dict[int, int],
+               ip_address: Optional[str] = None) -> float:
+        """Commit a ballot; returns the commit latency in seconds.
+
+        Raises VotingClosed if the voting window shut after the student
+        logged in.
+        """
+        self.ensure_voting_open()
+        with self.pool.connection() as connection:
+            return commit_ballot(connection, db_student_id, student_id, selections, ip_address)